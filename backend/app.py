@@ -5,7 +5,10 @@ from flask_cors import CORS
 from dotenv import load_dotenv
 from flasgger import Swagger
 from utils.errors import BadRequestException
+from utils.metrics import init_metrics, record_exception
 from blueprints.tiktok_session import tiktok_session_blueprint
+from blueprints.jobs import jobs_blueprint
+from services.jobService import init_jobs
 from utils.http import bad_request, not_found, not_allowed, internal_error
 
 env_file = ".env.development" if os.getenv("FLASK_ENV") != "production" else ".env.production"
@@ -17,6 +20,8 @@ def create_app():
     app.url_map.strict_slashes = False
     db.init_app(app)
     CORS(app)
+    init_metrics(app)
+    init_jobs(app)
 
     # Swagger configuration
     swagger_config = {
@@ -50,6 +55,10 @@ def create_app():
             {
                 "name": "TikTok Session",
                 "description": "Operations related to TikTok session management"
+            },
+            {
+                "name": "Jobs",
+                "description": "Long running operations (sign-in, import) run in the background"
             }
         ],
         "definitions": {
@@ -95,6 +104,24 @@ def create_app():
                     "headless": {"type": "boolean"},
                     "saved_at": {"type": "string", "format": "date-time"}
                 }
+            },
+            "BackgroundJob": {
+                "type": "object",
+                "properties": {
+                    "id": {"type": "string"},
+                    "kind": {"type": "string", "example": "tiktok_sign_in"},
+                    "status": {"type": "string", "enum": ["queued", "running", "succeeded", "failed", "cancelled"]},
+                    "error": {"type": "string"},
+                    "progress": {
+                        "type": "object",
+                        "properties": {"done": {"type": "integer"}, "total": {"type": "integer"}}
+                    },
+                    "cancel_requested": {"type": "boolean"},
+                    "started_at": {"type": "string", "format": "date-time"},
+                    "finished_at": {"type": "string", "format": "date-time"},
+                    "created": {"type": "string", "format": "date-time"},
+                    "updated": {"type": "string", "format": "date-time"}
+                }
             }
         }
     }
@@ -102,6 +129,7 @@ def create_app():
     Swagger(app, config=swagger_config, template=swagger_template)
 
     app.register_blueprint(tiktok_session_blueprint, url_prefix='/api/v1')
+    app.register_blueprint(jobs_blueprint, url_prefix='/api/v1')
 
     @app.errorhandler(BadRequestException)
     def bad_request_exception(e):
@@ -117,6 +145,7 @@ def create_app():
 
     @app.errorhandler(Exception)
     def internal_server_error(e):
+        record_exception(e)
         return internal_error()
 
     return app
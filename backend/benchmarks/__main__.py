@@ -0,0 +1,79 @@
+"""
+Runs the benchmarks and writes their results as one JSON document.
+
+Every suite runs on the recorded fixtures or on synthetic data, without
+network or browser. ``--quick`` cuts the rounds and sizes for a smoke run.
+
+Usage:
+    python -m benchmarks [--only mapper,flask] [--output results.json] [--quick]
+"""
+import argparse
+import importlib
+import json
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+from benchmarks.common import BACKEND_DIR
+
+SUITES = {
+    "mapper": ("benchmarks.bench_mapper", {}, {"rounds": 500}),
+    "session_model": ("benchmarks.bench_session_model", {}, {"rounds": 50}),
+    "hydration": ("benchmarks.bench_hydration", {}, {"rounds": 20}),
+    "models_memory": ("benchmarks.bench_models_memory", {}, {"count": 1000}),
+    "api": ("benchmarks.bench_api", {}, {"rounds": 10, "pages": 5}),
+    "flask": ("benchmarks.bench_flask", {}, {"rows": 5000, "rounds": 10}),
+}
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=BACKEND_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suites(names: list[str], quick: bool = False) -> dict:
+    results = {}
+    for name in names:
+        module, kwargs, quick_kwargs = SUITES[name]
+        started = time.perf_counter()
+        results[name] = {
+            "results": importlib.import_module(module).run(**(quick_kwargs if quick else kwargs)),
+            "seconds": time.perf_counter() - started,
+        }
+        print(f"{name}: {results[name]['seconds']:.1f}s", file=sys.stderr)
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "quick": quick,
+        },
+        "benchmarks": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--only", default=",".join(SUITES), help=f"Comma separated suites among {', '.join(SUITES)}")
+    parser.add_argument("--output", help="Write the JSON to this file instead of stdout")
+    parser.add_argument("--quick", action="store_true")
+    args = parser.parse_args()
+
+    names = [n.strip() for n in args.only.split(",") if n.strip()]
+    unknown = [n for n in names if n not in SUITES]
+    if unknown:
+        parser.error(f"unknown suites: {', '.join(unknown)}")
+
+    document = run_suites(names, args.quick)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=2)
+    else:
+        json.dump(document, sys.stdout, indent=2)
+        print()
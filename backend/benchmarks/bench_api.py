@@ -0,0 +1,117 @@
+"""
+Benchmark of ApiTiktok on recorded responses, without browser or network.
+
+- ``video_info``: Video.info on the saved page of benchmarks/fixtures, read
+  through the replay transport, so it covers streaming the page, locating
+  the hydration script and decoding the video.
+- ``paginator``: User.videos over pages of the item of video_data.json, in
+  process and through a StandInServer adding ``--latency`` per request, with
+  prefetch 0 (fetch, then yield) and the default 1.
+
+Usage:
+    python -m benchmarks.bench_api [--rounds 50] [--pages 20] [--latency 0.02]
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from benchmarks.common import BACKEND_DIR, FIXTURES_DIR, time_async_calls
+from services.ApiTiktok.hydration import find_hydration_script, extract_video_item
+from services.ApiTiktok.replay import Cassette, StandInServer
+from services.ApiTiktok.tiktok import ApiTiktok
+
+VIDEO_PAGE = os.path.join(FIXTURES_DIR, "video_page.html")
+VIDEO_DATA = os.path.join(BACKEND_DIR, "video_data.json")
+ITEM_LIST = "https://www.tiktok.com/api/post/item_list/"
+SEC_UID = "MS4wLjABAAAAbenchmark"
+PAGE_SIZE = 35
+
+
+def video_cassette() -> tuple[Cassette, str]:
+    with open(VIDEO_PAGE, "r", encoding="utf-8") as f:
+        page = f.read()
+    item = extract_video_item(*find_hydration_script([page]))
+    url = f"https://www.tiktok.com/@{item['author']['uniqueId']}/video/{item['id']}"
+    cassette = Cassette()
+    cassette.record("GET", url, None, page, content_type="text/html; charset=utf-8")
+    return cassette, url
+
+
+def item_list_cassette(pages: int) -> Cassette:
+    with open(VIDEO_DATA, "r", encoding="utf-8") as f:
+        item = json.load(f)["data"]
+    cassette = Cassette()
+    for page in range(pages):
+        cursor = page * PAGE_SIZE
+        items = [{**item, "id": str(int(item["id"]) + cursor + i)} for i in range(PAGE_SIZE)]
+        body = {
+            "status_code": 0,
+            "itemList": items,
+            "cursor": str(cursor + PAGE_SIZE),
+            "hasMore": page < pages - 1,
+        }
+        cassette.record("GET", ITEM_LIST, {"secUid": SEC_UID, "count": PAGE_SIZE, "cursor": cursor}, json.dumps(body))
+    return cassette
+
+
+async def bench_video_info(rounds: int) -> dict:
+    cassette, url = video_cassette()
+    api = ApiTiktok()
+    async with api:
+        await api.replay_from(cassette)
+        return {
+            "case": "video_info", "page_bytes": os.path.getsize(VIDEO_PAGE),
+            **await time_async_calls(lambda: api.video(url=url).info(), rounds),
+        }
+
+
+async def bench_paginator(cassette: Cassette, pages: int, prefetch: int, base_url: str = None) -> dict:
+    api = ApiTiktok()
+    async with api:
+        await api.replay_from(cassette=None if base_url else cassette, base_url=base_url)
+        user = api.user(username="benchmark", user_id="1", sec_uid=SEC_UID)
+        start = time.perf_counter()
+        count = 0
+        async for _ in user.videos(count=pages * PAGE_SIZE, prefetch=prefetch):
+            count += 1
+        elapsed = time.perf_counter() - start
+    return {
+        "case": f"paginator/{'stand_in' if base_url else 'in_process'}/prefetch={prefetch}",
+        "pages": pages,
+        "items": count,
+        "seconds": elapsed,
+        "items_per_sec": count / elapsed,
+        "pages_per_sec": pages / elapsed,
+    }
+
+
+async def run_async(rounds: int = 50, pages: int = 20, latency: float = 0.02) -> list[dict]:
+    results = [await bench_video_info(rounds)]
+    cassette = item_list_cassette(pages)
+    for prefetch in (0, 1):
+        results.append(await bench_paginator(cassette, pages, prefetch))
+    with StandInServer(cassette, latency=latency) as server:
+        for prefetch in (0, 1):
+            result = await bench_paginator(cassette, pages, prefetch, base_url=server.url)
+            results.append({**result, "latency_ms": latency * 1000})
+    return results
+
+
+def run(rounds: int = 50, pages: int = 20, latency: float = 0.02) -> list[dict]:
+    return asyncio.run(run_async(rounds, pages, latency))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.02)
+    args = parser.parse_args()
+
+    for r in run(args.rounds, args.pages, args.latency):
+        if "items_per_sec" in r:
+            print(f"{r['case']:<36} {r['items_per_sec']:10.0f} items/s  {r['pages_per_sec']:8.1f} pages/s")
+        else:
+            print(f"{r['case']:<36} {r['mean_ms']:8.3f} ms/call  p99 {r['p99_ms']:8.3f} ms")
@@ -0,0 +1,118 @@
+"""
+Benchmark of the session list/detail endpoints on a synthetic table.
+
+Builds a throwaway SQLite database with ``--rows`` sessions (100k by default)
+whose cookies and storage_state are ``--blob-kib`` KiB of JSON each, then times
+GET /api/v1/tiktok/sessions on the first, middle and last pages (and the first
+page with fields=all, which loads the deferred blobs) and
+GET /api/v1/tiktok/session/<id> on random ids through the Flask test client.
+The recorded storage_state is ~440 KiB; the default blobs are smaller to keep
+the database around a few hundred MB, raise ``--blob-kib`` to see its effect.
+
+Usage:
+    python -m benchmarks.bench_flask [--rows 100000] [--blob-kib 2] [--rounds 50] [--size 50]
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import datetime
+
+from benchmarks.common import summarize
+
+BATCH = 5000
+
+
+def make_blobs(blob_kib: int) -> tuple[str, str]:
+    cookie = {"name": "sessionid", "value": "0" * 64, "domain": ".tiktok.com", "path": "/",
+              "expires": 1767225600, "httpOnly": True, "secure": True, "sameSite": "None"}
+    count = max(1, blob_kib * 1024 // len(json.dumps(cookie)))
+    cookies = json.dumps([{**cookie, "name": f"cookie_{i}"} for i in range(count)])
+    storage_state = json.dumps({"cookies": json.loads(cookies), "origins": []})
+    return cookies, storage_state
+
+
+def create_app_with_rows(db_path: str, rows: int, blob_kib: int):
+    # app.py tạo app ngay khi import, nên cấu hình phải có trước khi import
+    os.environ["APP_SETTINGS"] = "config.config.Config"
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    from app import app
+    from domain.db import db
+    from domain.models.TikTokSession import TikTokSession
+
+    cookies, storage_state = make_blobs(blob_kib)
+    now = datetime.now()
+    with app.app_context():
+        db.create_all()
+        table = TikTokSession.__table__
+        for start in range(0, rows, BATCH):
+            db.session.execute(table.insert(), [
+                {
+                    "tiktok_name": f"bench_{i}", "account": f"bench_{i}@example.com", "password": "secret",
+                    "ms_token": "m" * 148, "cookies": cookies, "storage_state": storage_state,
+                    "user_agent": "Mozilla/5.0", "browser": "chromium", "headless": True,
+                    "saved_at": now, "created": now, "updated": now,
+                }
+                for i in range(start, min(rows, start + BATCH))
+            ])
+            db.session.commit()
+    return app
+
+
+def time_get(client, urls: list[str]) -> dict:
+    durations = []
+    response_bytes = 0
+    for url in urls:
+        start = time.perf_counter()
+        response = client.get(url)
+        durations.append(time.perf_counter() - start)
+        if response.status_code != 200:
+            raise RuntimeError(f"GET {url} returned {response.status_code}")
+        response_bytes = len(response.data)
+    return {**summarize(durations), "response_bytes": response_bytes}
+
+
+def run(rows: int = 100000, blob_kib: int = 2, rounds: int = 50, size: int = 50) -> list[dict]:
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.sqlite3")
+        app = create_app_with_rows(db_path, rows, blob_kib)
+        client = app.test_client()
+        last_page = max(1, -(-rows // size))
+        meta = {"rows": rows, "blob_kib": blob_kib, "db_bytes": os.path.getsize(db_path)}
+
+        results = []
+        pages = (
+            ("first_page", 1, ""),
+            ("middle_page", max(1, last_page // 2), ""),
+            ("last_page", last_page, ""),
+            ("first_page_all_fields", 1, "&fields=all"),
+        )
+        for name, page, extra in pages:
+            url = f"/api/v1/tiktok/sessions?page={page}&size={size}{extra}"
+            client.get(url)
+            results.append({"case": f"list/{name}", "page": page, "size": size, **meta,
+                            **time_get(client, [url] * rounds)})
+
+        ids = random.Random(0).sample(range(1, rows + 1), min(rows, rounds))
+        results.append({"case": "detail/random_id", **meta,
+                        **time_get(client, [f"/api/v1/tiktok/session/{i}" for i in ids])})
+
+        from domain.db import db
+        with app.app_context():
+            db.engine.dispose()
+        return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--blob-kib", type=int, default=2)
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--size", type=int, default=50)
+    args = parser.parse_args()
+
+    for r in run(args.rows, args.blob_kib, args.rounds, args.size):
+        print(f"{r['case']:<28} p50 {r['p50_ms']:9.2f} ms  p95 {r['p95_ms']:9.2f} ms  "
+              f"{r['response_bytes'] / 1024:9.1f} KiB/response")
@@ -0,0 +1,76 @@
+"""
+Microbenchmark of the hydration JSON extraction done by Video.info.
+
+Compares the previous approach (read the whole page, str.find, json.loads of
+the whole script) with the streaming scanner and subtree decode, on the saved
+pages in benchmarks/fixtures.
+
+Usage:
+    python -m benchmarks.bench_hydration [--rounds 200] [--chunk-size 16384]
+"""
+import argparse
+import json
+import os
+import time
+import tracemalloc
+
+from services.ApiTiktok.hydration import UNIVERSAL_DATA, SCRIPT_END, find_hydration_script, extract_video_item
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+HTML_FIXTURES = ["video_page.html"]
+
+
+def read_chunks(path: str, chunk_size: int):
+    with open(path, "r", encoding="utf-8") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+def extract_full_page(path: str, chunk_size: int) -> dict:
+    text = "".join(read_chunks(path, chunk_size))
+    start = text.find(UNIVERSAL_DATA) + len(UNIVERSAL_DATA)
+    end = text.find(SCRIPT_END, start)
+    data = json.loads(text[start:end])
+    return data["__DEFAULT_SCOPE__"]["webapp.video-detail"]["itemInfo"]["itemStruct"]
+
+
+def extract_streaming(path: str, chunk_size: int) -> dict:
+    marker, script = find_hydration_script(read_chunks(path, chunk_size))
+    return extract_video_item(marker, script)
+
+
+def measure(fn, path: str, rounds: int, chunk_size: int) -> dict:
+    fn(path, chunk_size)  # warm up
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn(path, chunk_size)
+    per_call = (time.perf_counter() - start) / rounds
+
+    tracemalloc.start()
+    fn(path, chunk_size)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"ms_per_call": per_call * 1000, "peak_kib": peak / 1024}
+
+
+def run(rounds: int = 200, chunk_size: int = 16384) -> list[dict]:
+    results = []
+    for name in HTML_FIXTURES:
+        path = os.path.join(FIXTURES_DIR, name)
+        assert extract_full_page(path, chunk_size) == extract_streaming(path, chunk_size)
+        for label, fn in (("full_page", extract_full_page), ("streaming", extract_streaming)):
+            results.append({"fixture": name, "method": label, **measure(fn, path, rounds, chunk_size)})
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--chunk-size", type=int, default=16384)
+    args = parser.parse_args()
+
+    for r in run(args.rounds, args.chunk_size):
+        print(f"{r['fixture']:<20} {r['method']:<10} {r['ms_per_call']:8.3f} ms/call  peak {r['peak_kib']:9.1f} KiB")
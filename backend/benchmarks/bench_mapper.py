@@ -0,0 +1,37 @@
+"""
+Benchmark of map_tiktok_response_to_dto, the mapping of a raw video item to TikTokVideoDto.
+
+Maps the recorded item of video_data.json, alone and with model_dump() like
+the Parquet exporter does.
+
+Usage:
+    python -m benchmarks.bench_mapper [--rounds 5000]
+"""
+import argparse
+import json
+import os
+
+from benchmarks.common import BACKEND_DIR, time_calls
+from services.mapper import map_tiktok_response_to_dto
+
+VIDEO_DATA = os.path.join(BACKEND_DIR, "video_data.json")
+
+
+def run(rounds: int = 5000) -> list[dict]:
+    with open(VIDEO_DATA, "r", encoding="utf-8") as f:
+        item = json.load(f)["data"]
+
+    return [
+        {"case": "map", **time_calls(lambda: map_tiktok_response_to_dto(item), rounds)},
+        {"case": "map_and_dump", **time_calls(lambda: map_tiktok_response_to_dto(item).model_dump(), rounds)},
+    ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rounds", type=int, default=5000)
+    args = parser.parse_args()
+
+    for r in run(args.rounds):
+        print(f"{r['case']:<14} {r['mean_ms'] * 1000:8.1f} us/call  p99 {r['p99_ms'] * 1000:8.1f} us  "
+              f"{r['ops_per_sec']:10.0f} ops/s")
@@ -0,0 +1,80 @@
+"""
+Memory benchmark of the entity models built by the paginators.
+
+Builds 10k Video objects (and 10k Comment objects) from one raw item and
+reports the bytes allocated by the objects themselves, the raw dicts are
+allocated before measuring. "untouched" only builds the objects, like a
+crawl that stores ids/stats; "touched" also reads author, sound, hashtags
+and create_time, which builds every sub-object.
+
+Usage:
+    python -m benchmarks.bench_models_memory [--count 10000]
+"""
+import argparse
+import json
+import os
+import tracemalloc
+
+from services.ApiTiktok.tiktok import ApiTiktok
+
+VIDEO_DATA = os.path.join(os.path.dirname(os.path.dirname(__file__)), "video_data.json")
+
+COMMENT_ITEM = {
+    "cid": "7300000000000000000",
+    "text": "first!",
+    "digg_count": 12,
+    "user": {"uid": "6800000000000000000", "unique_id": "someone", "sec_uid": "MS4wLjABAAAA"},
+}
+
+
+def touch_video(video):
+    return video.author, video.sound, video.hashtags, video.create_time
+
+
+def touch_comment(comment):
+    return comment.author
+
+
+def measure(build, touch, count: int, touched: bool) -> int:
+    tracemalloc.start()
+    objects = [build() for _ in range(count)]
+    if touched:
+        for obj in objects:
+            touch(obj)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return size
+
+
+def run(count: int = 10000) -> list[dict]:
+    api = ApiTiktok()
+    with open(VIDEO_DATA, "r", encoding="utf-8") as f:
+        video_item = json.load(f)["data"]
+
+    cases = (
+        ("video", lambda: api.video(data=video_item), touch_video),
+        ("comment", lambda: api.comment(data=COMMENT_ITEM), touch_comment),
+    )
+    results = []
+    for model, build, touch in cases:
+        for touched in (False, True):
+            size = measure(build, touch, count, touched)
+            results.append({
+                "model": model,
+                "access": "touched" if touched else "untouched",
+                "count": count,
+                "bytes": size,
+                "bytes_per_object": size / count,
+            })
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--count", type=int, default=10000)
+    args = parser.parse_args()
+
+    for r in run(args.count):
+        print(f"{r['model']:<8} {r['access']:<10} {r['bytes'] / 1024:10.1f} KiB per {r['count']}  "
+              f"({r['bytes_per_object']:.0f} B/object)")
@@ -0,0 +1,54 @@
+"""
+Benchmark of the TikTokSession model conversions used by every session endpoint.
+
+Runs to_dict() and from_session_payload() on the recorded session of
+tiktok_session.json, whose storage_state is the bulk of the payload, and on
+the same payload without storage_state.
+
+Usage:
+    python -m benchmarks.bench_session_model [--rounds 500]
+"""
+import argparse
+import json
+import os
+
+from benchmarks.common import BACKEND_DIR, time_calls
+from domain.models.TikTokSession import TikTokSession
+
+SESSION_DATA = os.path.join(BACKEND_DIR, "tiktok_session.json")
+
+
+def load_payload() -> dict:
+    with open(SESSION_DATA, "r", encoding="utf-8") as f:
+        recorded = json.load(f)
+    return {**recorded["data"], "saved_at": recorded.get("saved_at")}
+
+
+def run(rounds: int = 500) -> list[dict]:
+    payload = load_payload()
+    cases = (
+        ("full", payload),
+        ("without_storage_state", {k: v for k, v in payload.items() if k != "storage_state"}),
+    )
+    results = []
+    for label, data in cases:
+        session = TikTokSession.from_session_payload(data)
+        size = len(json.dumps(data))
+        results.append({
+            "case": f"from_session_payload/{label}", "payload_bytes": size,
+            **time_calls(lambda: TikTokSession.from_session_payload(data), rounds),
+        })
+        results.append({
+            "case": f"to_dict/{label}", "payload_bytes": size,
+            **time_calls(session.to_dict, rounds),
+        })
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rounds", type=int, default=500)
+    args = parser.parse_args()
+
+    for r in run(args.rounds):
+        print(f"{r['case']:<40} {r['payload_bytes']:8d} B  {r['mean_ms']:8.3f} ms/call  p99 {r['p99_ms']:8.3f} ms")
@@ -0,0 +1,48 @@
+"""Timing helpers shared by the benchmarks, every result is a flat JSON-friendly dict."""
+import os
+import time
+from typing import Awaitable, Callable
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def summarize(durations: list[float]) -> dict:
+    """count, mean/p50/p95/p99/max in milliseconds and calls per second of a list of durations in seconds."""
+    ordered = sorted(durations)
+    total = sum(ordered)
+
+    def pct(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+
+    return {
+        "rounds": len(ordered),
+        "mean_ms": total / len(ordered) * 1000,
+        "p50_ms": pct(0.50),
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+        "max_ms": ordered[-1] * 1000,
+        "ops_per_sec": len(ordered) / total if total else 0.0,
+    }
+
+
+def time_calls(fn: Callable[[], object], rounds: int, warmup: int = 3) -> dict:
+    for _ in range(warmup):
+        fn()
+    durations = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - start)
+    return summarize(durations)
+
+
+async def time_async_calls(fn: Callable[[], Awaitable], rounds: int, warmup: int = 3) -> dict:
+    for _ in range(warmup):
+        await fn()
+    durations = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        await fn()
+        durations.append(time.perf_counter() - start)
+    return summarize(durations)
@@ -0,0 +1,162 @@
+from flask import Blueprint, request, jsonify, Response
+from sqlalchemy import desc
+
+from domain.models.BackgroundJob import BackgroundJob
+from services.jobService import get_job_manager
+
+jobs_blueprint = Blueprint("jobs_blueprint", __name__)
+
+
+@jobs_blueprint.route("/jobs", methods=["GET"])
+def get_jobs():
+    """
+    Lấy danh sách job nền với phân trang, mới nhất trước
+    ---
+    tags:
+      - Jobs
+    parameters:
+      - name: kind
+        in: query
+        type: string
+        description: Lọc theo loại job (tiktok_sign_in, tiktok_import)
+      - name: status
+        in: query
+        type: string
+        description: Lọc theo trạng thái (queued, running, succeeded, failed, cancelled)
+      - name: page
+        in: query
+        type: integer
+        default: 1
+      - name: size
+        in: query
+        type: integer
+        default: 50
+    responses:
+      200:
+        description: Danh sách job
+        schema:
+          type: object
+          properties:
+            items:
+              type: array
+              items:
+                $ref: '#/definitions/BackgroundJob'
+            page:
+              type: integer
+            size:
+              type: integer
+            total:
+              type: integer
+            pages:
+              type: integer
+    """
+    page = int(request.args.get("page", 1))
+    size = int(request.args.get("size", 50))
+
+    query = BackgroundJob.query.order_by(desc(BackgroundJob.created))
+    if request.args.get("kind"):
+        query = query.filter(BackgroundJob.kind == request.args["kind"])
+    if request.args.get("status"):
+        query = query.filter(BackgroundJob.status == request.args["status"])
+    pagination = query.paginate(page=page, per_page=size, error_out=False)
+
+    return jsonify({
+        "items": [x.to_dict() for x in pagination.items],
+        "page": page,
+        "size": size,
+        "total": pagination.total,
+        "pages": pagination.pages
+    }), 200
+
+
+@jobs_blueprint.route("/jobs/<string:id>", methods=["GET"])
+def get_job(id: str):
+    """
+    Lấy trạng thái và tiến độ của job
+    ---
+    tags:
+      - Jobs
+    parameters:
+      - name: id
+        in: path
+        type: string
+        required: true
+    responses:
+      200:
+        description: Trạng thái job
+        schema:
+          $ref: '#/definitions/BackgroundJob'
+      404:
+        description: Job not found
+    """
+    job = get_job_manager().get(id)
+    if job is None:
+        return Response("Job not found.", status=404)
+
+    return jsonify(job.to_dict()), 200
+
+
+@jobs_blueprint.route("/jobs/<string:id>/result", methods=["GET"])
+def get_job_result(id: str):
+    """
+    Lấy kết quả của job
+    ---
+    tags:
+      - Jobs
+    description: |
+      Trả về 202 kèm trạng thái khi job chưa xong. Khi job đã xong trả về 200 kèm
+      `result` (succeeded) hoặc `error` (failed/cancelled).
+    parameters:
+      - name: id
+        in: path
+        type: string
+        required: true
+    responses:
+      200:
+        description: Job đã xong, có result hoặc error
+      202:
+        description: Job đang chờ hoặc đang chạy
+      404:
+        description: Job not found
+    """
+    job = get_job_manager().get(id)
+    if job is None:
+        return Response("Job not found.", status=404)
+
+    if not job.finished:
+        return jsonify(job.to_dict()), 202
+    return jsonify(job.to_dict(include_result=True)), 200
+
+
+@jobs_blueprint.route("/jobs/<string:id>/cancel", methods=["POST"])
+def cancel_job(id: str):
+    """
+    Huỷ job đang chờ hoặc đang chạy
+    ---
+    tags:
+      - Jobs
+    parameters:
+      - name: id
+        in: path
+        type: string
+        required: true
+    responses:
+      202:
+        description: Đã yêu cầu huỷ, poll trạng thái để biết khi nào job dừng
+        schema:
+          $ref: '#/definitions/BackgroundJob'
+      404:
+        description: Job not found
+      409:
+        description: Job đã xong
+    """
+    manager = get_job_manager()
+    job = manager.get(id)
+    if job is None:
+        return Response("Job not found.", status=404)
+    if job.finished:
+        return Response(f"Job already {job.status}.", status=409)
+
+    # job còn queued thì bị huỷ ngay, trả về với status cancelled
+    job = manager.cancel(id)
+    return jsonify(job.to_dict()), 202
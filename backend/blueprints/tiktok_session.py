@@ -1,10 +1,13 @@
-from flask import Blueprint, request, jsonify, Response
+from flask import Blueprint, request, jsonify, Response, url_for
 from sqlalchemy import desc
+from sqlalchemy.orm import load_only, undefer_group
 import pandas as pd
-import asyncio
 
 from domain.db import db
 from domain.models.TikTokSession import TikTokSession
+from utils.loop import run_async
+from utils.metrics import track_background
+from services.jobService import JobContext, get_job_manager, job_handler
 from services.tiktokService import (
     build_tiktok_session_payload,
     post_comment_with_ui,
@@ -19,12 +22,16 @@ tiktok_session_blueprint = Blueprint("tiktok_session_blueprint", __name__)
 # Helpers
 # --------------------------------------------------------
 
-def _get_session_by_id(id: int) -> TikTokSession | None:
-    return TikTokSession.query.filter(TikTokSession.id == id).first()
+def _get_session_by_id(id: int, with_blobs: bool = True) -> TikTokSession | None:
+    query = TikTokSession.query.filter(TikTokSession.id == id)
+    if with_blobs:
+        # cookies/storage_state là cột deferred, load cùng câu query thay vì thêm 2 query
+        query = query.options(undefer_group("blobs"))
+    return query.first()
 
 
 def _get_latest_session() -> TikTokSession | None:
-    return TikTokSession.query.order_by(desc(TikTokSession.id)).first()
+    return TikTokSession.query.options(undefer_group("blobs")).order_by(desc(TikTokSession.id)).first()
 
 
 def _parse_accounts_from_excel(file_storage):
@@ -56,6 +63,97 @@ def _parse_accounts_from_excel(file_storage):
     return accounts
 
 
+def _job_accepted(job):
+    return jsonify(job.to_dict()), 202, {"Location": url_for("jobs_blueprint.get_job", id=job.id)}
+
+
+# --------------------------------------------------------
+# Jobs (chạy trên loop dùng chung của process, truy vấn qua job.run_db)
+# --------------------------------------------------------
+
+def _save_new_session(payload: dict) -> dict:
+    session = TikTokSession.from_session_payload(payload)
+    db.session.add(session)
+    db.session.commit()
+    # Kết quả job được lưu vào database, không cần kèm cookies/storage_state
+    return session.to_dict(TikTokSession.LIST_FIELDS)
+
+
+def _save_account_session(account: str, payload: dict) -> str:
+    try:
+        existing = TikTokSession.query.filter_by(account=account).first()
+        if existing:
+            existing.update_from_payload(payload)
+            action = "updated"
+        else:
+            db.session.add(TikTokSession.from_session_payload(payload))
+            action = "created"
+        db.session.commit()
+        return action
+    except Exception:
+        db.session.rollback()
+        raise
+
+
+@job_handler("tiktok_sign_in", concurrency=2)
+async def _sign_in_job(job: JobContext, tiktok_name: str = ""):
+    payload = await build_tiktok_session_payload(tiktok_name)
+    if payload is None:
+        raise RuntimeError("Failed to login to TikTok")
+    return await job.run_db(_save_new_session, payload)
+
+
+@job_handler("tiktok_import", concurrency=1)
+async def _import_job(job: JobContext, accounts: list, passwords: list = ()):
+    # passwords[i] là mật khẩu của accounts[i], truyền qua secrets nên không nằm trong params của job
+    results = []
+    await job.progress(0, len(accounts))
+
+    for done, account_info in enumerate(accounts, start=1):
+        account = account_info.get("account")
+        password = passwords[done - 1] if done <= len(passwords) else None
+        username = account_info.get("tiktok_name") or account
+
+        if not account or not password:
+            results.append({
+                "account": account,
+                "status": "skipped",
+                "reason": "Missing account or password"
+            })
+        else:
+            try:
+                with track_background("tiktok_import_account"):
+                    payload = await build_session_from_account(account, password, username)
+                if payload is None:
+                    results.append({
+                        "account": account,
+                        "status": "failed",
+                        "reason": "Login failed"
+                    })
+                else:
+                    payload["account"] = account
+                    payload["password"] = password
+                    action = await job.run_db(_save_account_session, account, payload)
+                    results.append({
+                        "account": account,
+                        "status": "success",
+                        "action": action
+                    })
+            except Exception as ex:
+                results.append({
+                    "account": account,
+                    "status": "failed",
+                    "reason": str(ex)
+                })
+
+        await job.progress(done)
+
+    return {
+        "total": len(results),
+        "results": results
+    }
+
+
 # --------------------------------------------------------
 # API
 # --------------------------------------------------------
@@ -78,6 +176,14 @@ def get_tiktok_sessions():
         type: integer
         default: 50
         description: Số lượng bản ghi mỗi trang
+      - name: fields
+        in: query
+        type: string
+        description: |
+          Các field trả về, cách nhau bởi dấu phẩy (id luôn có), hoặc "all".
+          Mặc định mọi field trừ cookies và storage_state; hai cột này chỉ được
+          load khi có trong fields.
+        example: "id,tiktok_name,cookies"
     responses:
       200:
         description: Danh sách TikTok sessions
@@ -96,15 +202,25 @@ def get_tiktok_sessions():
               type: integer
             pages:
               type: integer
+      400:
+        description: Field không tồn tại
     """
     page = int(request.args.get("page", 1))
     size = int(request.args.get("size", 50))
+    try:
+        fields = TikTokSession.parse_fields(request.args.get("fields"), TikTokSession.LIST_FIELDS)
+    except ValueError as ex:
+        return Response(str(ex), status=400)
 
-    query = TikTokSession.query.order_by(desc(TikTokSession.id))
+    query = (
+        TikTokSession.query
+        .options(load_only(*[getattr(TikTokSession, f) for f in fields]))
+        .order_by(desc(TikTokSession.id))
+    )
     pagination = query.paginate(page=page, per_page=size, error_out=False)
 
     return jsonify({
-        "items": [x.to_dict() for x in pagination.items],
+        "items": [x.to_dict(fields) for x in pagination.items],
         "page": page,
         "size": size,
         "total": pagination.total,
@@ -218,28 +334,16 @@ def auto_create_tiktok_session():
               description: Tên TikTok account (username) để lưu vào session
               example: "mideframe"
     responses:
-      201:
-        description: Session đã được tạo thành công sau khi đăng nhập
+      202:
+        description: |
+          Job đăng nhập đã được tạo. Poll GET /jobs/{id}/result, khi xong `result`
+          là TikTokSession vừa lưu, đăng nhập lỗi thì job failed kèm `error`.
         schema:
-          $ref: '#/definitions/TikTokSession'
-      400:
-        description: Lỗi đăng nhập hoặc không có ms_token
+          $ref: '#/definitions/BackgroundJob'
     """
     body = request.get_json(silent=True) or {}
-    username = body.get("tiktok_name", "")
-    
-    try:
-        payload = asyncio.run(build_tiktok_session_payload(username))
-        if payload is None:
-            return Response("Failed to login to TikTok", status=400)
-    except Exception as ex:
-        return Response(str(ex), status=400)
-
-    session = TikTokSession.from_session_payload(payload)
-    db.session.add(session)
-    db.session.commit()
-
-    return jsonify(session.to_dict()), 201
+    job = get_job_manager().submit("tiktok_sign_in", {"tiktok_name": body.get("tiktok_name", "")})
+    return _job_accepted(job)
 
 
 @tiktok_session_blueprint.route("/tiktok/session/import/preview", methods=["POST"])
@@ -304,8 +408,14 @@ def import_tiktok_sessions():
           required:
             - accounts
     responses:
-      200:
-        description: Kết quả import
+      202:
+        description: |
+          Job import đã được tạo. Poll GET /jobs/{id} để xem tiến độ (số tài khoản đã xử lý),
+          khi xong `result` có dạng {total, results: [{account, status, action|reason}]}.
+        schema:
+          $ref: '#/definitions/BackgroundJob'
+      400:
+        description: Thiếu danh sách tài khoản
     """
     accounts_payload = None
     file = request.files.get("file")
@@ -322,61 +432,10 @@ def import_tiktok_sessions():
     if not accounts_payload:
         return Response("Missing accounts", status=400)
 
-    results = []
-
-    for account_info in accounts_payload:
-        account = account_info.get("account")
-        password = account_info.get("password")
-        username = account_info.get("tiktok_name") or account
-
-        if not account or not password:
-            results.append({
-                "account": account,
-                "status": "skipped",
-                "reason": "Missing account or password"
-            })
-            continue
-
-        try:
-            payload = asyncio.run(build_session_from_account(account, password, username))
-            if payload is None:
-                results.append({
-                    "account": account,
-                    "status": "failed",
-                    "reason": "Login failed"
-                })
-                continue
-
-            payload["account"] = account
-            payload["password"] = password
-
-            existing = TikTokSession.query.filter_by(account=account).first()
-            if existing:
-                existing.update_from_payload(payload)
-                action = "updated"
-            else:
-                session = TikTokSession.from_session_payload(payload)
-                db.session.add(session)
-                action = "created"
-
-            db.session.commit()
-            results.append({
-                "account": account,
-                "status": "success",
-                "action": action
-            })
-        except Exception as ex:
-            db.session.rollback()
-            results.append({
-                "account": account,
-                "status": "failed",
-                "reason": str(ex)
-            })
-
-    return jsonify({
-        "total": len(results),
-        "results": results
-    }), 200
+    accounts = [{k: v for k, v in a.items() if k != "password"} for a in accounts_payload]
+    passwords = [a.get("password") for a in accounts_payload]
+    job = get_job_manager().submit("tiktok_import", {"accounts": accounts}, secrets={"passwords": passwords})
+    return _job_accepted(job)
 
 
 @tiktok_session_blueprint.route("/tiktok/auto-comment", methods=["POST"])
@@ -441,7 +500,8 @@ def auto_comment_multiple_accounts():
         })
 
     try:
-        results = asyncio.run(auto_comment_with_ui(items))
+        with track_background("tiktok_auto_comment"):
+            results = run_async(auto_comment_with_ui(items))
         return jsonify({
             "success": True,
             "results": results,
@@ -556,7 +616,8 @@ def post_comment_by_session_id(id: int):
     
     try:
         session_data = session.to_dict()
-        result = asyncio.run(post_comment_with_ui(session_data, text, video_url))
+        with track_background("tiktok_comment"):
+            result = run_async(post_comment_with_ui(session_data, text, video_url))
         return jsonify({
             "success": True,
             "message": "Comment posted successfully",
@@ -585,7 +646,7 @@ def delete_session(id: int):
       404:
         description: Session not found
     """
-    session = _get_session_by_id(id)
+    session = _get_session_by_id(id, with_blobs=False)
     if session is None:
         return Response("TikTok session not found.", status=404)
 
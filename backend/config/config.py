@@ -5,6 +5,8 @@ class Config(object):
     TESTING = False
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Số job nền (đăng nhập, import...) chạy cùng lúc trong mỗi process
+    JOBS_MAX_WORKERS = int(os.getenv('JOBS_MAX_WORKERS', 4))
 
 
 class ProductionConfig(Config):
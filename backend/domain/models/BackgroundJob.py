@@ -0,0 +1,75 @@
+from typing import Any, Dict
+
+from domain.db import db
+from domain.models.AggregateRoot import AggregateRoot, _safe_json_dumps, _safe_json_load
+
+
+class BackgroundJob(AggregateRoot, db.Model):
+    __tablename__ = "AppBackgroundJob"
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+    FINISHED = (SUCCEEDED, FAILED, CANCELLED)
+
+    # uuid4 hex, trả về cho client ngay khi submit
+    id = db.Column(db.String(32), primary_key=True)
+    kind = db.Column(db.String(64), nullable=False, index=True)
+    status = db.Column(db.String(16), nullable=False, default=QUEUED, index=True)
+
+    # Tham số và kết quả của job, lưu JSON string
+    params = db.Column(db.Text, nullable=True)
+    result = db.Column(db.Text, nullable=True)
+    error = db.Column(db.Text, nullable=True)
+
+    progress_done = db.Column(db.Integer, nullable=False, default=0)
+    progress_total = db.Column(db.Integer, nullable=True)
+    cancel_requested = db.Column(db.Boolean, nullable=False, default=False)
+
+    # Process đang chạy job ("host:pid"), để biết job nào bị bỏ dở khi process chết
+    owner = db.Column(db.String(255), nullable=True)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<BackgroundJob id={self.id} kind={self.kind} status={self.status}>"
+
+    @property
+    def finished(self) -> bool:
+        return self.status in self.FINISHED
+
+    @property
+    def params_value(self) -> Any:
+        return _safe_json_load(self.params)
+
+    @params_value.setter
+    def params_value(self, value: Any) -> None:
+        self.params = _safe_json_dumps(value)
+
+    @property
+    def result_value(self) -> Any:
+        return _safe_json_load(self.result)
+
+    @result_value.setter
+    def result_value(self, value: Any) -> None:
+        self.result = _safe_json_dumps(value)
+
+    def to_dict(self, include_result: bool = False) -> Dict[str, Any]:
+        """Trạng thái của job; kết quả chỉ có khi include_result (endpoint /result)."""
+        data = {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "error": self.error,
+            "progress": {"done": self.progress_done, "total": self.progress_total},
+            "cancel_requested": self.cancel_requested,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "created": self.created.isoformat() if self.created else None,
+            "updated": self.updated.isoformat() if self.updated else None,
+        }
+        if include_result:
+            data["result"] = self.result_value
+        return data
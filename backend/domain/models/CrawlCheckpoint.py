@@ -0,0 +1,50 @@
+from typing import Any, Dict
+
+from domain.db import db
+from domain.models.AggregateRoot import AggregateRoot, _safe_json_dumps, _safe_json_load
+
+
+class CrawlCheckpoint(AggregateRoot, db.Model):
+    __tablename__ = "AppCrawlCheckpoint"
+    __table_args__ = (
+        db.UniqueConstraint("job", "endpoint", "object_id", name="uq_crawl_checkpoint_job_endpoint_object"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+
+    # Khoá của crawl: tên job, path của endpoint, id của object (video, user, hashtag...)
+    job = db.Column(db.String(255), nullable=False)
+    endpoint = db.Column(db.String(255), nullable=False)
+    object_id = db.Column(db.String(255), nullable=False)
+
+    # Cursor của trang tiếp theo, lưu JSON string vì TikTok trả về số hoặc chuỗi
+    cursor = db.Column(db.String(512), nullable=True)
+    items_seen = db.Column(db.Integer, nullable=False, default=0)
+    # Số item của trang tại cursor đã được trả về (crawl dừng giữa trang)
+    page_offset = db.Column(db.Integer, nullable=False, default=0)
+    finished = db.Column(db.Boolean, nullable=False, default=False)
+
+    def __repr__(self) -> str:
+        return f"<CrawlCheckpoint job={self.job} endpoint={self.endpoint} object_id={self.object_id}>"
+
+    @property
+    def cursor_value(self) -> Any:
+        return _safe_json_load(self.cursor)
+
+    @cursor_value.setter
+    def cursor_value(self, value: Any) -> None:
+        self.cursor = _safe_json_dumps(value)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "job": self.job,
+            "endpoint": self.endpoint,
+            "object_id": self.object_id,
+            "cursor": self.cursor_value,
+            "items_seen": self.items_seen,
+            "page_offset": self.page_offset,
+            "finished": self.finished,
+            "created": self.created.isoformat() if self.created else None,
+            "updated": self.updated.isoformat() if self.updated else None,
+        }
@@ -1,7 +1,9 @@
 # backend/app/models/tiktok_session.py
 from datetime import datetime
 import json
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+from sqlalchemy.orm import deferred
 
 from domain.db import db
 from domain.models.AggregateRoot import AggregateRoot, _parse_datetime, _safe_json_dumps, _safe_json_load
@@ -19,8 +21,10 @@ class TikTokSession(AggregateRoot, db.Model):
 
     # Các trường session
     ms_token = db.Column(db.String(512), nullable=True)
-    cookies = db.Column(db.Text, nullable=True)  # lưu JSON string
-    storage_state = db.Column(db.Text, nullable=True)  # lưu JSON string
+    # lưu JSON string, vài KB tới vài trăm KB: deferred, chỉ load khi được đọc
+    # hoặc query có undefer_group("blobs") / load_only
+    cookies = deferred(db.Column(db.Text, nullable=True), group="blobs")
+    storage_state = deferred(db.Column(db.Text, nullable=True), group="blobs")
     user_agent = db.Column(db.String(512), nullable=True)
     browser = db.Column(db.String(64), nullable=True)
     headless = db.Column(db.Boolean, default=False)
@@ -32,30 +36,45 @@ class TikTokSession(AggregateRoot, db.Model):
     # created = db.Column(db.DateTime, default=datetime.utcnow)
     # updated = db.Column(db.DateTime, onupdate=datetime.utcnow)
 
+    # Các key của to_dict(); danh sách mặc định bỏ các cột blob
+    FIELDS = (
+        "id", "tiktok_name", "account", "password", "ms_token", "cookies", "storage_state",
+        "user_agent", "browser", "headless", "saved_at", "created", "updated",
+    )
+    BLOB_FIELDS = ("cookies", "storage_state")
+    LIST_FIELDS = (
+        "id", "tiktok_name", "account", "password", "ms_token",
+        "user_agent", "browser", "headless", "saved_at", "created", "updated",
+    )
+
     def __repr__(self) -> str:
         return f"<TikTokSession id={self.id} tiktok_id={self.tiktok_id}>"
 
-    def to_dict(self) -> Dict[str, Any]:
+    def to_dict(self, fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
         """
         Serialize model thành dict để trả về API.
         Chú ý: cookies/storage_state trả về object (dict/list) hoặc None.
+        ``fields`` chọn các key trả về (mặc định tất cả); cookies/storage_state chỉ
+        được load và json.loads khi có trong ``fields``.
+        """
+        return {name: _SERIALIZERS[name](self) for name in (self.FIELDS if fields is None else fields)}
+
+    @classmethod
+    def parse_fields(cls, raw: Optional[str], default: Tuple[str, ...]) -> Tuple[str, ...]:
         """
-        return {
-            "id": self.id,
-            "tiktok_name": self.tiktok_name,
-            "account": self.account,
-            "password": self.password,
-            "ms_token": self.ms_token,
-            "cookies": _safe_json_load(self.cookies),
-            "storage_state": _safe_json_load(self.storage_state),
-            "user_agent": self.user_agent,
-            "browser": self.browser,
-            "headless": self.headless,
-            "saved_at": self.saved_at.isoformat() if self.saved_at else None,
-            # Nếu AggregateRoot có created/updated thì trả về, không error nếu không có
-            "created": getattr(self, "created", None).isoformat() if getattr(self, "created", None) else None,
-            "updated": getattr(self, "updated", None).isoformat() if getattr(self, "updated", None) else None,
-        }
+        Đọc tham số ``fields=`` dạng "tiktok_name,cookies" (hoặc "all"), luôn kèm id.
+        Raise ValueError nếu có field không tồn tại.
+        """
+        if raw is None or not raw.strip():
+            return default
+        if raw.strip() == "all":
+            return cls.FIELDS
+
+        fields = tuple(dict.fromkeys(f.strip() for f in raw.split(",") if f.strip()))
+        unknown = [f for f in fields if f not in cls.FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        return fields if "id" in fields else ("id",) + fields
 
     @staticmethod
     def from_session_payload(payload: Dict[str, Any]) -> "TikTokSession":
@@ -136,3 +155,26 @@ class TikTokSession(AggregateRoot, db.Model):
 
         if "saved_at" in payload:
             self.saved_at = _parse_datetime(payload.get("saved_at"))
+
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+# field -> cách serialize của TikTokSession.to_dict
+_SERIALIZERS = {
+    "id": lambda s: s.id,
+    "tiktok_name": lambda s: s.tiktok_name,
+    "account": lambda s: s.account,
+    "password": lambda s: s.password,
+    "ms_token": lambda s: s.ms_token,
+    "cookies": lambda s: _safe_json_load(s.cookies),
+    "storage_state": lambda s: _safe_json_load(s.storage_state),
+    "user_agent": lambda s: s.user_agent,
+    "browser": lambda s: s.browser,
+    "headless": lambda s: s.headless,
+    "saved_at": lambda s: _isoformat(s.saved_at),
+    # Nếu AggregateRoot có created/updated thì trả về, không error nếu không có
+    "created": lambda s: _isoformat(getattr(s, "created", None)),
+    "updated": lambda s: _isoformat(getattr(s, "updated", None)),
+}
@@ -20,6 +20,8 @@ from flask_migrate import Migrate
 
 # Import models để Flask-Migrate có thể detect
 from domain.models.TikTokSession import TikTokSession
+from domain.models.CrawlCheckpoint import CrawlCheckpoint
+from domain.models.BackgroundJob import BackgroundJob
 
 migrate = Migrate(app, db)
 
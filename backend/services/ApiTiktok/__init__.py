@@ -1 +1,2 @@
-from services.ApiTiktok.tiktok import ApiTiktok, TikTokPlaywrightSession
+from .tiktok import ApiTiktok, TikTokPlaywrightSession
+from .pool import SessionPool, get_session_pool, close_session_pool
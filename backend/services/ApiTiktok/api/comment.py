@@ -3,7 +3,9 @@ from __future__ import annotations
 from typing import ClassVar, AsyncIterator, Optional
 from typing import TYPE_CHECKING, ClassVar, Optional
 
-from services.ApiTiktok.exceptions import InvalidResponseException
+from ..exceptions import InvalidResponseException
+from ..paginator import Paginator
+from contextlib import aclosing
 if TYPE_CHECKING:
     from ..tiktok import ApiTiktok
     from .user import User
@@ -21,12 +23,17 @@ class Comment:
                 print(comment.as_dict)
     """
 
+    __slots__ = ("id", "text", "likes_count", "as_dict", "_author")
+
     parent: ClassVar[ApiTiktok]
 
+    REQUIRED_FIELDS: ClassVar[tuple] = (
+        "cid", "text", "digg_count", "user.uid", "user.unique_id", "user.sec_uid",
+    )
+    """The fields a Comment can't be built without, always kept by ``fields=`` projections."""
+
     id: str
     """The id of the comment"""
-    author: ClassVar[User]
-    """The author of the comment"""
     text: str
     """The contents of the comment"""
     likes_count: int
@@ -35,6 +42,7 @@ class Comment:
     """The raw data associated with this comment"""
 
     def __init__(self, data: Optional[dict] = None):
+        self._author = None
         if data is not None:
             self.as_dict = data
             self.__extract_from_data()
@@ -44,43 +52,43 @@ class Comment:
         self.id = self.as_dict["cid"]
         self.text = self.as_dict["text"]
 
-        usr = self.as_dict["user"]
-        self.author = self.parent.user(
-            user_id=usr["uid"], username=usr["unique_id"], sec_uid=usr["sec_uid"]
-        )
         self.likes_count = self.as_dict["digg_count"]
+        self._author = None
+
+    @property
+    def author(self) -> Optional[User]:
+        """The author of the comment, built on first access"""
+        if self._author is None and hasattr(self, "as_dict"):
+            usr = self.as_dict["user"]
+            self._author = self.parent.user(
+                user_id=usr["uid"], username=usr["unique_id"], sec_uid=usr["sec_uid"]
+            )
+        return self._author
 
-    async def replies(self, count=20, cursor=0, **kwargs) -> AsyncIterator[Comment]:
-        found = 0
+    @author.setter
+    def author(self, value: Optional[User]):
+        self._author = value
 
-        while found < count:
-            params = {
+    async def replies(self, count=20, cursor=0, **kwargs) -> AsyncIterator[Comment]:
+        paginator = Paginator(
+            self.parent,
+            url="https://www.tiktok.com/api/comment/list/reply/",
+            params={
                 "count": 20,
-                "cursor": cursor,
                 "item_id": self.author.user_id,
                 "comment_id": self.id,
-            }
-
-            resp = await self.parent.make_request(
-                url="https://www.tiktok.com/api/comment/list/reply/",
-                params=params,
-                headers=kwargs.get("headers"),
-                session_index=kwargs.get("session_index"),
-            )
-
-            if resp is None:
-                raise InvalidResponseException(
-                    resp, "TikTok returned an invalid response."
-                )
-
-            for comment in resp.get("comments", []):
-                yield self.parent.comment(data=comment)
-                found += 1
-
-            if not resp.get("has_more", False):
-                return
-
-            cursor = resp.get("cursor")
+            },
+            items_key="comments",
+            factory=lambda data: self.parent.comment(data=data),
+            required_fields=self.parent.comment.REQUIRED_FIELDS,
+            object_id=self.id,
+            count=count,
+            cursor=cursor,
+            **kwargs,
+        )
+        async with aclosing(paginator.items()) as comments:
+            async for comment in comments:
+                yield comment
 
     def __repr__(self):
         return self.__str__()
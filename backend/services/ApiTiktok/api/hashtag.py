@@ -1,5 +1,7 @@
 from __future__ import annotations
 from ..exceptions import *
+from ..paginator import Paginator
+from contextlib import aclosing
 
 from typing import TYPE_CHECKING, ClassVar, AsyncIterator, Optional
 
@@ -20,6 +22,8 @@ class Hashtag:
                 print(video.id)
     """
 
+    __slots__ = ("id", "name", "split_name", "stats", "as_dict")
+
     parent: ClassVar[ApiTiktok]
 
     id: Optional[str]
@@ -107,34 +111,21 @@ class Hashtag:
         if id is None:
             await self.info(**kwargs)
 
-        found = 0
-        while found < count:
-            params = {
-                "challengeID": self.id,
-                "count": 35,
-                "cursor": cursor,
-            }
-
-            resp = await self.parent.make_request(
-                url="https://www.tiktok.com/api/challenge/item_list/",
-                params=params,
-                headers=kwargs.get("headers"),
-                session_index=kwargs.get("session_index"),
-            )
-
-            if resp is None:
-                raise InvalidResponseException(
-                    resp, "TikTok returned an invalid response."
-                )
-
-            for video in resp.get("itemList", []):
-                yield self.parent.video(data=video)
-                found += 1
-
-            if not resp.get("hasMore", False):
-                return
-
-            cursor = resp.get("cursor")
+        paginator = Paginator(
+            self.parent,
+            url="https://www.tiktok.com/api/challenge/item_list/",
+            params={"challengeID": self.id, "count": 35},
+            items_key="itemList",
+            factory=lambda data: self.parent.video(data=data),
+            required_fields=self.parent.video.REQUIRED_FIELDS,
+            object_id=self.id,
+            count=count,
+            cursor=cursor,
+            **kwargs,
+        )
+        async with aclosing(paginator.items()) as videos:
+            async for video in videos:
+                yield video
 
     def __extract_from_data(self):
         data = self.as_dict
@@ -156,7 +147,7 @@ class Hashtag:
         id = getattr(self, "id", None)
         name = getattr(self, "name", None)
         if None in (id, name):
-            Hashtag.parent.logger.error(
+            self.parent.logger.error(
                 f"Failed to create Hashtag with data: {data}\nwhich has keys {data.keys()}"
             )
 
@@ -1,6 +1,8 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING, ClassVar, AsyncIterator, Optional
 from ..exceptions import InvalidResponseException
+from ..paginator import Paginator
+from contextlib import aclosing
 
 if TYPE_CHECKING:
     from ..tiktok import ApiTiktok
@@ -20,6 +22,12 @@ class Playlist:
 
     parent: ClassVar[ApiTiktok]
 
+    REQUIRED_FIELDS: ClassVar[tuple] = (
+        "id", "mixId", "name", "mixName", "videoCount", "cover",
+        "creator.id", "creator.secUid", "creator.uniqueId",
+    )
+    """The fields a Playlist can't be built without, always kept by ``fields=`` projections."""
+
     id: Optional[str]
     """The ID of the playlist."""
     name: Optional[str]
@@ -112,34 +120,21 @@ class Playlist:
         if id is None or id == "":
             await self.info(**kwargs)
 
-        found = 0
-        while found < count:
-            params = {
-              "mixId": id,
-              "count": min(count, 30),
-              "cursor": cursor,
-          }
-
-            resp = await self.parent.make_request(
-                url="https://www.tiktok.com/api/mix/item_list/",
-                params=params,
-                headers=kwargs.get("headers"),
-                session_index=kwargs.get("session_index"),
-            )
-
-            if resp is None:
-                raise InvalidResponseException(
-                    resp, "TikTok returned an invalid response."
-                )
-
-            for video in resp.get("itemList", []):
-                yield self.parent.video(data=video)
-                found += 1
-
-            if not resp.get("hasMore", False):
-                return
-
-            cursor = resp.get("cursor")
+        paginator = Paginator(
+            self.parent,
+            url="https://www.tiktok.com/api/mix/item_list/",
+            params={"mixId": id, "count": min(count, 30)},
+            items_key="itemList",
+            factory=lambda data: self.parent.video(data=data),
+            required_fields=self.parent.video.REQUIRED_FIELDS,
+            object_id=id,
+            count=count,
+            cursor=cursor,
+            **kwargs,
+        )
+        async with aclosing(paginator.items()) as videos:
+            async for video in videos:
+                yield video
 
     def __extract_from_data(self):
         data = self.as_dict
@@ -155,7 +150,7 @@ class Playlist:
         self.cover_url = data.get("cover", None)
 
         if None in [self.id, self.name, self.video_count, self.creator, self.cover_url]:
-            User.parent.logger.error(
+            self.parent.logger.error(
                 f"Failed to create Playlist with data: {data}\nwhich has keys {data.keys()}"
             )
 
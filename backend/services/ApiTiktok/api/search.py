@@ -2,6 +2,8 @@ from __future__ import annotations
 from urllib.parse import urlencode
 from typing import TYPE_CHECKING, AsyncIterator
 from .user import User
+from ..paginator import Paginator
+from contextlib import aclosing
 from ..exceptions import InvalidResponseException
 
 if TYPE_CHECKING:
@@ -9,12 +11,12 @@ if TYPE_CHECKING:
 
 
 class Search:
-    """Contains static methods about searching TikTok for a phrase."""
+    """Contains class methods about searching TikTok for a phrase."""
 
     parent: ApiTiktok
 
-    @staticmethod
-    async def users(search_term, count=10, cursor=0, **kwargs) -> AsyncIterator[User]:
+    @classmethod
+    async def users(cls, search_term, count=10, cursor=0, **kwargs) -> AsyncIterator[User]:
         """
         Searches for users.
 
@@ -36,14 +38,14 @@ class Search:
                 async for user in api.search.users('david teather'):
                     # do something
         """
-        async for user in Search.search_type(
+        async for user in cls.search_type(
             search_term, "user", count=count, cursor=cursor, **kwargs
         ):
             yield user
 
-    @staticmethod
+    @classmethod
     async def search_type(
-        search_term, obj_type, count=10, cursor=0, **kwargs
+        cls, search_term, obj_type, count=10, cursor=0, **kwargs
     ) -> AsyncIterator:
         """
         Searches for a specific type of object. But you shouldn't use this directly, use the other methods.
@@ -69,38 +71,32 @@ class Search:
                 async for user in api.search.search_type('david teather', 'user'):
                     # do something
         """
-        found = 0
-        while found < count:
-            params = {
+        if obj_type != "user":
+            return
+
+        def user_from_result(user):
+            return cls.parent.user(
+                sec_uid=user.get("user_info").get("sec_uid"),
+                user_id=user.get("user_info").get("user_id"),
+                username=user.get("user_info").get("unique_id"),
+            )
+
+        paginator = Paginator(
+            cls.parent,
+            url=f"https://www.tiktok.com/api/search/{obj_type}/full/",
+            params={
                 "keyword": search_term,
-                "cursor": cursor,
                 "from_page": "search",
                 "web_search_code": """{"tiktok":{"client_params_x":{"search_engine":{"ies_mt_user_live_video_card_use_libra":1,"mt_search_general_user_live_card":1}},"search_server":{}}}""",
-            }
-
-            resp = await Search.parent.make_request(
-                url=f"https://www.tiktok.com/api/search/{obj_type}/full/",
-                params=params,
-                headers=kwargs.get("headers"),
-                session_index=kwargs.get("session_index"),
-            )
-
-            if resp is None:
-                raise InvalidResponseException(
-                    resp, "TikTok returned an invalid response."
-                )
-
-            if obj_type == "user":
-                for user in resp.get("user_list", []):
-                    sec_uid = user.get("user_info").get("sec_uid")
-                    uid = user.get("user_info").get("user_id")
-                    username = user.get("user_info").get("unique_id")
-                    yield Search.parent.user(
-                        sec_uid=sec_uid, user_id=uid, username=username
-                    )
-                    found += 1
-
-            if not resp.get("has_more", False):
-                return
-
-            cursor = resp.get("cursor")
+            },
+            items_key="user_list",
+            factory=user_from_result,
+            required_fields=("user_info.sec_uid", "user_info.user_id", "user_info.unique_id"),
+            object_id=search_term,
+            count=count,
+            cursor=cursor,
+            **kwargs,
+        )
+        async with aclosing(paginator.items()) as users:
+            async for user in users:
+                yield user
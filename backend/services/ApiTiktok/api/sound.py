@@ -1,6 +1,8 @@
 from __future__ import annotations
 from ..exceptions import *
-from typing import TYPE_CHECKING, ClassVar, Iterator, Optional
+from ..paginator import Paginator
+from contextlib import aclosing
+from typing import TYPE_CHECKING, ClassVar, AsyncIterator, Iterator, Optional
 
 if TYPE_CHECKING:
     from ..tiktok import ApiTiktok
@@ -18,14 +20,16 @@ class Sound:
             song = api.song(id='7016547803243022337')
     """
 
+    __slots__ = (
+        "id", "title", "duration", "original", "play_url", "cover_large", "stats", "as_dict", "_author",
+    )
+
     parent: ClassVar[ApiTiktok]
 
     id: str
     """TikTok's ID for the sound"""
     title: Optional[str]
     """The title of the song."""
-    author: Optional[User]
-    """The author of the song (if it exists)"""
     duration: Optional[int]
     """The duration of the song in seconds."""
     original: Optional[bool]
@@ -35,6 +39,7 @@ class Sound:
         """
         You must provide the id of the sound or it will not work.
         """
+        self._author = None
         if data is not None:
             self.as_dict = data
             self.__extract_from_data()
@@ -110,46 +115,28 @@ class Sound:
                 "You must provide the id when creating this class to use this method."
             )
 
-        found = 0
-        while found < count:
-            params = {
-                "musicID": id,
-                "count": 30,
-                "cursor": cursor,
-            }
-
-            resp = await self.parent.make_request(
-                url="https://www.tiktok.com/api/music/item_list/",
-                params=params,
-                headers=kwargs.get("headers"),
-                session_index=kwargs.get("session_index"),
-            )
-
-            if resp is None:
-                raise InvalidResponseException(
-                    resp, "TikTok returned an invalid response."
-                )
-
-            for video in resp.get("itemList", []):
-                yield self.parent.video(data=video)
-                found += 1
-
-            if not resp.get("hasMore", False):
-                return
-
-            cursor = resp.get("cursor")
+        paginator = Paginator(
+            self.parent,
+            url="https://www.tiktok.com/api/music/item_list/",
+            params={"musicID": id, "count": 30},
+            items_key="itemList",
+            factory=lambda data: self.parent.video(data=data),
+            required_fields=self.parent.video.REQUIRED_FIELDS,
+            object_id=id,
+            count=count,
+            cursor=cursor,
+            **kwargs,
+        )
+        async with aclosing(paginator.items()) as videos:
+            async for video in videos:
+                yield video
 
     def __extract_from_data(self):
         data = self.as_dict
         keys = data.keys()
 
+        self._author = None
         if "musicInfo" in keys:
-            author = data.get("musicInfo").get("author")
-            if isinstance(author, dict):
-                self.author = self.parent.user(data=author)
-            elif isinstance(author, str):
-                self.author = self.parent.user(username=author)
-
             if data.get("musicInfo").get("music"):
                 self.title = data.get("musicInfo").get("music").get("title")
                 self.id = data.get("musicInfo").get("music").get("id")
@@ -170,7 +157,22 @@ class Sound:
             self.stats = data.get("stats")
 
         if getattr(self, "id", None) is None:
-            Sound.parent.logger.error(f"Failed to create Sound with data: {data}\n")
+            self.parent.logger.error(f"Failed to create Sound with data: {data}\n")
+
+    @property
+    def author(self) -> Optional[User]:
+        """The author of the song (if it exists), built on first access"""
+        if self._author is None and hasattr(self, "as_dict"):
+            author = (self.as_dict.get("musicInfo") or {}).get("author")
+            if isinstance(author, dict):
+                self._author = self.parent.user(data=author)
+            elif isinstance(author, str):
+                self._author = self.parent.user(username=author)
+        return self._author
+
+    @author.setter
+    def author(self, value: Optional[User]):
+        self._author = value
 
     def __repr__(self):
         return self.__str__()
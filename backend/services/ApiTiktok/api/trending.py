@@ -1,6 +1,8 @@
 from __future__ import annotations
 from ..exceptions import InvalidResponseException
 from .video import Video
+from ..paginator import Paginator
+from contextlib import aclosing
 
 from typing import TYPE_CHECKING, AsyncIterator
 
@@ -9,12 +11,12 @@ if TYPE_CHECKING:
 
 
 class Trending:
-    """Contains static methods related to trending objects on TikTok."""
+    """Contains class methods related to trending objects on TikTok."""
 
     parent: ApiTiktok
 
-    @staticmethod
-    async def videos(count=30, **kwargs) -> AsyncIterator[Video]:
+    @classmethod
+    async def videos(cls, count=30, **kwargs) -> AsyncIterator[Video]:
         """
         Returns Videos that are trending on TikTok.
 
@@ -33,28 +35,17 @@ class Trending:
                 async for video in api.trending.videos():
                     # do something
         """
-        found = 0
-        while found < count:
-            params = {
-                "from_page": "fyp",
-                "count": count,
-            }
-
-            resp = await Trending.parent.make_request(
-                url="https://www.tiktok.com/api/recommend/item_list/",
-                params=params,
-                headers=kwargs.get("headers"),
-                session_index=kwargs.get("session_index"),
-            )
-
-            if resp is None:
-                raise InvalidResponseException(
-                    resp, "TikTok returned an invalid response."
-                )
-
-            for video in resp.get("itemList", []):
-                yield Trending.parent.video(data=video)
-                found += 1
-
-            if not resp.get("hasMore", False):
-                return
+        paginator = Paginator(
+            cls.parent,
+            url="https://www.tiktok.com/api/recommend/item_list/",
+            params={"from_page": "fyp", "count": count},
+            items_key="itemList",
+            factory=lambda data: cls.parent.video(data=data),
+            required_fields=cls.parent.video.REQUIRED_FIELDS,
+            count=count,
+            cursor_param=None,
+            **kwargs,
+        )
+        async with aclosing(paginator.items()) as videos:
+            async for video in videos:
+                yield video
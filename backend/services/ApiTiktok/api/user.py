@@ -1,6 +1,8 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING, ClassVar, AsyncIterator, Optional
 from ..exceptions import InvalidResponseException
+from ..paginator import Paginator
+from contextlib import aclosing
 
 if TYPE_CHECKING:
     from ..tiktok import ApiTiktok
@@ -18,8 +20,13 @@ class User:
             user = api.user(username='therock')
     """
 
+    __slots__ = ("user_id", "sec_uid", "username", "as_dict")
+
     parent: ClassVar[ApiTiktok]
 
+    REQUIRED_FIELDS: ClassVar[tuple] = ("user.id", "user.secUid", "user.uniqueId")
+    """The fields of ``userInfo`` a User can't be built without, always kept by ``fields=`` projections."""
+
     user_id: str
     """The  ID of the user."""
     sec_uid: str
@@ -49,6 +56,12 @@ class User:
         """
         Returns a dictionary of information associated with this User.
 
+        Args:
+            fields (list[str]): Dotted paths of the fields of ``userInfo`` to keep (e.g. ``stats.followerCount``),
+                trimmed inside the page.
+            signed_url (str): The url of ``info_request()`` signed by ApiTiktok.presign_requests, with the
+                session_index and headers it returned.
+
         Returns:
             dict: A dictionary of information associated with this User.
 
@@ -61,24 +74,15 @@ class User:
                 user_data = await api.user(username='therock').info()
         """
 
-        username = getattr(self, "username", None)
-        if not username:
-            raise TypeError(
-                "You must provide the username when creating this class to use this method."
-            )
-
-        sec_uid = getattr(self, "sec_uid", None)
-        url_params = {
-            "secUid": sec_uid if sec_uid is not None else "",
-            "uniqueId": username,
-            "msToken": kwargs.get("ms_token"),
-        }
-
+        request = self.info_request(**kwargs)
         resp = await self.parent.make_request(
-            url="https://www.tiktok.com/api/user/detail/",
-            params=url_params,
+            url=request["url"],
+            params=request["params"],
             headers=kwargs.get("headers"),
             session_index=kwargs.get("session_index"),
+            signed_url=kwargs.get("signed_url"),
+            fields=[*self.REQUIRED_FIELDS, *kwargs["fields"]] if kwargs.get("fields") is not None else None,
+            items_key="userInfo",
         )
 
         if resp is None:
@@ -88,6 +92,29 @@ class User:
         self.__extract_from_data()
         return resp
 
+    def info_request(self, **kwargs) -> dict:
+        """
+        Returns the ``url`` and ``params`` of the request made by ``info()``, to presign it.
+
+        Raises:
+            TypeError: If the User was created without a username.
+        """
+        username = getattr(self, "username", None)
+        if not username:
+            raise TypeError(
+                "You must provide the username when creating this class to use this method."
+            )
+
+        sec_uid = getattr(self, "sec_uid", None)
+        return {
+            "url": "https://www.tiktok.com/api/user/detail/",
+            "params": {
+                "secUid": sec_uid if sec_uid is not None else "",
+                "uniqueId": username,
+                "msToken": kwargs.get("ms_token"),
+            },
+        }
+
     async def playlists(self, count=20, cursor=0, **kwargs) -> AsyncIterator[Playlist]:
         """
         Returns a user's playlists.
@@ -108,33 +135,21 @@ class User:
         sec_uid = getattr(self, "sec_uid", None)
         if sec_uid is None or sec_uid == "":
             await self.info(**kwargs)
-        found = 0
-
-        while found < count:
-            params = {
-                "secUid": self.sec_uid,
-                "count": min(count, 20),
-                "cursor": cursor,
-            }
-
-            resp = await self.parent.make_request(
-                url="https://www.tiktok.com/api/user/playlist",
-                params=params,
-                headers=kwargs.get("headers"),
-                session_index=kwargs.get("session_index"),
-            )
-
-            if resp is None:
-                raise InvalidResponseException(resp, "TikTok returned an invalid response.")
-
-            for playlist in resp.get("playList", []):
-                yield self.parent.playlist(data=playlist)
-                found += 1
-
-            if not resp.get("hasMore", False):
-                return
-
-            cursor = resp.get("cursor")
+        paginator = Paginator(
+            self.parent,
+            url="https://www.tiktok.com/api/user/playlist",
+            params={"secUid": self.sec_uid, "count": min(count, 20)},
+            items_key="playList",
+            factory=lambda data: self.parent.playlist(data=data),
+            required_fields=self.parent.playlist.REQUIRED_FIELDS,
+            object_id=self.sec_uid,
+            count=count,
+            cursor=cursor,
+            **kwargs,
+        )
+        async with aclosing(paginator.items()) as playlists:
+            async for playlist in playlists:
+                yield playlist
 
 
     async def videos(self, count=30, cursor=0, **kwargs) -> AsyncIterator[Video]:
@@ -161,34 +176,21 @@ class User:
         if sec_uid is None or sec_uid == "":
             await self.info(**kwargs)
 
-        found = 0
-        while found < count:
-            params = {
-                "secUid": self.sec_uid,
-                "count": 35,
-                "cursor": cursor,
-            }
-
-            resp = await self.parent.make_request(
-                url="https://www.tiktok.com/api/post/item_list/",
-                params=params,
-                headers=kwargs.get("headers"),
-                session_index=kwargs.get("session_index"),
-            )
-
-            if resp is None:
-                raise InvalidResponseException(
-                    resp, "TikTok returned an invalid response."
-                )
-
-            for video in resp.get("itemList", []):
-                yield self.parent.video(data=video)
-                found += 1
-
-            if not resp.get("hasMore", False):
-                return
-
-            cursor = resp.get("cursor")
+        paginator = Paginator(
+            self.parent,
+            url="https://www.tiktok.com/api/post/item_list/",
+            params={"secUid": self.sec_uid, "count": 35},
+            items_key="itemList",
+            factory=lambda data: self.parent.video(data=data),
+            required_fields=self.parent.video.REQUIRED_FIELDS,
+            object_id=self.sec_uid,
+            count=count,
+            cursor=cursor,
+            **kwargs,
+        )
+        async with aclosing(paginator.items()) as videos:
+            async for video in videos:
+                yield video
 
     async def liked(
         self, count: int = 30, cursor: int = 0, **kwargs
@@ -216,34 +218,21 @@ class User:
         if sec_uid is None or sec_uid == "":
             await self.info(**kwargs)
 
-        found = 0
-        while found < count:
-            params = {
-                "secUid": self.sec_uid,
-                "count": 35,
-                "cursor": cursor,
-            }
-
-            resp = await self.parent.make_request(
-                url="https://www.tiktok.com/api/favorite/item_list",
-                params=params,
-                headers=kwargs.get("headers"),
-                session_index=kwargs.get("session_index"),
-            )
-
-            if resp is None:
-                raise InvalidResponseException(
-                    resp, "TikTok returned an invalid response."
-                )
-
-            for video in resp.get("itemList", []):
-                yield self.parent.video(data=video)
-                found += 1
-
-            if not resp.get("hasMore", False):
-                return
-
-            cursor = resp.get("cursor")
+        paginator = Paginator(
+            self.parent,
+            url="https://www.tiktok.com/api/favorite/item_list",
+            params={"secUid": self.sec_uid, "count": 35},
+            items_key="itemList",
+            factory=lambda data: self.parent.video(data=data),
+            required_fields=self.parent.video.REQUIRED_FIELDS,
+            object_id=self.sec_uid,
+            count=count,
+            cursor=cursor,
+            **kwargs,
+        )
+        async with aclosing(paginator.items()) as videos:
+            async for video in videos:
+                yield video
 
     def __extract_from_data(self):
         data = self.as_dict
@@ -263,7 +252,7 @@ class User:
             )
 
         if None in (self.username, self.user_id, self.sec_uid):
-            User.parent.logger.error(
+            self.parent.logger.error(
                 f"Failed to create User with data: {data}\nwhich has keys {data.keys()}"
             )
 
@@ -1,16 +1,19 @@
 from __future__ import annotations
-from ..helpers import extract_video_id_from_url, requests_cookie_to_playwright_cookie
+from ..helpers import extract_video_id_from_url, parse_video_id, requests_cookie_to_playwright_cookie
 from typing import TYPE_CHECKING, ClassVar, AsyncIterator, Optional, Union
 from datetime import datetime
-import requests
 from ..exceptions import InvalidResponseException
-import json
-import httpx
+from ..hydration import read_hydration_script, extract_video_item
+from ..paginator import Paginator
+from ..projection import build_projection, project
+from ..download import Downloader, DownloadResult
+from contextlib import aclosing
 import asyncio
 import time
 import os
 
 if TYPE_CHECKING:
+    import httpx
     from ..tiktok import ApiTiktok
     from .user import User
     from .sound import Sound
@@ -26,24 +29,24 @@ class Video:
     ```py
     video = api.video(id='7041997751718137094')
     ```
+
+    The author, sound, hashtags and creation time are only built from
+    ``as_dict`` when they are first accessed.
     """
 
+    __slots__ = ("id", "url", "stats", "as_dict", "_create_time", "_author", "_sound", "_hashtags")
+
     parent: ClassVar[ApiTiktok]
 
+    REQUIRED_FIELDS: ClassVar[tuple] = ("id",)
+    """The fields a Video can't be built without, always kept by ``fields=`` projections."""
+
     id: Optional[str]
     """TikTok's ID of the Video"""
     url: Optional[str]
     """The URL of the Video"""
-    create_time: Optional[datetime]
-    """The creation time of the Video"""
     stats: Optional[dict]
     """TikTok's stats of the Video"""
-    author: Optional[User]
-    """The User who created the Video"""
-    sound: Optional[Sound]
-    """The Sound that is associated with the Video"""
-    hashtags: Optional[list[Hashtag]]
-    """A List of Hashtags on the Video"""
     as_dict: dict
     """The raw data associated with this Video."""
 
@@ -59,145 +62,235 @@ class Video:
         """
         self.id = id
         self.url = url
+        self._create_time = self._author = self._sound = self._hashtags = None
         if data is not None:
             self.as_dict = data
             self.__extract_from_data()
-        elif url is not None:
-            # resolve session briefly to extract video id using headers/proxy if needed
-            i, session = self.parent._get_session(**kwargs)
-            self.id = extract_video_id_from_url(
-                url,
-                headers=session.headers,
-                proxy=kwargs.get("proxy")
-                if kwargs.get("proxy") is not None
-                else session.proxy,
-            )
+        elif url is not None and id is None:
+            # short links are resolved later by resolve_id(), without blocking here
+            self.id = parse_video_id(url)
 
-        if getattr(self, "id", None) is None:
+        if getattr(self, "id", None) is None and self.url is None:
             raise TypeError("You must provide id or url parameter.")
 
-    async def info(self, **kwargs) -> dict:
+    async def resolve_id(self, **kwargs) -> str:
         """
-        Returns a dictionary of all data associated with a TikTok Video.
+        Returns the id of the Video, following the redirects of its url if needed (short/mobile links).
         """
+        if self.id is not None:
+            return self.id
         i, session = self.parent._get_session(**kwargs)
         proxy = (
             kwargs.get("proxy") if kwargs.get("proxy") is not None else session.proxy
         )
-        if self.url is None:
-            raise TypeError("To call video.info() you need to set the video's url.")
+        self.id = await extract_video_id_from_url(
+            self.url, self.parent.http.get(proxy), headers=session.headers
+        )
+        return self.id
 
-        r = requests.get(self.url, headers=session.headers, proxies=proxy)
-        if r.status_code != 200:
-            raise InvalidResponseException(
-                r.text, "TikTok returned an invalid response.", error_code=r.status_code
-            )
+    async def info(self, **kwargs) -> dict:
+        """
+        Returns a dictionary of all data associated with a TikTok Video.
 
-        # Try SIGI_STATE first
-        start = r.text.find('<script id="SIGI_STATE" type="application/json">')
-        if start != -1:
-            start += len('<script id="SIGI_STATE" type="application/json">')
-            end = r.text.find("</script>", start)
+        Args:
+            fields (list[str]): Dotted paths of the fields to keep, the rest of the item is dropped.
+        """
+        if self.url is None:
+            raise TypeError("To call video.info() you need to set the video's url.")
 
-            if end == -1:
-                raise InvalidResponseException(
-                    r.text, "TikTok returned an invalid response.", error_code=r.status_code
+        with self.parent.metrics.span("total", endpoint="video.info"):
+            async with self.parent._lease_session(**kwargs) as (i, session):
+                proxy = (
+                    kwargs.get("proxy") if kwargs.get("proxy") is not None else session.proxy
                 )
 
-            data = json.loads(r.text[start:end])
-            video_info = data["ItemModule"][self.id]
-        else:
-            # Try __UNIVERSAL_DATA_FOR_REHYDRATION__ next
-            start = r.text.find('<script id="__UNIVERSAL_DATA_FOR_REHYDRATION__" type="application/json">')
-            if start == -1:
+                # Stream the page and stop reading as soon as the hydration script is closed
+                client = self.parent.http.get(proxy)
+                with self.parent.metrics.span("fetch_page", session_index=i):
+                    async with client.stream("GET", self.url, headers=session.headers) as r:
+                        if r.status_code != 200:
+                            await r.aread()
+                            raise InvalidResponseException(
+                                r.text, "TikTok returned an invalid response.", error_code=r.status_code
+                            )
+                        marker, script = await read_hydration_script(r.aiter_text())
+
+            if script is None:
                 raise InvalidResponseException(
-                    r.text, "TikTok returned an invalid response.", error_code=r.status_code
+                    None, "TikTok returned an invalid response.", error_code=r.status_code
                 )
+            if self.parent.cassette is not None:
+                self.parent.cassette.record(
+                    "GET", self.url, None, f"<html><head>{marker}{script}</script></head></html>",
+                    content_type="text/html; charset=utf-8",
+                )
+            if self.id is None:
+                self.id = parse_video_id(str(r.url))
+            with self.parent.metrics.span("parse"):
+                video_info = extract_video_item(marker, script, self.id)
+                if kwargs.get("fields") is not None:
+                    video_info = project(video_info, build_projection(kwargs["fields"], self.REQUIRED_FIELDS))
+
+            self.as_dict = video_info
+            self.__extract_from_data()
 
-            start += len('<script id="__UNIVERSAL_DATA_FOR_REHYDRATION__" type="application/json">')
-            end = r.text.find("</script>", start)
+            cookies = [requests_cookie_to_playwright_cookie(c) for c in r.cookies.jar]
 
-            if end == -1:
-                raise InvalidResponseException(
-                    r.text, "TikTok returned an invalid response.", error_code=r.status_code
+            with self.parent.metrics.span("set_cookies", session_index=i):
+                await self.parent.set_session_cookies(
+                    session,
+                    cookies
                 )
+            return video_info
 
-            data = json.loads(r.text[start:end])
-            default_scope = data.get("__DEFAULT_SCOPE__", {})
-            video_detail = default_scope.get("webapp.video-detail", {})
-            if video_detail.get("statusCode", 0) != 0: # assume 0 if not present
-                raise InvalidResponseException(
-                    r.text, "TikTok returned an invalid response structure.", error_code=r.status_code
-                )
-            video_info = video_detail.get("itemInfo", {}).get("itemStruct")
-            if video_info is None:
-                raise InvalidResponseException(
-                    r.text, "TikTok returned an invalid response structure.", error_code=r.status_code
-                )
+    async def bytes(self, stream: bool = False, **kwargs) -> Union[bytes, AsyncIterator[bytes]]:
+        """
+        Returns the bytes of a TikTok Video.
 
-        self.as_dict = video_info
-        self.__extract_from_data()
+        Use download() for large videos, it writes to disk with parallel ranged requests.
+        """
+        downloadAddr, h, client = await self.__download_request("downloadAddr", **kwargs)
+        h["range"] = 'bytes=0-'
 
-        cookies = [requests_cookie_to_playwright_cookie(c) for c in r.cookies]
+        if stream:
+            async def stream_bytes():
+                async with client.stream('GET', downloadAddr, headers=h) as response:
+                    async for chunk in response.aiter_bytes():
+                        yield chunk
+            return stream_bytes()
+        else:
+            resp = await client.get(downloadAddr, headers=h)
+            return resp.content
 
-        await self.parent.set_session_cookies(
-            session,
-            cookies
-        )
-        return video_info
+    async def download(self, path: str, chunk_size: int = 4 * 1024 * 1024, max_parallel: int = 4,
+                       on_progress=None, kind: str = "downloadAddr", **kwargs) -> DownloadResult:
+        """
+        Downloads the TikTok Video to a file.
 
-    async def bytes(self, stream: bool = False, **kwargs) -> Union[bytes, AsyncIterator[bytes]]:
+        The video is fetched in parallel HTTP Range chunks over the pooled client
+        and written straight to disk, an interrupted download resumes where it stopped.
+
+        Args:
+            path (str): Where to write the video.
+            chunk_size (int): The size of each ranged request, in bytes.
+            max_parallel (int): The maximum amount of chunks downloaded at once.
+            on_progress (Callable): Called with (bytes on disk, total bytes) after every chunk.
+            kind (str): What to download, downloadAddr for the video, cover or originCover for its covers.
+
+        Returns:
+            DownloadResult: The size, transferred bytes and bytes per second of the download.
+
+        Example Usage:
+            .. code-block:: python
+
+                result = await api.video(url="...").download("video.mp4")
+                print(result.bytes_per_second)
         """
-        Returns the bytes of a TikTok Video.
+        url, h, client = await self.__download_request(kind, **kwargs)
+        downloader = Downloader(client, chunk_size=chunk_size, max_parallel=max_parallel)
+        return await downloader.download(url, path, headers=h, on_progress=on_progress)
+
+    async def fetch(self, kind: str = "downloadAddr", **kwargs) -> str:
         """
+        Returns the local path of the video or one of its covers, from api.media_store.
+
+        The store is looked up by the video id first, the info of the video is
+        only requested (which needs its url) and the media downloaded when the
+        store doesn't have it yet.
+
+        Args:
+            kind (str): downloadAddr for the video, cover or originCover for its covers.
+
+        Returns:
+            str: The path of the file in the media store.
+
+        Example Usage:
+            .. code-block:: python
+
+                path = await api.video(url="https://www.tiktok.com/@davidteathercodes/video/7106686413101468970").fetch()
+        """
+        if self.parent.media_store is None:
+            raise ValueError("ApiTiktok has no media_store, create it with ApiTiktok(media_store=MediaStore(...))")
+        if self.id is None:
+            await self.resolve_id(**kwargs)
+        return await self.parent.media_store.get_video_media(self, kind, **kwargs)
+
+    async def __download_request(self, kind: str, **kwargs) -> tuple[str, dict, httpx.AsyncClient]:
+        """The url, headers and pooled client used to download a media of the video, the headers are a copy."""
         i, session = self.parent._get_session(**kwargs)
-        downloadAddr = self.as_dict["video"]["downloadAddr"]
+        url = self.as_dict["video"][kind]
 
         cookies = await self.parent.get_session_cookies(session)
 
-        h = session.headers
-        h["range"] = 'bytes=0-'
+        h = dict(session.headers)
         h["accept-encoding"] = 'identity;q=1, *;q=0'
         h["referer"] = 'https://www.tiktok.com/'
 
-        if stream:
-            async def stream_bytes():
-                async with httpx.AsyncClient() as client:
-                    async with client.stream('GET', downloadAddr, headers=h, cookies=cookies) as response:
-                        async for chunk in response.aiter_bytes():
-                            yield chunk
-            return stream_bytes()
-        else:
-            resp = requests.get(downloadAddr, headers=h, cookies=cookies)
-            return resp.content
+        h["cookie"] = "; ".join(f"{k}={v}" for k, v in cookies.items())
+        client = self.parent.http.get(kwargs.get("proxy") if kwargs.get("proxy") is not None else session.proxy)
+        return url, h, client
+
+    @property
+    def create_time(self) -> Optional[datetime]:
+        """The creation time of the Video"""
+        if self._create_time is None and hasattr(self, "as_dict"):
+            timestamp = self.as_dict.get("createTime", None)
+            if timestamp is not None:
+                self._create_time = datetime.fromtimestamp(int(timestamp))
+        return self._create_time
+
+    @create_time.setter
+    def create_time(self, value: Optional[datetime]):
+        self._create_time = value
+
+    @property
+    def author(self) -> Optional[User]:
+        """The User who created the Video"""
+        if self._author is None and hasattr(self, "as_dict"):
+            author = self.as_dict.get("author")
+            if isinstance(author, str):
+                self._author = self.parent.user(username=author)
+            elif author is not None:
+                self._author = self.parent.user(data=author)
+        return self._author
+
+    @author.setter
+    def author(self, value: Optional[User]):
+        self._author = value
+
+    @property
+    def sound(self) -> Optional[Sound]:
+        """The Sound that is associated with the Video"""
+        if self._sound is None and hasattr(self, "as_dict"):
+            self._sound = self.parent.sound(data=self.as_dict)
+        return self._sound
+
+    @sound.setter
+    def sound(self, value: Optional[Sound]):
+        self._sound = value
+
+    @property
+    def hashtags(self) -> Optional[list[Hashtag]]:
+        """A List of Hashtags on the Video"""
+        if self._hashtags is None and hasattr(self, "as_dict"):
+            self._hashtags = [
+                self.parent.hashtag(data=hashtag) for hashtag in self.as_dict.get("challenges", [])
+            ]
+        return self._hashtags
+
+    @hashtags.setter
+    def hashtags(self, value: Optional[list[Hashtag]]):
+        self._hashtags = value
 
     def __extract_from_data(self) -> None:
         data = self.as_dict
         self.id = data["id"]
-
-        timestamp = data.get("createTime", None)
-        if timestamp is not None:
-            try:
-                timestamp = int(timestamp)
-            except ValueError:
-                pass
-
-        self.create_time = datetime.fromtimestamp(timestamp)
         self.stats = data.get('statsV2') or data.get('stats')
-
-        author = data.get("author")
-        if isinstance(author, str):
-            self.author = self.parent.user(username=author)
-        else:
-            self.author = self.parent.user(data=author)
-        self.sound = self.parent.sound(data=data)
-
-        self.hashtags = [
-            self.parent.hashtag(data=hashtag) for hashtag in data.get("challenges", [])
-        ]
+        # built again from the new data on next access
+        self._create_time = self._author = self._sound = self._hashtags = None
 
         if getattr(self, "id", None) is None:
-            Video.parent.logger.error(
+            self.parent.logger.error(
                 f"Failed to create Video with data: {data}\nwhich has keys {data.keys()}"
             )
 
@@ -205,34 +298,22 @@ class Video:
         """
         Returns the comments of a TikTok Video.
         """
-        found = 0
-        while found < count:
-            params = {
-                "aweme_id": self.id,
-                "count": 20,
-                "cursor": cursor,
-            }
-
-            resp = await self.parent.make_request(
-                url="https://www.tiktok.com/api/comment/list/",
-                params=params,
-                headers=kwargs.get("headers"),
-                session_index=kwargs.get("session_index"),
-            )
-
-            if resp is None:
-                raise InvalidResponseException(
-                    resp, "TikTok returned an invalid response."
-                )
-
-            for video in resp.get("comments", []):
-                yield self.parent.comment(data=video)
-                found += 1
-
-            if not resp.get("has_more", False):
-                return
-
-            cursor = resp.get("cursor")
+        await self.resolve_id(**kwargs)
+        paginator = Paginator(
+            self.parent,
+            url="https://www.tiktok.com/api/comment/list/",
+            params={"aweme_id": self.id, "count": 20},
+            items_key="comments",
+            factory=lambda data: self.parent.comment(data=data),
+            required_fields=self.parent.comment.REQUIRED_FIELDS,
+            object_id=self.id,
+            count=count,
+            cursor=cursor,
+            **kwargs,
+        )
+        async with aclosing(paginator.items()) as comments:
+            async for comment in comments:
+                yield comment
 
     async def related_videos(
         self, count: int = 30, cursor: int = 0, **kwargs
@@ -240,29 +321,22 @@ class Video:
         """
         Returns related videos of a TikTok Video.
         """
-        found = 0
-        while found < count:
-            params = {
-                "itemID": self.id,
-                "count": 16,
-            }
-
-            resp = await self.parent.make_request(
-                url="https://www.tiktok.com/api/related/item_list/",
-                params=params,
-                headers=kwargs.get("headers"),
-                session_index=kwargs.get("session_index"),
-                referrer=self.url
-            )
-
-            if resp is None:
-                raise InvalidResponseException(
-                    resp, "TikTok returned an invalid response."
-                )
-
-            for video in resp.get("itemList", []):
-                yield self.parent.video(data=video)
-                found += 1
+        await self.resolve_id(**kwargs)
+        paginator = Paginator(
+            self.parent,
+            url="https://www.tiktok.com/api/related/item_list/",
+            params={"itemID": self.id, "count": 16},
+            items_key="itemList",
+            factory=lambda data: self.parent.video(data=data),
+            required_fields=self.parent.video.REQUIRED_FIELDS,
+            count=count,
+            cursor_param=None,
+            has_more_keys=None,
+            **kwargs,
+        )
+        async with aclosing(paginator.items()) as videos:
+            async for video in videos:
+                yield video
 
     def __repr__(self):
         return self.__str__()
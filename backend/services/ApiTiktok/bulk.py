@@ -0,0 +1,116 @@
+import asyncio
+import dataclasses
+from collections import deque
+from itertools import islice
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Optional
+
+_DONE = object()
+
+
+@dataclasses.dataclass
+class BulkResult:
+    """The outcome of one item of a bulk lookup."""
+
+    index: int
+    """The position of the item in the input."""
+    key: str
+    """The item as it was given (video id/url, username...)."""
+    value: Any = None
+    """The result of the lookup, None if it failed."""
+    error: Optional[Exception] = None
+    """The exception the lookup failed with, None if it succeeded."""
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+async def fan_out(
+    keys: Iterable[str],
+    fn: Callable[[str], Awaitable[Any]],
+    concurrency: int = 8,
+    ordered: bool = False,
+    prepare: Callable[[list[str]], Awaitable[list]] = None,
+    batch_size: int = None,
+) -> AsyncIterator[BulkResult]:
+    """
+    Run ``fn(key)`` for every key with at most ``concurrency`` calls in flight.
+
+    A fixed set of workers pulls keys one at a time, so a large input doesn't
+    create a task per key. Exceptions raised by ``fn`` are captured in the
+    BulkResult of their key instead of stopping the other lookups.
+
+    With ``prepare``, keys are taken ``batch_size`` at a time and prepared in
+    one call (e.g. signed in one round trip), then ``fn(key, prepared)`` runs
+    for each of them. The next batch is prepared when a worker runs out of
+    prepared keys, while the other workers are still busy.
+
+    Args:
+        keys (Iterable[str]): The items to look up.
+        fn (Callable): The coroutine function doing one lookup.
+        concurrency (int): The maximum amount of lookups in flight.
+        ordered (bool): Yield results in input order instead of as they complete.
+        prepare (Callable): Receives a batch of keys and returns one value per key, passed to ``fn``.
+            If it raises, every key of the batch fails with its exception.
+        batch_size (int): The amount of keys per ``prepare`` call, defaults to ``concurrency``.
+
+    Yields:
+        BulkResult: One result per key.
+    """
+    pending = iter(enumerate(keys))
+    results: asyncio.Queue = asyncio.Queue()
+    batch_size = batch_size or max(1, concurrency)
+    ready: deque = deque()
+    preparing = asyncio.Lock()
+
+    async def next_key() -> Optional[tuple]:
+        if prepare is None:
+            return next(pending, None)
+        async with preparing:
+            if not ready:
+                batch = list(islice(pending, batch_size))
+                if not batch:
+                    return None
+                try:
+                    prepared = await prepare([key for _, key in batch])
+                except Exception as e:
+                    prepared = [e] * len(batch)
+                ready.extend((index, key, value) for (index, key), value in zip(batch, prepared))
+            return ready.popleft()
+
+    async def worker():
+        while (item := await next_key()) is not None:
+            index, key = item[:2]
+            try:
+                if prepare is None:
+                    result = BulkResult(index, key, value=await fn(key))
+                elif isinstance(item[2], Exception):
+                    result = BulkResult(index, key, error=item[2])
+                else:
+                    result = BulkResult(index, key, value=await fn(key, item[2]))
+            except Exception as e:
+                result = BulkResult(index, key, error=e)
+            await results.put(result)
+        await results.put(_DONE)
+
+    workers = [asyncio.create_task(worker()) for _ in range(max(1, concurrency))]
+    try:
+        running = len(workers)
+        buffered: dict[int, BulkResult] = {}
+        next_index = 0
+        while running:
+            result = await results.get()
+            if result is _DONE:
+                running -= 1
+                continue
+            if not ordered:
+                yield result
+                continue
+            buffered[result.index] = result
+            while next_index in buffered:
+                yield buffered.pop(next_index)
+                next_index += 1
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
@@ -0,0 +1,222 @@
+import asyncio
+import copy
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Optional
+from urllib.parse import urlparse
+
+from .helpers import request_cache_key
+
+
+DEFAULT_TTLS = {
+    "/api/user/detail/": 3600,
+    "/api/challenge/detail/": 3600,
+    "/api/music/detail/": 3600,
+    "/api/mix/detail/": 3600,
+    "/api/post/item_list/": 600,
+    "/api/challenge/item_list/": 600,
+    "/api/music/item_list/": 600,
+    "/api/mix/item_list/": 600,
+    "/api/user/playlist": 600,
+    "/api/comment/list/": 300,
+    "/api/comment/list/reply/": 300,
+    "/api/recommend/item_list/": 0,
+    "/api/related/item_list/": 0,
+    "/api/search/general/full/": 0,
+    "/api/search/user/full/": 0,
+    "/api/search/item/full/": 0,
+}
+"""
+Default time to live of cached responses by endpoint path, in seconds. 0 disables caching.
+
+Feeds like recommend, related and search answer the same params with a new
+page each call, caching them would repeat the first page; paths missing here
+aren't cached unless ResponseCache gets a default_ttl.
+"""
+
+
+class MemoryCache:
+    """
+    A bounded in-memory LRU of decoded responses with per-entry expiry.
+
+    Values are copied in and out so callers can modify what they get without
+    changing the cached response.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+
+    def get(self, key: str) -> Optional[dict]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return copy.deepcopy(value)
+
+    def set(self, key: str, value: dict, expires_at: float):
+        self._entries[key] = (expires_at, copy.deepcopy(value))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteCache:
+    """
+    A zlib-compressed response cache in a SQLite file.
+
+    The database runs in WAL mode so several worker processes can share the
+    same file, readers never block the writer.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[tuple[float, dict]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM responses WHERE key = ? AND expires_at >= ?",
+                (key, time.time()),
+            ).fetchone()
+        if row is None:
+            return None
+        return row[1], json.loads(zlib.decompress(row[0]))
+
+    def set(self, key: str, value: dict, expires_at: float):
+        blob = zlib.compress(json.dumps(value, separators=(",", ":")).encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, blob, expires_at),
+            )
+            self._conn.commit()
+
+    def purge_expired(self) -> int:
+        """Delete expired rows, returns how many were removed."""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM responses WHERE expires_at < ?", (time.time(),))
+            self._conn.commit()
+        return cursor.rowcount
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class ResponseCache:
+    """
+    Two-tier cache for ApiTiktok.make_request: an in-memory LRU in front of an
+    optional SQLite file shared across processes.
+
+    Responses are keyed on the endpoint url and the request params, without
+    volatile params like msToken or WebIdLastTime. Only successful responses
+    (``status_code == 0``) are stored.
+
+    Example Usage:
+        .. code-block:: python
+
+            api = ApiTiktok(cache=ResponseCache(path="tiktok_cache.sqlite3"))
+            ...
+            print(api.cache.stats())
+    """
+
+    def __init__(self, max_entries: int = 1024, path: Optional[str] = None,
+                 ttls: Optional[dict] = None, default_ttl: int = 0):
+        """
+        Args:
+            max_entries (int): The size of the in-memory LRU.
+            path (str): The SQLite file of the on-disk tier, memory only if None.
+            ttls (dict): Time to live by endpoint path in seconds, merged over DEFAULT_TTLS.
+            default_ttl (int): Time to live of endpoints missing from ttls, in seconds, not cached by default.
+        """
+        self.memory = MemoryCache(max_entries)
+        self.disk = SQLiteCache(path) if path else None
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.default_ttl = default_ttl
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def ttl_for(self, url: str) -> int:
+        path = urlparse(url).path
+        if path in self.ttls:
+            return self.ttls[path]
+        if not path.endswith("/") and f"{path}/" in self.ttls:
+            return self.ttls[f"{path}/"]
+        return self.default_ttl
+
+    async def get(self, url: str, params: Optional[dict]) -> Optional[dict]:
+        """Returns the cached response of a request, or None on a miss."""
+        if self.ttl_for(url) <= 0:
+            return None
+        key = request_cache_key(url, params)
+
+        value = self.memory.get(key)
+        if value is not None:
+            self.memory_hits += 1
+            return value
+
+        if self.disk is not None:
+            entry = await asyncio.to_thread(self.disk.get, key)
+            if entry is not None:
+                expires_at, value = entry
+                self.memory.set(key, value, expires_at)
+                self.disk_hits += 1
+                return value
+
+        self.misses += 1
+        return None
+
+    async def set(self, url: str, params: Optional[dict], data: dict):
+        """Store a response, unless it is an error or its endpoint isn't cached."""
+        ttl = self.ttl_for(url)
+        if ttl <= 0 or not isinstance(data, dict) or data.get("status_code") != 0:
+            return
+        key = request_cache_key(url, params)
+        expires_at = time.time() + ttl
+        self.memory.set(key, data, expires_at)
+        if self.disk is not None:
+            await asyncio.to_thread(self.disk.set, key, data, expires_at)
+        self.stores += 1
+
+    def stats(self) -> dict:
+        """
+        Returns the hit and miss counters of the cache.
+
+        Returns:
+            dict: memory_hits, disk_hits, misses, stores, hit_rate and memory_entries.
+        """
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+            "memory_entries": len(self.memory),
+        }
+
+    def close(self):
+        if self.disk is not None:
+            self.disk.close()
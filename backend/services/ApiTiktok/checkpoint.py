@@ -0,0 +1,58 @@
+import dataclasses
+from typing import Any, Optional
+
+
+@dataclasses.dataclass
+class Checkpoint:
+    """Where a paginated crawl of one object stopped."""
+
+    job: str
+    """The name of the crawl, so several crawls of the same object don't collide."""
+    endpoint: str
+    """The path of the paginated endpoint, e.g. ``/api/comment/list/``."""
+    object_id: str
+    """The id of the crawled object (video id, sec uid, hashtag id...)."""
+    cursor: Any = 0
+    """The cursor of the next page to request."""
+    items_seen: int = 0
+    """How many items were yielded so far."""
+    page_offset: int = 0
+    """How many items of the page at ``cursor`` were already yielded."""
+    finished: bool = False
+    """Whether the endpoint had no more pages."""
+
+
+class CheckpointStore:
+    """
+    Where Paginator loads and saves its checkpoints.
+
+    Subclasses persist them somewhere that survives the process, see
+    services.crawlCheckpointService.DatabaseCheckpointStore.
+    """
+
+    async def load(self, job: str, endpoint: str, object_id: str) -> Optional[Checkpoint]:
+        raise NotImplementedError
+
+    async def save(self, checkpoint: Checkpoint):
+        raise NotImplementedError
+
+    async def delete(self, job: str, endpoint: str, object_id: str):
+        raise NotImplementedError
+
+
+class MemoryCheckpointStore(CheckpointStore):
+    """Keeps checkpoints in a dict, they only survive as long as the process."""
+
+    def __init__(self):
+        self._checkpoints: dict[tuple[str, str, str], Checkpoint] = {}
+
+    async def load(self, job: str, endpoint: str, object_id: str) -> Optional[Checkpoint]:
+        checkpoint = self._checkpoints.get((job, endpoint, object_id))
+        return dataclasses.replace(checkpoint) if checkpoint is not None else None
+
+    async def save(self, checkpoint: Checkpoint):
+        key = (checkpoint.job, checkpoint.endpoint, checkpoint.object_id)
+        self._checkpoints[key] = dataclasses.replace(checkpoint)
+
+    async def delete(self, job: str, endpoint: str, object_id: str):
+        self._checkpoints.pop((job, endpoint, object_id), None)
@@ -1,20 +1,53 @@
 from .exceptions import *
 
-import requests
 import random
+import hashlib
+from urllib.parse import urlencode
 
 
-def extract_video_id_from_url(url, headers={}, proxy=None):
-    url = requests.head(
-        url=url, allow_redirects=True, headers=headers, proxies=proxy
-    ).url
+def parse_video_id(url: str):
+    """Return the video id of a canonical video url, or None if it has to be resolved first."""
     if "@" in url and "/video/" in url:
         return url.split("/video/")[1].split("?")[0]
-    else:
+    return None
+
+
+async def extract_video_id_from_url(url, client, headers={}):
+    """
+    Return the video id of any video url, following redirects of short/mobile links.
+
+    Args:
+        url (str): The video url.
+        client (httpx.AsyncClient): The client used to follow redirects.
+        headers (dict): The headers to send.
+    """
+    video_id = parse_video_id(url)
+    if video_id is not None:
+        return video_id
+
+    resp = await client.head(url, headers=headers, follow_redirects=True)
+    video_id = parse_video_id(str(resp.url))
+    if video_id is None:
         raise TypeError(
             "URL format not supported. Below is an example of a supported url.\n"
             "https://www.tiktok.com/@therock/video/6829267836783971589"
         )
+    return video_id
+
+
+VOLATILE_PARAMS = frozenset({
+    "msToken", "WebIdLastTime", "X-Bogus", "X-Gnarly", "_signature", "verifyFp", "device_id",
+})
+"""Request params that change between calls without changing the response."""
+
+
+def request_cache_key(url: str, params: dict = None) -> str:
+    """Return a stable key for a request, ignoring volatile params and param order."""
+    kept = sorted(
+        (k, str(v)) for k, v in (params or {}).items()
+        if v is not None and k not in VOLATILE_PARAMS
+    )
+    return hashlib.sha256(f"{url}?{urlencode(kept)}".encode("utf-8")).hexdigest()
 
 
 def random_choice(choices: list):
@@ -0,0 +1,90 @@
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import Optional, Union
+from urllib.parse import quote, urlparse
+
+import httpx
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+def proxy_url(proxy: Union[str, dict, None]) -> Optional[str]:
+    """
+    Convert the proxy formats used around ApiTiktok into a single proxy url.
+
+    Accepts a url string, a Playwright proxy dict (``server``/``username``/``password``)
+    or a requests-style dict (``http``/``https``).
+    """
+    if not proxy:
+        return None
+    if isinstance(proxy, str):
+        return proxy
+    if "server" in proxy:
+        server = proxy["server"]
+        if "://" not in server:
+            server = f"http://{server}"
+        if proxy.get("username"):
+            parsed = urlparse(server)
+            credentials = quote(proxy["username"], safe="")
+            if proxy.get("password"):
+                credentials += ":" + quote(proxy["password"], safe="")
+            server = f"{parsed.scheme}://{credentials}@{parsed.netloc}{parsed.path}"
+        return server
+    return proxy.get("https") or proxy.get("http")
+
+
+class HttpClientPool:
+    """
+    Shared ``httpx.AsyncClient`` instances, one per proxy.
+
+    Every client keeps its connections alive between requests and speaks
+    HTTP/2 when the ``h2`` package is installed. Clients never store cookies,
+    so sessions sharing a client don't leak cookies into each other; pass
+    them per request instead.
+    """
+
+    def __init__(self, timeout: float = 30.0, max_connections: int = 100,
+                 max_keepalive_connections: int = 20, http2: bool = None,
+                 transport: httpx.AsyncBaseTransport = None):
+        """
+        Args:
+            timeout (float): Default timeout of every request, in seconds.
+            max_connections (int): The maximum amount of open connections per client.
+            max_keepalive_connections (int): How many idle connections each client keeps alive.
+            http2 (bool): Whether to use HTTP/2, defaults to True when ``h2`` is installed.
+            transport (httpx.AsyncBaseTransport): Send every request through this transport instead, proxies are ignored.
+        """
+        self.timeout = timeout
+        self.limits = httpx.Limits(
+            max_connections=max_connections, max_keepalive_connections=max_keepalive_connections
+        )
+        self.http2 = HTTP2_AVAILABLE if http2 is None else http2
+        self.transport = transport
+        self._clients: dict[Optional[str], httpx.AsyncClient] = {}
+
+    def get(self, proxy: Union[str, dict, None] = None) -> httpx.AsyncClient:
+        """Returns the client for a proxy, creating it on first use."""
+        url = proxy_url(proxy)
+        client = self._clients.get(url)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                proxy=url if self.transport is None else None,
+                transport=self.transport,
+                http2=self.http2,
+                limits=self.limits,
+                timeout=self.timeout,
+                follow_redirects=True,
+                cookies=httpx.Cookies(CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))),
+            )
+            self._clients[url] = client
+        return client
+
+    async def aclose(self):
+        """Close every client and their connections."""
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for client in clients:
+            await client.aclose()
@@ -0,0 +1,125 @@
+import json
+import re
+from typing import AsyncIterator, Iterable, Optional
+
+from .exceptions import InvalidResponseException
+
+SIGI_STATE = '<script id="SIGI_STATE" type="application/json">'
+UNIVERSAL_DATA = '<script id="__UNIVERSAL_DATA_FOR_REHYDRATION__" type="application/json">'
+SCRIPT_END = "</script>"
+
+_MARKERS = (SIGI_STATE, UNIVERSAL_DATA)
+_KEEP = max(len(m) for m in _MARKERS) - 1
+
+_ITEM_MODULE_KEY = re.compile(r'"ItemModule"\s*:\s*')
+_VIDEO_DETAIL_KEY = re.compile(r'"webapp\.video-detail"\s*:\s*')
+_decoder = json.JSONDecoder()
+
+
+class HydrationScanner:
+    """
+    Incrementally looks for the hydration script of a TikTok page.
+
+    Text is fed chunk by chunk. Before the opening tag is found only a small
+    tail of the text is kept, and once the closing tag is found the scanner is
+    done, so the rest of the page never needs to be read.
+    """
+
+    def __init__(self):
+        self.marker: Optional[str] = None
+        self.script: Optional[str] = None
+        self._buffer = ""
+
+    @property
+    def done(self) -> bool:
+        return self.script is not None
+
+    def feed(self, chunk: str) -> bool:
+        """Feed the next chunk of the page, returns True once the script is complete."""
+        if self.done:
+            return True
+        self._buffer += chunk
+
+        if self.marker is None:
+            found = [(self._buffer.find(m), m) for m in _MARKERS]
+            found = [(pos, m) for pos, m in found if pos != -1]
+            if not found:
+                self._buffer = self._buffer[-_KEEP:]
+                return False
+            pos, self.marker = min(found)
+            self._buffer = self._buffer[pos + len(self.marker):]
+
+        end = self._buffer.find(SCRIPT_END)
+        if end == -1:
+            return False
+        self.script = self._buffer[:end]
+        self._buffer = ""
+        return True
+
+
+async def read_hydration_script(chunks: AsyncIterator[str]) -> tuple[Optional[str], Optional[str]]:
+    """
+    Read text chunks until the hydration script is complete, then stop.
+
+    Returns:
+        tuple: The marker that was found (SIGI_STATE or UNIVERSAL_DATA) and the script text,
+        or (None, None) if the page has no hydration script.
+    """
+    scanner = HydrationScanner()
+    async for chunk in chunks:
+        if scanner.feed(chunk):
+            break
+    return scanner.marker if scanner.done else None, scanner.script
+
+
+def find_hydration_script(html: Iterable[str]) -> tuple[Optional[str], Optional[str]]:
+    """Synchronous version of read_hydration_script, for a page or an iterable of chunks."""
+    scanner = HydrationScanner()
+    for chunk in ([html] if isinstance(html, str) else html):
+        if scanner.feed(chunk):
+            break
+    return scanner.marker if scanner.done else None, scanner.script
+
+
+def _decode_value_after(pattern: re.Pattern, text: str):
+    match = pattern.search(text)
+    if match is None:
+        raise KeyError(pattern.pattern)
+    value, _ = _decoder.raw_decode(text, match.end())
+    return value
+
+
+def extract_video_item(marker: str, script: str, video_id: Optional[str] = None) -> dict:
+    """
+    Decode the itemStruct of a video out of its hydration script.
+
+    Only the subtree holding the video (``ItemModule`` or ``webapp.video-detail``)
+    is decoded instead of the whole script. If the subtree can't be located
+    the whole script is decoded as a fallback.
+
+    Raises:
+        InvalidResponseException: If the script doesn't hold the video.
+    """
+    try:
+        if marker == SIGI_STATE:
+            try:
+                item_module = _decode_value_after(_ITEM_MODULE_KEY, script)
+            except (KeyError, ValueError):
+                item_module = json.loads(script)["ItemModule"]
+            return item_module[video_id]
+
+        try:
+            video_detail = _decode_value_after(_VIDEO_DETAIL_KEY, script)
+        except (KeyError, ValueError):
+            video_detail = json.loads(script).get("__DEFAULT_SCOPE__", {}).get("webapp.video-detail", {})
+    except (KeyError, ValueError, TypeError):
+        raise InvalidResponseException(script, "TikTok returned an invalid response structure.")
+
+    if video_detail.get("statusCode", 0) != 0:  # assume 0 if not present
+        raise InvalidResponseException(
+            script, "TikTok returned an invalid response structure.", error_code=video_detail.get("statusCode")
+        )
+    video_info = video_detail.get("itemInfo", {}).get("itemStruct")
+    if video_info is None:
+        raise InvalidResponseException(script, "TikTok returned an invalid response structure.")
+    return video_info
@@ -0,0 +1,226 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+import uuid
+from typing import TYPE_CHECKING, Awaitable, Callable, Optional
+
+from .singleflight import SingleFlight
+
+if TYPE_CHECKING:
+    from .api.video import Video
+
+logger = logging.getLogger(__name__)
+
+MEDIA_KINDS = {
+    "downloadAddr": ".mp4",
+    "cover": ".jpeg",
+    "originCover": ".jpeg",
+}
+"""The media of a video the store knows about, with the extension of their files."""
+
+
+class MediaStore:
+    """
+    A content-addressed store of downloaded videos and covers.
+
+    Files live under ``<root>/objects/`` named by the sha256 of their content,
+    so identical media is kept once. ``<root>/index.json`` maps every
+    ``(video id, kind)`` to its content hash and remembers when each object was
+    last used; once the store grows past ``max_bytes`` the least recently used
+    objects are deleted. Concurrent requests for the same media share one
+    download and at most ``max_concurrent`` downloads run at once.
+
+    Example Usage:
+        .. code-block:: python
+
+            api = ApiTiktok(media_store=MediaStore("media", max_bytes=20 * 1024 ** 3))
+            ...
+            path = await api.video(url="https://www.tiktok.com/@davidteathercodes/video/7106686413101468970").fetch("downloadAddr")
+            print(api.media_store.stats())
+    """
+
+    def __init__(self, root: str, max_bytes: int = 10 * 1024 ** 3, max_concurrent: int = 4):
+        """
+        Args:
+            root (str): The directory of the store, created if missing.
+            max_bytes (int): The size above which least recently used objects are evicted.
+            max_concurrent (int): The maximum amount of downloads running at once.
+        """
+        self.root = root
+        self.max_bytes = max_bytes
+        self.objects_dir = os.path.join(root, "objects")
+        self.index_path = os.path.join(root, "index.json")
+        os.makedirs(self.objects_dir, exist_ok=True)
+
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._singleflight = SingleFlight()
+        self._keys: dict[str, str] = {}
+        self._objects: dict[str, dict] = {}
+        self.__load_index()
+
+        self.hits = 0
+        self.downloads = 0
+        self.deduplicated = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(video_id: str, kind: str) -> str:
+        return f"{video_id}:{kind}"
+
+    @property
+    def size(self) -> int:
+        """The bytes used by the stored objects."""
+        return sum(o["size"] for o in self._objects.values())
+
+    def path_of(self, content_hash: str, ext: str = "") -> str:
+        return os.path.join(self.objects_dir, content_hash[:2], content_hash + ext)
+
+    def lookup(self, video_id: str, kind: str) -> Optional[str]:
+        """Returns the path of a stored media and marks it as used, None if it isn't stored."""
+        content_hash = self._keys.get(self.key(video_id, kind))
+        entry = self._objects.get(content_hash) if content_hash is not None else None
+        if entry is None:
+            return None
+        path = self.path_of(content_hash, entry["ext"])
+        if not os.path.exists(path):
+            # deleted behind our back, forget it
+            self.__drop_object(content_hash)
+            return None
+        entry["last_access"] = time.time()
+        return path
+
+    async def get(self, video_id: str, kind: str, download: Callable[[str], Awaitable]) -> str:
+        """
+        Returns the path of a media, downloading it first if it isn't stored.
+
+        Args:
+            video_id (str): The id of the video the media belongs to.
+            kind (str): Which media, one of MEDIA_KINDS.
+            download (Callable): Called with a temporary path to write the media to.
+
+        Returns:
+            str: The path of the stored file, don't modify it, it may be shared with other videos.
+        """
+        path = self.lookup(video_id, kind)
+        if path is not None:
+            self.hits += 1
+            return path
+        key = self.key(video_id, kind)
+        return await self._singleflight.do(key, lambda: self.__store(video_id, kind, download))
+
+    async def get_video_media(self, video: "Video", kind: str = "downloadAddr", **kwargs) -> str:
+        """
+        Returns the path of a media of a Video, downloading it through Video.download if it isn't stored.
+
+        Args:
+            video (Video): The video, its info is loaded on a miss if it isn't yet.
+            kind (str): downloadAddr, cover or originCover.
+        """
+        if kind not in MEDIA_KINDS:
+            raise ValueError(f"Unknown media kind {kind}, expected one of {', '.join(MEDIA_KINDS)}")
+
+        async def download(path: str):
+            if not hasattr(video, "as_dict"):
+                await video.info(**kwargs)
+            await video.download(path, kind=kind, **kwargs)
+
+        return await self.get(video.id, kind, download)
+
+    async def __store(self, video_id: str, kind: str, download: Callable[[str], Awaitable]) -> str:
+        tmp_dir = os.path.join(self.root, "tmp")
+        os.makedirs(tmp_dir, exist_ok=True)
+        tmp_path = os.path.join(tmp_dir, f"{uuid.uuid4().hex}{MEDIA_KINDS.get(kind, '')}")
+        try:
+            async with self._semaphore:
+                await download(tmp_path)
+            self.downloads += 1
+            content_hash, size = await asyncio.to_thread(self.__hash_file, tmp_path)
+
+            ext = MEDIA_KINDS.get(kind, "")
+            path = self.path_of(content_hash, ext)
+            if content_hash in self._objects and os.path.exists(path):
+                self.deduplicated += 1
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(tmp_path, path)
+                self._objects[content_hash] = {"size": size, "ext": ext}
+        finally:
+            for leftover in (tmp_path, f"{tmp_path}.part", f"{tmp_path}.part.json"):
+                if os.path.exists(leftover):
+                    os.remove(leftover)
+
+        self._objects[content_hash]["last_access"] = time.time()
+        self._keys[self.key(video_id, kind)] = content_hash
+        self.__evict(keep=content_hash)
+        self.__save_index()
+        return path
+
+    def __evict(self, keep: str):
+        """Delete least recently used objects until the store fits in max_bytes."""
+        total = self.size
+        if total <= self.max_bytes:
+            return
+        for content_hash in sorted(self._objects, key=lambda h: self._objects[h]["last_access"]):
+            if total <= self.max_bytes:
+                break
+            if content_hash == keep:
+                continue
+            total -= self._objects[content_hash]["size"]
+            path = self.path_of(content_hash, self._objects[content_hash]["ext"])
+            if os.path.exists(path):
+                os.remove(path)
+            self.__drop_object(content_hash)
+            self.evictions += 1
+
+    def __drop_object(self, content_hash: str):
+        self._objects.pop(content_hash, None)
+        for key in [k for k, h in self._keys.items() if h == content_hash]:
+            del self._keys[key]
+
+    @staticmethod
+    def __hash_file(path: str) -> tuple[str, int]:
+        digest = hashlib.sha256()
+        size = 0
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+                size += len(block)
+        return digest.hexdigest(), size
+
+    def __load_index(self):
+        if not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable media index {self.index_path}: {e}")
+            return
+        self._objects = index.get("objects", {})
+        self._keys = {k: h for k, h in index.get("keys", {}).items() if h in self._objects}
+
+    def __save_index(self):
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"keys": self._keys, "objects": self._objects}, f, separators=(",", ":"))
+        os.replace(tmp_path, self.index_path)
+
+    def stats(self) -> dict:
+        """
+        Returns the counters of the store.
+
+        Returns:
+            dict: hits, downloads, deduplicated, evictions, objects, keys and bytes.
+        """
+        return {
+            "hits": self.hits,
+            "downloads": self.downloads,
+            "deduplicated": self.deduplicated,
+            "evictions": self.evictions,
+            "objects": len(self._objects),
+            "keys": len(self._keys),
+            "bytes": self.size,
+        }
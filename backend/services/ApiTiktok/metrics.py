@@ -0,0 +1,180 @@
+import contextlib
+import contextvars
+import dataclasses
+import logging
+import time
+from collections import deque
+from typing import Callable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+_endpoint: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("tiktok_endpoint", default=None)
+_session_index: contextvars.ContextVar[Optional[int]] = contextvars.ContextVar("tiktok_session_index", default=None)
+
+
+@dataclasses.dataclass
+class Span:
+    """The timing of one phase of a call."""
+
+    phase: str
+    """What was timed, e.g. ``sign``, ``fetch`` or ``parse``."""
+    endpoint: Optional[str] = None
+    """The endpoint path (``/api/post/item_list/``) or the method (``video.info``) the phase belongs to."""
+    session_index: Optional[int] = None
+    """The session the phase ran on, None before a session is picked."""
+    start: float = 0.0
+    """When the phase started, as a ``time.time()`` timestamp."""
+    duration: float = 0.0
+    """How long the phase took, in seconds."""
+    error: Optional[str] = None
+    """The name of the exception the phase failed with, None if it succeeded."""
+    attrs: dict = dataclasses.field(default_factory=dict)
+
+
+class Histogram:
+    """
+    Durations of one phase: exact count, sum and max, percentiles over the
+    ``size`` most recent samples.
+    """
+
+    def __init__(self, size: int = 2048):
+        self.samples: deque[float] = deque(maxlen=size)
+        self.count = 0
+        self.errors = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float, error: bool = False):
+        self.samples.append(value)
+        self.count += 1
+        self.errors += error
+        self.sum += value
+        self.max = max(self.max, value)
+
+    @staticmethod
+    def _percentile(ordered: list[float], q: float) -> float:
+        if not ordered:
+            return 0.0
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def snapshot(self) -> dict:
+        ordered = sorted(self.samples)
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "p50": self._percentile(ordered, 0.50),
+            "p95": self._percentile(ordered, 0.95),
+            "p99": self._percentile(ordered, 0.99),
+            "max": self.max,
+        }
+
+
+class Metrics:
+    """
+    Collects timing spans of the ApiTiktok calls into histograms by endpoint and by session.
+
+    Spans opened inside another span inherit its endpoint and session, also
+    across tasks started from it, so deep helpers (the signer...) only name
+    their phase. Hooks receive every finished span, to forward them to another
+    collector.
+
+    Example Usage:
+        .. code-block:: python
+
+            api.on_span(lambda span: statsd.timing(f"tiktok.{span.phase}", span.duration * 1000))
+            ...
+            print(api.stats()["endpoints"]["/api/post/item_list/"]["fetch"]["p95"])
+    """
+
+    def __init__(self, reservoir_size: int = 2048):
+        """
+        Args:
+            reservoir_size (int): The amount of recent samples percentiles are computed over, per histogram.
+        """
+        self.reservoir_size = reservoir_size
+        self._by_endpoint: dict[str, dict[str, Histogram]] = {}
+        self._by_session: dict[int, dict[str, Histogram]] = {}
+        self._hooks: list[Callable[[Span], None]] = []
+
+    def on_span(self, hook: Callable[[Span], None]) -> Callable[[Span], None]:
+        """Register a function called with every finished span, returns it so it can be used as a decorator."""
+        self._hooks.append(hook)
+        return hook
+
+    def remove_hook(self, hook: Callable[[Span], None]):
+        self._hooks.remove(hook)
+
+    @contextlib.contextmanager
+    def span(self, phase: str, endpoint: str = None, session_index: int = None, **attrs) -> Iterator[Span]:
+        """
+        Time the body of a ``with`` block.
+
+        Args:
+            phase (str): The name of the phase.
+            endpoint (str): The endpoint of the phase and of the spans opened inside it, inherited if None.
+            session_index (int): The session of the phase and of the spans opened inside it, inherited if None.
+        """
+        endpoint_token = _endpoint.set(endpoint) if endpoint is not None else None
+        session_token = _session_index.set(session_index) if session_index is not None else None
+        span = Span(phase, _endpoint.get(), _session_index.get(), start=time.time(), attrs=attrs)
+        started = time.perf_counter()
+        try:
+            yield span
+        except BaseException as e:
+            span.error = type(e).__name__
+            raise
+        finally:
+            span.duration = time.perf_counter() - started
+            if session_token is not None:
+                _session_index.reset(session_token)
+            if endpoint_token is not None:
+                _endpoint.reset(endpoint_token)
+            self.record(span)
+
+    def observe(self, phase: str, duration: float, **attrs):
+        """Record a phase timed by the caller, e.g. a sleep, in the current endpoint and session."""
+        self.record(Span(phase, _endpoint.get(), _session_index.get(), start=time.time() - duration,
+                         duration=duration, attrs=attrs))
+
+    def record(self, span: Span):
+        error = span.error is not None
+        if span.endpoint is not None:
+            self.__histogram(self._by_endpoint, span.endpoint, span.phase).observe(span.duration, error)
+        if span.session_index is not None:
+            self.__histogram(self._by_session, span.session_index, span.phase).observe(span.duration, error)
+        for hook in self._hooks:
+            try:
+                hook(span)
+            except Exception as e:
+                logger.warning(f"Span hook {hook!r} failed: {e}")
+
+    def __histogram(self, groups: dict, key, phase: str) -> Histogram:
+        phases = groups.setdefault(key, {})
+        histogram = phases.get(phase)
+        if histogram is None:
+            histogram = phases[phase] = Histogram(self.reservoir_size)
+        return histogram
+
+    def snapshot(self) -> dict:
+        """
+        Returns the histograms of every phase.
+
+        Returns:
+            dict: ``{"endpoints": {endpoint: {phase: histogram}}, "sessions": {index: {phase: histogram}}}``,
+            each histogram having count, errors, mean, p50, p95, p99 and max, in seconds.
+        """
+        return {
+            "endpoints": {
+                endpoint: {phase: h.snapshot() for phase, h in phases.items()}
+                for endpoint, phases in self._by_endpoint.items()
+            },
+            "sessions": {
+                index: {phase: h.snapshot() for phase, h in phases.items()}
+                for index, phases in sorted(self._by_session.items())
+            },
+        }
+
+    def reset(self):
+        self._by_endpoint.clear()
+        self._by_session.clear()
@@ -0,0 +1,223 @@
+from __future__ import annotations
+import asyncio
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Optional
+from urllib.parse import urlparse
+
+from .checkpoint import Checkpoint, CheckpointStore
+from .exceptions import InvalidResponseException
+
+if TYPE_CHECKING:
+    from .tiktok import ApiTiktok
+
+_DONE = object()
+
+
+class Paginator:
+    """
+    Iterates over a cursor-based TikTok endpoint, page after page.
+
+    The next page is requested (signed and fetched) in the background as soon
+    as the previous one arrived, while the caller is still going through its
+    items. At most ``prefetch`` pages wait in the buffer, so a slow consumer
+    throttles the requests instead of piling pages up in memory. Pages can't be
+    signed in batches with presign_requests: the cursor of a page is only
+    known once the previous one arrived.
+
+    With a ``checkpoint`` store, the cursor and the amount of items seen are
+    saved each time the caller finished a page, and a later paginator of the
+    same job, endpoint and object resumes from there. Items of the page the
+    caller stopped in are not yielded again after a resume.
+
+    Example Usage:
+        .. code-block:: python
+
+            paginator = Paginator(
+                api, "https://www.tiktok.com/api/post/item_list/",
+                params={"secUid": sec_uid, "count": 35},
+                items_key="itemList", factory=lambda data: api.video(data=data), count=100,
+            )
+            async for video in paginator:
+                ...
+    """
+
+    HAS_MORE_KEYS = ("has_more", "hasMore")
+
+    def __init__(
+        self,
+        parent: ApiTiktok,
+        url: str,
+        params: dict,
+        items_key: str,
+        factory: Callable[[dict], Any] = None,
+        count: int = 30,
+        cursor: Any = 0,
+        cursor_param: Optional[str] = "cursor",
+        has_more_keys: Optional[tuple] = HAS_MORE_KEYS,
+        object_id: Optional[str] = None,
+        required_fields: tuple = (),
+        **kwargs,
+    ):
+        """
+        Args:
+            parent (ApiTiktok): The api used to make the requests.
+            url (str): The endpoint url.
+            params (dict): The params of every request, the cursor is added to them.
+            items_key (str): The key of the list of items in each response.
+            factory (Callable): Builds the yielded object from a raw item, raw items are yielded if None.
+            count (int): The amount of items to yield at most.
+            cursor: The cursor of the first page.
+            cursor_param (str): The param holding the cursor, None for endpoints without one.
+            has_more_keys (tuple): The response keys telling if there is a next page,
+                None for endpoints that always have one (it stops on an empty page instead).
+            object_id (str): The id of the paginated object, needed for checkpoints.
+            required_fields (tuple): Item fields the factory can't do without, always kept by a projection.
+            max_pages (int): The maximum amount of pages to request, unbounded if None.
+            prefetch (int): How many pages may be fetched ahead of the caller, 0 disables prefetching.
+            headers (dict): The headers passed to make_request.
+            session_index (int): The session passed to make_request.
+            checkpoint (CheckpointStore): Save progress there and resume from it, count then includes
+                the items yielded before the resume.
+            job (str): The name of the crawl the checkpoint belongs to, defaults to "default".
+            fields (list[str]): Dotted paths of the item fields to keep, trimmed inside the page.
+                Every field is kept if None.
+        """
+        self.parent = parent
+        self.url = url
+        self.params = params
+        self.items_key = items_key
+        self.factory = factory
+        self.count = count
+        self.cursor = cursor
+        self.cursor_param = cursor_param
+        self.has_more_keys = has_more_keys
+        self.max_pages = kwargs.get("max_pages")
+        self.prefetch = kwargs.get("prefetch", 1)
+        self.request_kwargs = {
+            "headers": kwargs.get("headers"),
+            "session_index": kwargs.get("session_index"),
+        }
+        if kwargs.get("fields") is not None:
+            self.request_kwargs["fields"] = [*required_fields, *kwargs["fields"]]
+            self.request_kwargs["items_key"] = items_key
+        self.object_id = object_id
+        self.checkpoint_store: Optional[CheckpointStore] = kwargs.get("checkpoint")
+        self.job = kwargs.get("job", "default")
+        self.checkpoint: Optional[Checkpoint] = None
+        if self.checkpoint_store is not None and (cursor_param is None or object_id is None):
+            raise ValueError(f"{urlparse(url).path} doesn't support checkpoints.")
+        self.pages_fetched = 0
+        self.items_found = 0
+        self.items_yielded = 0
+
+    def __has_more(self, resp: dict) -> bool:
+        if self.has_more_keys is None:
+            return True
+        return any(resp.get(key) for key in self.has_more_keys)
+
+    def __is_last(self, resp: dict, cursor) -> bool:
+        items = resp.get(self.items_key) or []
+        return not self.__has_more(resp) or (not items and resp.get("cursor") == cursor)
+
+    async def __resume(self) -> bool:
+        """Load the checkpoint of this crawl, returns False if the crawl already finished."""
+        if self.checkpoint_store is None:
+            return True
+        endpoint = urlparse(self.url).path
+        self.checkpoint = await self.checkpoint_store.load(self.job, endpoint, self.object_id)
+        if self.checkpoint is None:
+            self.checkpoint = Checkpoint(self.job, endpoint, self.object_id, cursor=self.cursor)
+            return True
+        if self.checkpoint.finished:
+            return False
+        self.cursor = self.checkpoint.cursor
+        self.items_yielded = self.checkpoint.items_seen
+        self.items_found = self.checkpoint.items_seen - self.checkpoint.page_offset
+        return True
+
+    async def __save(self, resp: Optional[dict] = None, page_offset: int = 0):
+        """Record the progress, moving the cursor past ``resp`` if the caller finished it."""
+        if self.checkpoint is None:
+            return
+        if resp is not None:
+            self.checkpoint.finished = self.__is_last(resp, self.checkpoint.cursor)
+            self.checkpoint.cursor = resp.get("cursor")
+        self.checkpoint.items_seen = self.items_yielded
+        self.checkpoint.page_offset = page_offset
+        await self.checkpoint_store.save(self.checkpoint)
+
+    async def __fetch(self, cursor) -> dict:
+        params = dict(self.params)
+        if self.cursor_param is not None:
+            params[self.cursor_param] = cursor
+        resp = await self.parent.make_request(url=self.url, params=params, **self.request_kwargs)
+        if resp is None:
+            raise InvalidResponseException(resp, "TikTok returned an invalid response.")
+        return resp
+
+    async def __fetch_pages(self) -> AsyncIterator[dict]:
+        cursor = self.cursor
+        while self.items_found < self.count:
+            if self.max_pages is not None and self.pages_fetched >= self.max_pages:
+                return
+            resp = await self.__fetch(cursor)
+            self.pages_fetched += 1
+
+            self.items_found += len(resp.get(self.items_key) or [])
+            yield resp
+
+            if self.__is_last(resp, cursor):
+                return
+            cursor = resp.get("cursor")
+
+    async def pages(self) -> AsyncIterator[dict]:
+        """Yields the raw responses, fetching up to ``prefetch`` pages ahead."""
+        if not await self.__resume():
+            return
+        if self.prefetch <= 0:
+            async for resp in self.__fetch_pages():
+                yield resp
+            return
+
+        buffer: asyncio.Queue = asyncio.Queue(maxsize=self.prefetch)
+
+        async def produce():
+            try:
+                async for resp in self.__fetch_pages():
+                    await buffer.put(resp)
+            except Exception as e:
+                await buffer.put(e)
+            else:
+                await buffer.put(_DONE)
+
+        producer = asyncio.create_task(produce())
+        try:
+            while True:
+                resp = await buffer.get()
+                if resp is _DONE:
+                    return
+                if isinstance(resp, Exception):
+                    raise resp
+                yield resp
+        finally:
+            producer.cancel()
+
+    async def items(self) -> AsyncIterator[Any]:
+        """Yields at most ``count`` items, built with the factory."""
+        pages = self.pages()
+        try:
+            async for resp in pages:
+                skip = self.checkpoint.page_offset if self.checkpoint is not None else 0
+                for offset, item in enumerate(resp.get(self.items_key) or []):
+                    if offset < skip:
+                        continue
+                    if self.items_yielded >= self.count:
+                        await self.__save(page_offset=offset)
+                        return
+                    yield self.factory(item) if self.factory is not None else item
+                    self.items_yielded += 1
+                await self.__save(resp)
+        finally:
+            await pages.aclose()
+
+    def __aiter__(self):
+        return self.items()
@@ -0,0 +1,226 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from .tiktok import ApiTiktok, TikTokPlaywrightSession
+
+
+class SessionPool:
+    """
+    A long-lived pool of warmed Playwright sessions sharing one browser.
+
+    The browser is launched and the sessions are created once, on first use.
+    Callers lease a session, use its index with the regular ApiTiktok endpoints
+    and give it back, so no call pays for a browser launch.
+
+    Example Usage:
+        .. code-block:: python
+
+            pool = await get_session_pool(num_sessions=2, ms_tokens=[ms_token])
+            async with pool.session() as (i, session):
+                video = pool.api.video(id='7041997751718137094')
+                async for comment in video.comments(session_index=i):
+                    ...
+    """
+
+    def __init__(self, num_sessions: int = 2, logging_level: int = logging.WARN, **session_options):
+        """
+        Create a SessionPool. Nothing is launched until the first acquire() or start().
+
+        Args:
+            num_sessions (int): The amount of sessions to keep warm.
+            logging_level (int): The logging level for the underlying ApiTiktok.
+            session_options: Any other keyword argument accepted by ApiTiktok.create_sessions.
+        """
+        self.api = ApiTiktok(logging_level=logging_level)
+        self.num_sessions = num_sessions
+        self.session_options = session_options
+        self.restarts = 0
+
+        self._loop = asyncio.get_running_loop()
+        self._start_lock = asyncio.Lock()
+        self._idle: asyncio.Queue[int] = asyncio.Queue()
+        self._in_use: set[int] = set()
+        self._all_idle = asyncio.Event()
+        self._all_idle.set()
+        self._crashed: set[int] = set()
+        self._waiting = 0
+        self._started = False
+
+    @property
+    def started(self) -> bool:
+        return self._started
+
+    async def start(self):
+        """Launch the browser and warm up every session, if it has not been done yet."""
+        async with self._start_lock:
+            if self._started:
+                return
+            await self.api.create_sessions(num_sessions=self.num_sessions, **self.session_options)
+            for i in range(len(self.api.sessions)):
+                self.__watch_page(i)
+                self._idle.put_nowait(i)
+            self._started = True
+
+    def __watch_page(self, session_index: int):
+        page = self.api.sessions[session_index].page
+        page.on("crash", lambda _: self._crashed.add(session_index))
+
+    async def __ensure_healthy(self, session_index: int):
+        async with self._start_lock:
+            if not self.api.browser.is_connected():
+                # every session is recreated, wait until the leased ones are given back
+                # (their requests fail with the browser gone), new leases wait on the lock
+                self.api.logger.warning("Pooled browser disconnected, relaunching it once every lease is released")
+                await self._all_idle.wait()
+                await self.api.restart_browser()
+                self._crashed.clear()
+                for i in range(len(self.api.sessions)):
+                    self.__watch_page(i)
+                self.restarts += 1
+                return
+
+        session = self.api.sessions[session_index]
+        if session_index in self._crashed or session.page.is_closed():
+            self.api.logger.warning(f"Pooled session {session_index} crashed, recreating it")
+            await self.api.recreate_session(session_index)
+            self._crashed.discard(session_index)
+            self.__watch_page(session_index)
+            self.restarts += 1
+
+    async def acquire(self, timeout: Optional[float] = None) -> tuple[int, TikTokPlaywrightSession]:
+        """
+        Lease an idle session, waiting for one to be released if they are all in use.
+
+        Args:
+            timeout (float): How long to wait for a free session, waits forever if None.
+
+        Returns:
+            tuple[int, TikTokPlaywrightSession]: The session index and the session.
+
+        Raises:
+            asyncio.TimeoutError: If no session was released within the timeout.
+        """
+        await self.start()
+
+        self._waiting += 1
+        try:
+            session_index = await asyncio.wait_for(self._idle.get(), timeout)
+        finally:
+            self._waiting -= 1
+
+        try:
+            await self.__ensure_healthy(session_index)
+        except Exception:
+            self._idle.put_nowait(session_index)
+            raise
+
+        self._in_use.add(session_index)
+        self._all_idle.clear()
+        return session_index, self.api.sessions[session_index]
+
+    def release(self, session_index: int):
+        """Give a leased session back to the pool."""
+        if session_index not in self._in_use:
+            return
+        self._in_use.discard(session_index)
+        if not self._in_use:
+            self._all_idle.set()
+        self._idle.put_nowait(session_index)
+
+    @asynccontextmanager
+    async def session(self, timeout: Optional[float] = None):
+        """Lease a session for the duration of an ``async with`` block."""
+        session_index, session = await self.acquire(timeout)
+        try:
+            yield session_index, session
+        finally:
+            self.release(session_index)
+
+    def stats(self) -> dict:
+        """
+        Returns a snapshot of the pool usage.
+
+        Returns:
+            dict: size, in_use, idle, waiting, restarts, whether the browser is connected and
+            the requests blocked and the estimated bytes saved by resource blocking over every session.
+        """
+        browser = getattr(self.api, "browser", None)
+        blockers = [s.resource_blocker for s in self.api.sessions if s.resource_blocker is not None]
+        return {
+            "size": len(self.api.sessions),
+            "in_use": len(self._in_use),
+            "idle": self._idle.qsize(),
+            "waiting": self._waiting,
+            "restarts": self.restarts,
+            "browser_connected": bool(browser and browser.is_connected()),
+            "blocked_requests": sum(b.blocked_requests for b in blockers),
+            "estimated_bytes_saved": sum(b.estimated_bytes_saved for b in blockers),
+        }
+
+    async def close(self):
+        """Close every session and stop the browser."""
+        async with self._start_lock:
+            if not self._started:
+                return
+            try:
+                await self.api.close_sessions()
+                await self.api.stop_playwright()
+            finally:
+                await self.api.http.aclose()
+                self._started = False
+
+
+_pool: Optional[SessionPool] = None
+
+
+async def get_session_pool(num_sessions: int = 2, **session_options) -> SessionPool:
+    """
+    Returns the process-wide SessionPool, creating it on first use.
+
+    The options are only used when the pool is created. A pool is bound to the
+    event loop it was created on: if the loop changed the old pool is closed on
+    its own loop before a new one is created.
+
+    Raises:
+        RuntimeError: If the loop of the old pool stopped without close_session_pool(),
+            its browser can't be closed anymore.
+    """
+    global _pool
+    loop = asyncio.get_running_loop()
+    if _pool is not None and _pool._loop is not loop:
+        if not _pool._loop.is_running():
+            raise RuntimeError(
+                "The session pool belongs to an event loop that stopped without close_session_pool(), "
+                "call close_session_pool() before its loop ends"
+            )
+        await _close_on_own_loop(_pool)
+        _pool = None
+    if _pool is None:
+        _pool = SessionPool(num_sessions=num_sessions, **session_options)
+    await _pool.start()
+    return _pool
+
+
+async def close_session_pool():
+    """
+    Close the process-wide SessionPool if there is one.
+
+    A pool whose loop already stopped can't be closed, it is only dropped.
+    """
+    global _pool
+    pool, _pool = _pool, None
+    if pool is None:
+        return
+    if pool._loop is asyncio.get_running_loop():
+        await pool.close()
+    elif pool._loop.is_running():
+        await _close_on_own_loop(pool)
+    else:
+        pool.api.logger.warning("Dropping a session pool whose event loop stopped without closing it")
+
+
+async def _close_on_own_loop(pool: SessionPool):
+    """Close a pool from another loop, Playwright objects only work on the loop that created them."""
+    await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(pool.close(), pool._loop))
@@ -0,0 +1,75 @@
+from typing import Any, Iterable, Optional
+
+PROJECT_FUNCTION = """
+    const project = (value, spec) => {
+        if (spec === true || value === null || typeof value !== 'object') return value;
+        if (Array.isArray(value)) return value.map(v => project(v, spec));
+        const out = {};
+        for (const key of Object.keys(spec)) {
+            if (key in value) out[key] = project(value[key], spec[key]);
+        }
+        return out;
+    };
+    const projectText = (text, projection) => {
+        if (!projection || !text) return text;
+        let data;
+        try {
+            data = JSON.parse(text);
+        } catch (error) {
+            return text;
+        }
+        const { key, spec } = projection;
+        if (data && typeof data === 'object' && key in data) data[key] = project(data[key], spec);
+        return JSON.stringify(data);
+    };
+"""
+"""Javascript helpers applying a projection to a response text inside the page."""
+
+PROJECTED_FETCH_SCRIPT = """
+    async ({ url, headers, projection }) => {
+        %s
+        const response = await fetch(url, { method: 'GET', headers });
+        return projectText(await response.text(), projection);
+    }
+""" % PROJECT_FUNCTION
+
+
+def build_projection(fields: Iterable[str], required: Iterable[str] = ()) -> dict:
+    """
+    Turn dotted field paths into the nested spec used by project().
+
+    A path selects a key and everything below it, paths going through a
+    list apply to every element of the list.
+
+    Example:
+        >>> build_projection(["id", "stats.playCount", "author.uniqueId", "stats"])
+        {'id': True, 'stats': True, 'author': {'uniqueId': True}}
+    """
+    spec: dict = {}
+    for path in [*required, *fields]:
+        node = spec
+        parts = path.split(".")
+        for part in parts[:-1]:
+            child = node.get(part)
+            if child is True:
+                break
+            node = node.setdefault(part, {})
+        else:
+            node[parts[-1]] = True
+    return spec
+
+
+def project(value: Any, spec) -> Any:
+    """Keep only the paths of ``spec`` in ``value``, the Python twin of the in-page projection."""
+    if spec is True or not isinstance(value, (dict, list)):
+        return value
+    if isinstance(value, list):
+        return [project(v, spec) for v in value]
+    return {key: project(value[key], sub) for key, sub in spec.items() if key in value}
+
+
+def projection_key(fields: Optional[Iterable[str]]) -> Optional[str]:
+    """A stable representation of a projection, to tell projected responses apart in caches."""
+    if fields is None:
+        return None
+    return ",".join(sorted(set(fields)))
@@ -0,0 +1,263 @@
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Union
+from urllib.parse import parse_qsl, urlparse, urlsplit
+
+import httpx
+
+from .helpers import VOLATILE_PARAMS, request_cache_key
+
+REPLAY_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+
+class Cassette:
+    """
+    Recorded responses keyed by method, url path and non-volatile params.
+
+    The host is not part of the key, so a stand-in server can serve the same
+    cassette. Recording a request again replaces its response.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path (str): The file save() writes to, if not given to save().
+        """
+        self.path = path
+        self.interactions: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(method: str, url: str, params: Optional[dict] = None) -> str:
+        split = urlsplit(url)
+        merged = {**dict(parse_qsl(split.query)), **(params or {})}
+        return f"{method.upper()} {request_cache_key(split.path, merged)}"
+
+    def record(self, method: str, url: str, params: Optional[dict], body: str,
+               status: int = 200, content_type: str = "application/json"):
+        split = urlsplit(url)
+        merged = {**dict(parse_qsl(split.query)), **(params or {})}
+        with self._lock:
+            self.interactions[self.key(method, url, params)] = {
+                "method": method.upper(),
+                "path": split.path,
+                "params": {k: str(v) for k, v in sorted(merged.items())
+                           if v is not None and k not in VOLATILE_PARAMS},
+                "status": status,
+                "content_type": content_type,
+                "body": body,
+            }
+
+    def find(self, method: str, url: str, params: Optional[dict] = None) -> Optional[dict]:
+        return self.interactions.get(self.key(method, url, params))
+
+    def __len__(self):
+        return len(self.interactions)
+
+    @classmethod
+    def load(cls, path: str) -> "Cassette":
+        cassette = cls(path)
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        for interaction in data.get("interactions", []):
+            key = f"{interaction['method']} {request_cache_key(interaction['path'], interaction['params'])}"
+            cassette.interactions[key] = interaction
+        return cassette
+
+    def save(self, path: Optional[str] = None):
+        path = path or self.path
+        if path is None:
+            raise ValueError("Cassette.save() needs a path")
+        with self._lock:
+            interactions = sorted(self.interactions.values(), key=lambda i: (i["path"], sorted(i["params"].items())))
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": self.VERSION, "interactions": interactions}, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, path)
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """
+    An httpx transport answering from a cassette, or forwarding every request to a stand-in server.
+
+    Unknown requests get a 404 with an empty body.
+    """
+
+    def __init__(self, cassette: Optional[Cassette] = None, base_url: Optional[str] = None):
+        """
+        Args:
+            cassette (Cassette): Answer in-process from this cassette.
+            base_url (str): Or send the requests to this server (a StandInServer url), keeping their path and query.
+        """
+        if (cassette is None) == (base_url is None):
+            raise ValueError("Give either a cassette or a base_url")
+        self.cassette = cassette
+        self.base_url = urlparse(base_url) if base_url is not None else None
+        self._forward = httpx.AsyncHTTPTransport() if base_url is not None else None
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self._forward is not None:
+            request.url = request.url.copy_with(
+                scheme=self.base_url.scheme, host=self.base_url.hostname, port=self.base_url.port
+            )
+            request.headers["host"] = self.base_url.netloc
+            return await self._forward.handle_async_request(request)
+
+        interaction = self.cassette.find(request.method, str(request.url))
+        if interaction is None:
+            return httpx.Response(404, request=request)
+        return httpx.Response(
+            interaction["status"],
+            headers={"content-type": interaction["content_type"]},
+            content=interaction["body"].encode("utf-8"),
+            request=request,
+        )
+
+    async def aclose(self):
+        if self._forward is not None:
+            await self._forward.aclose()
+
+
+class ReplayContext:
+    """Stands for the browser context of an offline session, it only keeps cookies."""
+
+    def __init__(self):
+        self._cookies: list[dict] = []
+
+    async def cookies(self) -> list[dict]:
+        return list(self._cookies)
+
+    async def add_cookies(self, cookies: list[dict]):
+        names = {c["name"] for c in cookies}
+        self._cookies = [c for c in self._cookies if c["name"] not in names] + list(cookies)
+
+    async def close(self):
+        pass
+
+
+class ReplayPage:
+    """Stands for the page of an offline session, there is nothing to evaluate in."""
+
+    async def close(self):
+        pass
+
+
+class StandInServer:
+    """
+    A local HTTP server answering TikTok requests from a cassette.
+
+    Requests can be delayed by ``latency`` seconds (a ``(min, max)`` tuple picks a
+    delay per request) and fail with ``error_status`` at ``error_rate``. With a
+    ``seed`` the delays and failures are the same on every run.
+
+    Example Usage:
+        .. code-block:: python
+
+            cassette = Cassette.load("cassettes/therock.json")
+            with StandInServer(cassette, latency=0.05, error_rate=0.1, seed=1) as server:
+                await api.replay_from(base_url=server.url)
+                await api.user(username="therock").info()
+    """
+
+    def __init__(self, cassette: Cassette, latency: Union[float, tuple[float, float]] = 0.0,
+                 error_rate: float = 0.0, error_status: int = 503, seed: Optional[int] = None,
+                 host: str = "127.0.0.1", port: int = 0):
+        self.cassette = cassette
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.requests = 0
+        self.errors = 0
+        self.misses = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self.__handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StandInServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="tiktok-stand-in", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    async def __aenter__(self):
+        return self.start()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await asyncio.to_thread(self.stop)
+
+    def _draw(self) -> tuple[float, bool]:
+        with self._lock:
+            self.requests += 1
+            if isinstance(self.latency, tuple):
+                delay = self._random.uniform(*self.latency)
+            else:
+                delay = self.latency
+            failed = self.error_rate > 0 and self._random.random() < self.error_rate
+            self.errors += failed
+        return delay, failed
+
+    def __handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def __respond(self, status: int, body: bytes = b"", content_type: str = "text/plain"):
+                self.send_response(status)
+                self.send_header("content-type", content_type)
+                self.send_header("content-length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def __serve(self):
+                length = int(self.headers.get("content-length") or 0)
+                if length:
+                    self.rfile.read(length)
+                delay, failed = server._draw()
+                if delay > 0:
+                    time.sleep(delay)
+                if failed:
+                    return self.__respond(server.error_status)
+                interaction = server.cassette.find(self.command, self.path)
+                if interaction is None:
+                    with server._lock:
+                        server.misses += 1
+                    return self.__respond(404)
+                self.__respond(interaction["status"], interaction["body"].encode("utf-8"), interaction["content_type"])
+
+            do_GET = __serve
+            do_POST = __serve
+
+        return Handler
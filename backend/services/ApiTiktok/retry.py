@@ -0,0 +1,170 @@
+import asyncio
+import dataclasses
+import random
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from .exceptions import CaptchaException, EmptyResponseException, InvalidJSONException
+
+RETRYABLE_ERRORS = (EmptyResponseException, InvalidJSONException, CaptchaException, asyncio.TimeoutError)
+"""Errors worth another attempt, possibly on another session."""
+
+
+class CircuitBreaker:
+    """
+    Stops traffic to a session that keeps failing.
+
+    The breaker opens after ``failure_threshold`` consecutive failures and
+    rejects requests for ``cooldown`` seconds. Then it admits a single probe
+    request (half-open), the one ``admit`` returned a token to: its success
+    closes the breaker, its failure opens it again for twice as long, up to
+    ``max_cooldown``. Outcomes of other requests, like the ones still in
+    flight when the breaker opened, don't change an open or half-open breaker.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 3, cooldown: float = 60.0, max_cooldown: float = 600.0):
+        """
+        Args:
+            failure_threshold (int): Consecutive failures before the breaker opens.
+            cooldown (float): How long the breaker stays open the first time, in seconds.
+            max_cooldown (float): The longest the breaker stays open after failed probes, in seconds.
+        """
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.trips = 0
+        self._current_cooldown = cooldown
+        self._half_open = False
+        self._probe: Optional[object] = None
+
+    def state(self, now: float = None) -> str:
+        now = now if now is not None else time.monotonic()
+        if self.open_until > now:
+            return self.OPEN
+        if self._half_open:
+            return self.HALF_OPEN
+        return self.CLOSED
+
+    def is_open(self, now: float = None) -> bool:
+        return self.state(now) == self.OPEN
+
+    @property
+    def probing(self) -> bool:
+        """Whether the probe request of the half-open breaker is in flight."""
+        return self._probe is not None
+
+    def admit(self, now: float = None) -> Optional[object]:
+        """
+        Returns a probe token when the breaker is half-open and no probe is in flight yet, else None.
+
+        Pass the token to record_success, record_failure or abandon once the request is done.
+        """
+        if self._probe is not None or self.state(now) != self.HALF_OPEN:
+            return None
+        self._probe = object()
+        return self._probe
+
+    def abandon(self, probe: Optional[object]):
+        """Forget a probe that didn't finish (cancelled), so another request can probe."""
+        if probe is not None and probe is self._probe:
+            self._probe = None
+
+    def record_success(self, probe: Optional[object] = None):
+        if self._half_open:
+            if probe is None or probe is not self._probe:
+                return
+            self._probe = None
+            self._half_open = False
+            self._current_cooldown = self.cooldown
+        self.consecutive_failures = 0
+
+    def record_failure(self, now: float = None, probe: Optional[object] = None):
+        now = now if now is not None else time.monotonic()
+        if self._half_open:
+            if probe is None or probe is not self._probe:
+                # in flight when the breaker opened, or let through while every session is open
+                return
+            # the probe failed, back off harder
+            self._probe = None
+            self._current_cooldown = min(self.max_cooldown, self._current_cooldown * 2)
+        else:
+            self.consecutive_failures += 1
+            if self.consecutive_failures < self.failure_threshold:
+                return
+        self.open_until = now + self._current_cooldown
+        self.consecutive_failures = 0
+        self._half_open = True
+        self.trips += 1
+
+
+@dataclasses.dataclass
+class RetryPolicy:
+    """
+    How ApiTiktok retries a failing request.
+
+    Every attempt goes through ``run``'s callback again, so the request is
+    re-signed and may land on another session. Delays use full jitter so
+    concurrent retries don't hit TikTok in lockstep.
+
+    Example Usage:
+        .. code-block:: python
+
+            api = ApiTiktok(retry_policy=RetryPolicy(max_attempts=5, budget=20))
+    """
+
+    max_attempts: int = 3
+    """The maximum amount of attempts, the first one included."""
+    base_delay: float = 1.0
+    """The delay before the first retry, in seconds."""
+    max_delay: float = 30.0
+    """The longest delay between two attempts, in seconds."""
+    exponential: bool = True
+    """Double the delay after every attempt."""
+    jitter: bool = True
+    """Sleep a random time between 0 and the delay instead of the full delay."""
+    budget: Optional[float] = None
+    """The maximum time a call may spend, attempts and delays included, in seconds. Unbounded if None."""
+    retry_on: tuple = RETRYABLE_ERRORS
+    """The exceptions that trigger a retry, others are raised immediately."""
+
+    def delay(self, attempt: int) -> float:
+        """The time to wait after the given failed attempt (1-based), in seconds."""
+        delay = self.base_delay * (2 ** (attempt - 1) if self.exponential else 1)
+        delay = min(self.max_delay, delay)
+        return random.uniform(0, delay) if self.jitter else delay
+
+    async def run(self, attempt_fn: Callable[[int], Awaitable[Any]], on_retry: Callable = None) -> Any:
+        """
+        Call ``attempt_fn(attempt)`` until it succeeds or the policy gives up.
+
+        Args:
+            attempt_fn (Callable): Makes one attempt, receives the 1-based attempt number.
+            on_retry (Callable): Called with the attempt number, the error and the delay before each retry.
+
+        Returns:
+            Any: What the successful attempt returned.
+
+        Raises:
+            Exception: The error of the last attempt once retries or the budget are exhausted.
+        """
+        deadline = time.monotonic() + self.budget if self.budget is not None else None
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return await attempt_fn(attempt)
+            except self.retry_on as e:
+                if attempt >= self.max_attempts:
+                    raise
+                delay = self.delay(attempt)
+                if deadline is not None and time.monotonic() + delay >= deadline:
+                    raise
+                if on_retry is not None:
+                    on_retry(attempt, e, delay)
+                await asyncio.sleep(delay)
@@ -0,0 +1,239 @@
+import asyncio
+import dataclasses
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import Collection, Optional
+
+from .exceptions import CaptchaException, EmptyResponseException, InvalidJSONException
+from .retry import CircuitBreaker
+
+
+@dataclasses.dataclass
+class SessionStats:
+    """Load and health counters of one session, as seen by a SessionScheduler"""
+
+    in_flight: int = 0
+    requests: int = 0
+    errors: int = 0
+    error_rate: float = 0.0
+    latency: Optional[float] = None
+    breaker: CircuitBreaker = dataclasses.field(default_factory=CircuitBreaker)
+
+    def cooling_down(self, now: float = None) -> bool:
+        return self.breaker.is_open(now)
+
+    def probing(self, now: float = None) -> bool:
+        """Whether the breaker is half-open and its single probe request is already in flight."""
+        return self.breaker.state(now) == CircuitBreaker.HALF_OPEN and self.breaker.probing
+
+    def as_dict(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "errors": self.errors,
+            "consecutive_errors": self.breaker.consecutive_failures,
+            "error_rate": self.error_rate,
+            "latency": self.latency,
+            "circuit": self.breaker.state(),
+            "cooling_down": self.cooling_down(),
+            "ejections": self.breaker.trips,
+        }
+
+
+class SessionScheduler:
+    """
+    Decides which session serves the next request.
+
+    Subclasses only implement ``choose``. The base class keeps per-session
+    stats, enforces the per-session concurrency cap (callers wait in a queue
+    until a slot frees up) and keeps a circuit breaker per session, so
+    sessions that keep returning empty or invalid responses get no traffic
+    until a probe request succeeds again.
+    """
+
+    EJECTING_ERRORS = (EmptyResponseException, InvalidJSONException, CaptchaException)
+
+    def __init__(self, max_in_flight: Optional[int] = None, eject_after: int = 3,
+                 cooldown: float = 60.0, smoothing: float = 0.2):
+        """
+        Args:
+            max_in_flight (int): The maximum amount of concurrent requests per session, unbounded if None.
+            eject_after (int): Consecutive empty/invalid responses before the breaker of a session opens.
+            cooldown (float): How long an ejected session is skipped, in seconds. Doubles after every
+                failed probe, up to ten times this value.
+            smoothing (float): Weight of the newest sample in the latency and error rate moving averages.
+        """
+        self.max_in_flight = max_in_flight
+        self.eject_after = eject_after
+        self.cooldown = cooldown
+        self.smoothing = smoothing
+        self.sessions: dict[int, SessionStats] = {}
+        self._slot_freed = asyncio.Condition()
+
+    def choose(self, candidates: list[int]) -> int:
+        """Pick one session index out of the available candidates."""
+        raise NotImplementedError
+
+    def stats_for(self, session_index: int) -> SessionStats:
+        if session_index not in self.sessions:
+            self.sessions[session_index] = SessionStats(
+                breaker=CircuitBreaker(self.eject_after, self.cooldown, self.cooldown * 10)
+            )
+        return self.sessions[session_index]
+
+    async def reset(self, session_index: int):
+        """
+        Forget the stats and close the breaker of a session, e.g. after it was recreated.
+
+        Requests still in flight on the old session stay counted, so the concurrency cap holds
+        until they release.
+        """
+        in_flight = self.stats_for(session_index).in_flight
+        del self.sessions[session_index]
+        self.stats_for(session_index).in_flight = in_flight
+        async with self._slot_freed:
+            # the session may have been skipped while its breaker was open
+            self._slot_freed.notify_all()
+
+    def __candidates(self, num_sessions: int, respect_cap: bool, exclude: Collection[int] = ()) -> list[int]:
+        now = time.monotonic()
+        everyone = list(range(num_sessions))
+        healthy = [
+            i for i in everyone
+            if not self.stats_for(i).cooling_down(now) and not self.stats_for(i).probing(now)
+        ]
+        if not healthy:
+            # every session is ejected, serving slowly beats not serving at all
+            healthy = everyone
+        healthy = [i for i in healthy if i not in exclude] or healthy
+        if respect_cap and self.max_in_flight is not None:
+            return [i for i in healthy if self.stats_for(i).in_flight < self.max_in_flight]
+        return healthy
+
+    def pick(self, num_sessions: int, exclude: Collection[int] = ()) -> int:
+        """Pick a session without waiting and without reserving a slot on it."""
+        return self.choose(self.__candidates(num_sessions, respect_cap=False, exclude=exclude))
+
+    async def acquire(self, num_sessions: int, session_index: Optional[int] = None,
+                      exclude: Collection[int] = ()) -> int:
+        """
+        Reserve a slot on a session, waiting while every candidate is at its concurrency cap.
+
+        Args:
+            num_sessions (int): The amount of sessions to choose from.
+            session_index (int): Pin the request to this session instead of choosing one.
+            exclude (Collection[int]): Sessions to avoid when others are available, e.g. the ones
+                that already failed this request.
+
+        Returns:
+            int: The index of the reserved session.
+        """
+        async with self._slot_freed:
+            while True:
+                if session_index is not None:
+                    stats = self.stats_for(session_index)
+                    if self.max_in_flight is None or stats.in_flight < self.max_in_flight:
+                        chosen = session_index
+                        break
+                else:
+                    candidates = self.__candidates(num_sessions, respect_cap=True, exclude=exclude)
+                    if candidates:
+                        chosen = self.choose(candidates)
+                        break
+                await self._slot_freed.wait()
+
+        self.stats_for(chosen).in_flight += 1
+        return chosen
+
+    async def release(self, session_index: int, latency: float, error: BaseException = None,
+                      probe: Optional[object] = None):
+        """
+        Free the slot taken by acquire() and record the outcome of the request.
+
+        Args:
+            session_index (int): The session acquire() returned.
+            latency (float): How long the request took, in seconds.
+            error (BaseException): What the request raised, None if it succeeded. A cancelled
+                request is not recorded.
+            probe (object): The token CircuitBreaker.admit returned if the request was the probe.
+        """
+        stats = self.stats_for(session_index)
+        stats.in_flight = max(0, stats.in_flight - 1)
+        alpha = self.smoothing
+
+        if isinstance(error, asyncio.CancelledError):
+            # an unfinished request says nothing about the session
+            stats.breaker.abandon(probe)
+        elif error is None:
+            stats.requests += 1
+            stats.breaker.record_success(probe)
+            stats.error_rate = (1 - alpha) * stats.error_rate
+            stats.latency = latency if stats.latency is None else (1 - alpha) * stats.latency + alpha * latency
+        else:
+            stats.requests += 1
+            stats.errors += 1
+            stats.error_rate = (1 - alpha) * stats.error_rate + alpha
+            if isinstance(error, self.EJECTING_ERRORS):
+                stats.breaker.record_failure(probe=probe)
+            else:
+                stats.breaker.abandon(probe)
+
+        async with self._slot_freed:
+            self._slot_freed.notify_all()
+
+    @asynccontextmanager
+    async def lease(self, num_sessions: int, session_index: Optional[int] = None, exclude: Collection[int] = ()):
+        """
+        Reserve a session for one request, timing it and recording whether it failed.
+
+        If the breaker of the session is half-open the request is its probe.
+        """
+        chosen = await self.acquire(num_sessions, session_index, exclude)
+        probe = self.stats_for(chosen).breaker.admit()
+        start = time.monotonic()
+        error = None
+        try:
+            yield chosen
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            await self.release(chosen, time.monotonic() - start, error, probe)
+
+    def stats(self) -> dict[int, dict]:
+        """Returns the stats of every session that has been scheduled so far, by session index."""
+        return {i: stats.as_dict() for i, stats in sorted(self.sessions.items())}
+
+
+class RandomScheduler(SessionScheduler):
+    """Picks a random session, the historical behaviour of ApiTiktok."""
+
+    def choose(self, candidates: list[int]) -> int:
+        return random.choice(candidates)
+
+
+class LeastInFlightScheduler(SessionScheduler):
+    """Picks the session with the fewest requests in flight, ties broken at random."""
+
+    def choose(self, candidates: list[int]) -> int:
+        least = min(self.stats_for(i).in_flight for i in candidates)
+        return random.choice([i for i in candidates if self.stats_for(i).in_flight == least])
+
+
+class LatencyWeightedScheduler(SessionScheduler):
+    """
+    Picks sessions at random, weighted towards low latency and few requests in flight.
+
+    Sessions without a latency sample yet are weighted as the average session,
+    so new sessions get traffic.
+    """
+
+    def choose(self, candidates: list[int]) -> int:
+        samples = [self.stats_for(i).latency for i in candidates if self.stats_for(i).latency]
+        default = sum(samples) / len(samples) if samples else 1.0
+        weights = [
+            1.0 / ((self.stats_for(i).latency or default) * (1 + self.stats_for(i).in_flight))
+            for i in candidates
+        ]
+        return random.choices(candidates, weights=weights)[0]
@@ -0,0 +1,89 @@
+from __future__ import annotations
+import random
+from typing import TYPE_CHECKING, Optional
+from playwright.async_api import TimeoutError
+
+if TYPE_CHECKING:
+    from .tiktok import ApiTiktok, TikTokPlaywrightSession
+
+
+class XBogusSigner:
+    """
+    Signs TikTok API urls with X-Bogus inside a session page.
+
+    A whole batch of urls is signed in a single ``page.evaluate``. The script
+    checks by itself that ``window.byted_acrawler`` is loaded, so the page is
+    only polled with ``wait_for_function`` when the signer is actually missing
+    (first use, or after the page navigated away).
+    """
+
+    SIGN_SCRIPT = """
+        (urls) => {
+            const signer = window.byted_acrawler;
+            if (signer === undefined || typeof signer.frontierSign !== 'function') {
+                return null;
+            }
+            return urls.map((url) => {
+                try {
+                    return signer.frontierSign(url)['X-Bogus'] || null;
+                } catch (e) {
+                    return null;
+                }
+            });
+        }
+    """
+
+    RECOVERY_URLS = [
+        "https://www.tiktok.com/foryou", "https://www.tiktok.com",
+        "https://www.tiktok.com/@tiktok", "https://www.tiktok.com/foryou"
+    ]
+
+    def __init__(self, parent: ApiTiktok, ready_attempts: int = 5):
+        """
+        Args:
+            parent (ApiTiktok): The ApiTiktok instance owning the sessions.
+            ready_attempts (int): How many times to wait for the signer before giving up.
+        """
+        self.parent = parent
+        self.ready_attempts = ready_attempts
+
+    async def wait_until_ready(self, session: TikTokPlaywrightSession):
+        """Wait for ``window.byted_acrawler``, reloading a TikTok page between attempts."""
+        with self.parent.metrics.span("wait_for_signer"):
+            for _ in range(self.ready_attempts):
+                try:
+                    await session.page.wait_for_function(
+                        "window.byted_acrawler !== undefined", timeout=random.randint(5000, 20000)
+                    )
+                    return
+                except TimeoutError:
+                    await session.page.goto(random.choice(self.RECOVERY_URLS))
+
+    async def x_bogus(self, urls: list[str], session: TikTokPlaywrightSession) -> list[Optional[str]]:
+        """
+        Returns the X-Bogus value of every url, None where signing failed.
+        """
+        if not urls:
+            return []
+        tokens = await session.page.evaluate(self.SIGN_SCRIPT, urls)
+        if tokens is None:
+            await self.wait_until_ready(session)
+            tokens = await session.page.evaluate(self.SIGN_SCRIPT, urls)
+        if tokens is None:
+            return [None] * len(urls)
+        return tokens
+
+    async def sign_urls(self, urls: list[str], session: TikTokPlaywrightSession) -> list[str]:
+        """
+        Returns every url with its X-Bogus query parameter appended.
+
+        Raises:
+            Exception: If any of the urls could not be signed.
+        """
+        tokens = await self.x_bogus(urls, session)
+        signed = []
+        for url, x in zip(urls, tokens):
+            if not x:
+                raise Exception("Failed to generate X-Bogus")
+            signed.append(f"{url}{'&' if '?' in url else '?'}X-Bogus={x}")
+        return signed
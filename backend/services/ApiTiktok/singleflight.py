@@ -0,0 +1,84 @@
+import asyncio
+import dataclasses
+from typing import Any, Awaitable, Callable
+
+
+@dataclasses.dataclass
+class _Flight:
+    task: asyncio.Task
+    waiters: int = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into one in-flight call.
+
+    The first caller starts the work, callers arriving while it runs await the
+    same task and get the same result (or exception). The work runs as its own
+    task, so a caller being cancelled doesn't cancel it for the others; it is
+    cancelled once every caller waiting for it went away.
+
+    Note that coalesced callers receive the same object, don't mutate it.
+    """
+
+    def __init__(self):
+        self._in_flight: dict[str, _Flight] = {}
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+        self.abandoned = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run ``fn()`` unless a call with the same key is already in flight, in which case wait for that one.
+
+        Args:
+            key (str): The normalized key of the call.
+            fn (Callable): A function returning the awaitable doing the work.
+
+        Returns:
+            Any: The result of the shared call.
+        """
+        self.calls += 1
+        flight = self._in_flight.get(key)
+        if flight is not None:
+            self.coalesced += 1
+        else:
+            self.executions += 1
+            flight = _Flight(asyncio.ensure_future(fn()))
+            self._in_flight[key] = flight
+            flight.task.add_done_callback(lambda t: self.__forget(key, t))
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # every caller was cancelled, nobody wants the result anymore
+                self.abandoned += 1
+                flight.task.cancel()
+
+    def __forget(self, key: str, task: asyncio.Task):
+        flight = self._in_flight.get(key)
+        if flight is not None and flight.task is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            # mark the exception as retrieved when every caller went away
+            task.exception()
+
+    def stats(self) -> dict:
+        """
+        Returns the coalescing counters.
+
+        Returns:
+            dict: calls, executions, coalesced (duplicate calls absorbed), abandoned (cancelled
+            once every caller left) and in_flight.
+        """
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "abandoned": self.abandoned,
+            "in_flight": len(self._in_flight),
+        }
@@ -1,14 +1,27 @@
 import asyncio
 import logging
 import dataclasses
-from typing import Any
+from contextlib import aclosing, asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Iterable, Optional
 import random
 import time
 import json
 from playwright.async_api import async_playwright, TimeoutError
 from urllib.parse import urlencode, quote, urlparse
 from .stealth import stealth_async
-from .helpers import random_choice
+from .helpers import random_choice, request_cache_key
+from .signer import XBogusSigner
+from .scheduler import SessionScheduler, LeastInFlightScheduler
+from .cache import ResponseCache
+from .singleflight import SingleFlight
+from .media_store import MediaStore
+from .blocking import ResourceBlocker
+from .metrics import Metrics, Span
+from .replay import REPLAY_USER_AGENT, Cassette, ReplayContext, ReplayPage, ReplayTransport
+from .http_client import HttpClientPool
+from .bulk import BulkResult, fan_out
+from .retry import RetryPolicy
+from .projection import PROJECT_FUNCTION, PROJECTED_FETCH_SCRIPT, build_projection, project, projection_key
 
 from .api.user import User
 from .api.video import Video
@@ -22,9 +35,35 @@ from .api.playlist import Playlist
 from .exceptions import (
     InvalidJSONException,
     EmptyResponseException,
+    InvalidResponseException,
 )
 
 
+BATCH_FETCH_SCRIPT = """
+    async ({ requests, concurrency, projection }) => {
+        %s
+        const results = new Array(requests.length);
+        let next = 0;
+        const worker = async () => {
+            while (next < requests.length) {
+                const index = next++;
+                const { url, headers } = requests[index];
+                try {
+                    const response = await fetch(url, { method: 'GET', headers });
+                    const text = projectText(await response.text(), projection);
+                    results[index] = { status: response.status, text, error: null };
+                } catch (error) {
+                    results[index] = { status: 0, text: null, error: String((error && error.message) || error) };
+                }
+            }
+        };
+        const workers = Array.from({ length: Math.min(concurrency, requests.length) }, worker);
+        await Promise.all(workers);
+        return results;
+    }
+""" % PROJECT_FUNCTION
+
+
 @dataclasses.dataclass
 class TikTokPlaywrightSession:
     """A TikTok session using Playwright"""
@@ -36,6 +75,7 @@ class TikTokPlaywrightSession:
     headers: dict = None
     ms_token: str = None
     base_url: str = "https://www.tiktok.com"
+    resource_blocker: ResourceBlocker = None
 
 
 class ApiTiktok:
@@ -57,28 +97,48 @@ class ApiTiktok:
     search = Search
     playlist = Playlist
 
-    def __init__(self, logging_level: int = logging.WARN, logger_name: str = None):
+    BULK_CONCURRENCY_PER_SESSION = 4
+    """Default amount of concurrent lookups per session of videos_info and users_info."""
+
+    def __init__(self, logging_level: int = logging.WARN, logger_name: str = None,
+                 scheduler: SessionScheduler = None, cache: ResponseCache = None,
+                 coalesce_requests: bool = True, retry_policy: RetryPolicy = None,
+                 media_store: MediaStore = None):
         """
         Create a ApiTiktok object.
 
         Args:
             logging_level (int): The logging level you want to use.
             logger_name (str): The name of the logger you want to use.
+            scheduler (SessionScheduler): How requests are spread over sessions, defaults to LeastInFlightScheduler.
+            cache (ResponseCache): Cache make_request responses, disabled if None.
+            coalesce_requests (bool): Share one in-flight request between concurrent identical make_request calls.
+            retry_policy (RetryPolicy): How failed requests are retried, defaults to RetryPolicy().
+            media_store (MediaStore): Where Video.fetch keeps downloaded videos and covers.
         """
         self.sessions = []
+        self.signer = XBogusSigner(self)
+        self.scheduler = scheduler if scheduler is not None else LeastInFlightScheduler()
+        self.cache = cache
+        self.singleflight = SingleFlight() if coalesce_requests else None
+        self.http = HttpClientPool()
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.media_store = media_store
+        self.metrics = Metrics()
+        self.cassette: Cassette = None
+        self.replaying = False
 
         if logger_name is None:
             logger_name = __name__
         self.__create_logger(logger_name, logging_level)
 
-        User.parent = self
-        Video.parent = self
-        Sound.parent = self
-        Hashtag.parent = self
-        Comment.parent = self
-        Trending.parent = self
-        Search.parent = self
-        Playlist.parent = self
+        # subclasses bound to this instance: several ApiTiktok can live in one process
+        # (the shared SessionPool and short-lived sign in flows) without re-pointing each other
+        for name, endpoint in (
+            ("user", User), ("video", Video), ("sound", Sound), ("hashtag", Hashtag),
+            ("comment", Comment), ("trending", Trending), ("search", Search), ("playlist", Playlist),
+        ):
+            setattr(self, name, type(endpoint.__name__, (endpoint,), {"parent": self, "__slots__": ()}))
 
     def __create_logger(self, name: str, level: int = logging.DEBUG):
         """Create a logger for the class."""
@@ -128,76 +188,143 @@ class ApiTiktok:
         context_options: dict = {}, sleep_after: int = 1, cookies: dict = None,
         suppress_resource_load_types: list[str] = None, timeout: int = 30000,
     ):
-        if ms_token is not None:
-            if cookies is None:
-                cookies = {}
-            cookies["msToken"] = ms_token
-
-        context = await self.browser.new_context(proxy=proxy, ignore_https_errors=True, **context_options)
-        if cookies:
-            formatted = [{"name": k, "value": v, "domain": urlparse(url).netloc, "path": "/"} for k, v in cookies.items() if v]
-            await context.add_cookies(formatted)
-
-        page = await context.new_page()
-        await stealth_async(page)
-
-        request_headers = None
-        def handle_request(req):
-            nonlocal request_headers
-            request_headers = req.headers
-        page.once("request", handle_request)
-
-        if suppress_resource_load_types:
-            await page.route("**/*", lambda route, req: route.abort()
-                             if req.resource_type in suppress_resource_load_types else route.continue_())
-
-        page.set_default_navigation_timeout(timeout)
-        await page.goto(url)
-        await page.goto(url)  # warm-up
-
-        await page.mouse.move(20, 20)
-        await page.wait_for_load_state("networkidle")
-
-        session = TikTokPlaywrightSession(context, page, ms_token=ms_token, proxy=proxy, headers=request_headers, base_url=url)
-        if ms_token is None:
-            await asyncio.sleep(sleep_after)
-            jar = await self.get_session_cookies(session)
-            session.ms_token = jar.get("msToken")
-        self.sessions.append(session)
-        await self.__set_session_params(session)
-
-    async def create_sessions(self, num_sessions=1, headless=True, ms_tokens: list[str] = None,
-                              proxies: list = None, sleep_after=1, starting_url="https://www.tiktok.com",
-                              context_options: dict = {}, override_browser_args: list[dict] = None,
-                              cookies: list[dict] = None, suppress_resource_load_types: list[str] = None,
-                              browser: str = "chromium", executable_path: str = None, timeout: int = 30000):
-        self.playwright = await async_playwright().start()
+        with self.metrics.span("create_session", endpoint="create_sessions"):
+            if ms_token is not None:
+                if cookies is None:
+                    cookies = {}
+                cookies["msToken"] = ms_token
+
+            with self.metrics.span("new_context"):
+                context = await self.browser.new_context(proxy=proxy, ignore_https_errors=True, **context_options)
+                if cookies:
+                    formatted = [{"name": k, "value": v, "domain": urlparse(url).netloc, "path": "/"} for k, v in cookies.items() if v]
+                    await context.add_cookies(formatted)
+
+                page = await context.new_page()
+                await stealth_async(page)
+
+            request_headers = None
+            def handle_request(req):
+                nonlocal request_headers
+                request_headers = req.headers
+            page.once("request", handle_request)
+
+            resource_blocker = None
+            if suppress_resource_load_types:
+                resource_blocker = ResourceBlocker(suppress_resource_load_types)
+                await resource_blocker.install(context, page, self.browser.browser_type.name)
+
+            page.set_default_navigation_timeout(timeout)
+            with self.metrics.span("navigate"):
+                await page.goto(url)
+                await page.goto(url)  # warm-up
+
+            with self.metrics.span("network_idle"):
+                await page.mouse.move(20, 20)
+                await page.wait_for_load_state("networkidle")
+
+            session = TikTokPlaywrightSession(
+                context, page, ms_token=ms_token, proxy=proxy, headers=request_headers, base_url=url,
+                resource_blocker=resource_blocker,
+            )
+            if ms_token is None:
+                await asyncio.sleep(sleep_after)
+                jar = await self.get_session_cookies(session)
+                session.ms_token = jar.get("msToken")
+            with self.metrics.span("session_params"):
+                await self.__set_session_params(session)
+            return session
+
+    async def __launch_browser(self, browser: str = "chromium", headless: bool = True,
+                               override_browser_args: list[dict] = None, proxies: list = None,
+                               executable_path: str = None):
         if browser == "chromium":
             if headless and override_browser_args is None:
                 override_browser_args = ["--headless=new"]
                 headless = False
-            self.browser = await self.playwright.chromium.launch(
+            return await self.playwright.chromium.launch(
                 headless=headless, args=override_browser_args, proxy=random_choice(proxies), executable_path=executable_path
             )
         elif browser == "firefox":
-            self.browser = await self.playwright.firefox.launch(
+            return await self.playwright.firefox.launch(
                 headless=headless, args=override_browser_args, proxy=random_choice(proxies), executable_path=executable_path
             )
         elif browser == "webkit":
-            self.browser = await self.playwright.webkit.launch(
+            return await self.playwright.webkit.launch(
                 headless=headless, args=override_browser_args, proxy=random_choice(proxies), executable_path=executable_path
             )
         else:
             raise ValueError("Invalid browser")
 
-        await asyncio.gather(*(
-            self.__create_session(
-                proxy=random_choice(proxies), ms_token=random_choice(ms_tokens),
-                url=starting_url, context_options=context_options,
-                sleep_after=sleep_after, cookies=random_choice(cookies),
-                suppress_resource_load_types=suppress_resource_load_types, timeout=timeout
-            ) for _ in range(num_sessions)
+    def __new_session_kwargs(self) -> dict:
+        """Pick per-session options the same way create_sessions does."""
+        options = self._session_options
+        return dict(
+            proxy=random_choice(options["proxies"]), ms_token=random_choice(options["ms_tokens"]),
+            url=options["starting_url"], context_options=options["context_options"],
+            sleep_after=options["sleep_after"], cookies=random_choice(options["cookies"]),
+            suppress_resource_load_types=options["suppress_resource_load_types"], timeout=options["timeout"],
+        )
+
+    async def create_sessions(self, num_sessions=1, headless=True, ms_tokens: list[str] = None,
+                              proxies: list = None, sleep_after=1, starting_url="https://www.tiktok.com",
+                              context_options: dict = {}, override_browser_args: list[dict] = None,
+                              cookies: list[dict] = None, suppress_resource_load_types: list[str] = None,
+                              browser: str = "chromium", executable_path: str = None, timeout: int = 30000):
+        self._launch_options = dict(
+            browser=browser, headless=headless, override_browser_args=override_browser_args,
+            proxies=proxies, executable_path=executable_path,
+        )
+        self._session_options = dict(
+            ms_tokens=ms_tokens, proxies=proxies, cookies=cookies, starting_url=starting_url,
+            context_options=context_options, sleep_after=sleep_after,
+            suppress_resource_load_types=suppress_resource_load_types, timeout=timeout,
+        )
+
+        with self.metrics.span("total", endpoint="create_sessions"):
+            with self.metrics.span("launch_browser"):
+                self.playwright = await async_playwright().start()
+                self.browser = await self.__launch_browser(**self._launch_options)
+
+            self.sessions.extend(await asyncio.gather(*(
+                self.__create_session(**self.__new_session_kwargs()) for _ in range(num_sessions)
+            )))
+
+    async def recreate_session(self, session_index: int) -> TikTokPlaywrightSession:
+        """
+        Replace a broken session with a fresh one created with the options given to create_sessions.
+
+        Args:
+            session_index (int): The index of the session to replace.
+
+        Returns:
+            TikTokPlaywrightSession: The new session, stored at the same index.
+        """
+        old = self.sessions[session_index]
+        try:
+            await old.context.close()
+        except Exception:
+            pass
+        session = await self.__create_session(**self.__new_session_kwargs())
+        self.sessions[session_index] = session
+        # the health of the old session says nothing about the new one
+        await self.scheduler.reset(session_index)
+        return session
+
+    async def restart_browser(self):
+        """
+        Relaunch the browser (e.g. after it crashed) and recreate every session in place.
+        """
+        try:
+            await self.browser.close()
+        except Exception:
+            pass
+        self.browser = await self.__launch_browser(**self._launch_options)
+        self.sessions[:] = await asyncio.gather(*(
+            self.__create_session(**self.__new_session_kwargs()) for _ in range(len(self.sessions))
         ))
+        for i in range(len(self.sessions)):
+            await self.scheduler.reset(i)
 
     def generate_js_fetch(self, method: str, url: str, headers: dict) -> str:
         """Generate a javascript fetch function for use in playwright"""
@@ -218,9 +345,63 @@ class ApiTiktok:
             raise Exception("No sessions created")
         idx = kwargs.get("session_index")
         if idx is None:
-            idx = random.randint(0, len(self.sessions) - 1)
+            idx = self.scheduler.pick(len(self.sessions))
         return idx, self.sessions[idx]
 
+    @asynccontextmanager
+    async def _lease_session(self, **kwargs):
+        """Reserve a session through the scheduler for the duration of one request."""
+        if not self.sessions:
+            raise Exception("No sessions created")
+        async with self.scheduler.lease(
+            len(self.sessions), kwargs.get("session_index"), kwargs.get("exclude", ())
+        ) as idx:
+            yield idx, self.sessions[idx]
+
+    def session_stats(self) -> dict[int, dict]:
+        """
+        Returns the load and health stats of every session, by session index.
+
+        Returns:
+            dict[int, dict]: in_flight, requests, errors, error_rate, latency, cooldown and ejection counters,
+            plus the resource blocking counters under "blocking" for sessions that block resources.
+        """
+        stats = self.scheduler.stats()
+        for i, session in enumerate(self.sessions):
+            if session.resource_blocker is not None:
+                stats.setdefault(i, {})["blocking"] = session.resource_blocker.stats()
+        return stats
+
+    def stats(self) -> dict:
+        """
+        Returns the timing histograms of every phase of make_request, make_request_post,
+        create_sessions and Video.info, by endpoint and by session.
+
+        Returns:
+            dict: ``{"endpoints": {endpoint: {phase: histogram}}, "sessions": {index: {phase: histogram}},
+            "singleflight": counters}``, each histogram having count, errors, mean, p50, p95, p99 and max,
+            in seconds. The counters are SingleFlight.stats(), None if requests aren't coalesced.
+
+        Example Usage:
+            .. code-block:: python
+
+                fetch = api.stats()["endpoints"]["/api/post/item_list/"]["fetch"]
+                print(fetch["p50"], fetch["p99"])
+        """
+        return {
+            **self.metrics.snapshot(),
+            "singleflight": self.singleflight.stats() if self.singleflight is not None else None,
+        }
+
+    def on_span(self, hook: Callable[[Span], None]) -> Callable[[Span], None]:
+        """
+        Register a function called with every finished timing span, e.g. to forward them to a collector.
+
+        Args:
+            hook (Callable): Receives the Span, must not block, exceptions are logged and ignored.
+        """
+        return self.metrics.on_span(hook)
+
     async def set_session_cookies(self, session, cookies):
         await session.context.add_cookies(cookies)
 
@@ -228,32 +409,64 @@ class ApiTiktok:
         cookies = await session.context.cookies()
         return {c["name"]: c["value"] for c in cookies}
 
-    async def run_fetch_script(self, url: str, headers: dict, **kwargs):
-        js_script = self.generate_js_fetch("GET", url, headers)
+    async def run_fetch_script(self, url: str, headers: dict, projection: dict = None, **kwargs):
+        """
+        Fetch an url inside the page and return the response text.
+
+        Args:
+            projection (dict): ``{"key", "spec"}``, trims ``response[key]`` to the spec inside the page
+                so only the selected fields are sent back to Python.
+        """
         _, session = self._get_session(**kwargs)
+        if projection is not None:
+            return await session.page.evaluate(PROJECTED_FETCH_SCRIPT, {
+                "url": url, "headers": headers or {}, "projection": projection,
+            })
+        js_script = self.generate_js_fetch("GET", url, headers)
         result = await session.page.evaluate(js_script)
         return result
+
+    async def run_fetch_batch_script(self, requests: list[dict], concurrency: int = 8,
+                                     projection: dict = None, **kwargs) -> list[dict]:
+        """
+        Runs many GET fetches inside the page in a single evaluate, at most ``concurrency`` at a time.
+
+        Args:
+            requests (list[dict]): Dicts with the ``url`` and ``headers`` of each fetch.
+            concurrency (int): The maximum amount of fetches in flight inside the page.
+            projection (dict): ``{"key", "spec"}`` applied to every response, see run_fetch_script.
+
+        Returns:
+            list[dict]: One ``{"status", "text", "error"}`` dict per request, in the same order.
+        """
+        _, session = self._get_session(**kwargs)
+        return await session.page.evaluate(BATCH_FETCH_SCRIPT, {
+            "requests": [{"url": r["url"], "headers": r.get("headers") or {}} for r in requests],
+            "concurrency": max(1, concurrency),
+            "projection": projection,
+        })
     
     async def generate_x_bogus(self, url: str, **kwargs):
         _, session = self._get_session(**kwargs)
-        for _ in range(5):
-            try:
-                await session.page.wait_for_function("window.byted_acrawler !== undefined", timeout=random.randint(5000, 20000))
-                break
-            except TimeoutError:
-                await session.page.goto(random.choice([
-                    "https://www.tiktok.com/foryou", "https://www.tiktok.com",
-                    "https://www.tiktok.com/@tiktok", "https://www.tiktok.com/foryou"
-                ]))
-        return await session.page.evaluate(
-            f'() => window.byted_acrawler.frontierSign("{url}")'
-        )
+        x = (await self.signer.x_bogus([url], session))[0]
+        return {"X-Bogus": x}
 
     async def sign_url(self, url: str, **kwargs):
-        x = (await self.generate_x_bogus(url, **kwargs)).get("X-Bogus")
-        if not x:
-            raise Exception("Failed to generate X-Bogus")
-        return f"{url}{'&' if '?' in url else '?'}X-Bogus={x}"
+        return (await self.sign_urls([url], **kwargs))[0]
+
+    async def sign_urls(self, urls: list[str], **kwargs) -> list[str]:
+        """
+        Signs many urls with X-Bogus in a single round trip to the session page.
+
+        Args:
+            urls (list[str]): The urls to sign, with their query string already encoded.
+            session_index (int): The index of the session to sign with, if not provided a random session will be used.
+
+        Returns:
+            list[str]: The signed urls, in the same order.
+        """
+        _, session = self._get_session(**kwargs)
+        return await self.signer.sign_urls(urls, session)
 
     async def is_logged_in(self, **kwargs) -> bool:
         _, session = self._get_session(**kwargs)
@@ -272,25 +485,100 @@ class ApiTiktok:
                 return
         raise Exception("Login timeout")
 
+    async def __prepare_request(self, session: TikTokPlaywrightSession, url: str, headers: dict = None, params: dict = None):
+        """Merge the session params/headers and msToken into a request, returns the encoded url and headers."""
+        params = dict(params or {})
+        if session.params is not None:
+            params = {**session.params, **params}
+
+        if headers is not None:
+            headers = {**session.headers, **headers}
+        else:
+            headers = session.headers
+
+        # get msToken
+        if params.get("msToken") is None:
+            # try to get msToken from session
+            if session.ms_token is not None:
+                params["msToken"] = session.ms_token
+            else:
+                # we'll try to read it from cookies
+                cookies = await self.get_session_cookies(session)
+                ms_token = cookies.get("msToken")
+                if ms_token is None:
+                    self.logger.warn(
+                        "Failed to get msToken from cookies, trying to make the request anyway (probably will fail)"
+                    )
+                params["msToken"] = ms_token
+
+        return f"{url}?{urlencode(params, safe='=', quote_via=quote)}", headers
+
+    async def presign_requests(self, requests: list[dict], **kwargs) -> list[dict]:
+        """
+        Builds and signs many requests at once, so that signing costs one round trip for the whole batch.
+
+        Args:
+            requests (list[dict]): Dicts with the ``url``, ``params`` and optional ``headers`` of each request.
+            session_index (int): The index of the session to sign with, if not provided a random session will be used.
+
+        Returns:
+            list[dict]: The requests with ``signed_url``, ``headers`` and ``session_index`` filled in,
+            ready to be sent with ``make_request(**request)``.
+
+        Example Usage:
+            .. code-block:: python
+
+                reqs = await api.presign_requests([
+                    {"url": "https://www.tiktok.com/api/user/detail/", "params": {"uniqueId": name}}
+                    for name in usernames
+                ])
+                for req in reqs:
+                    data = await api.make_request(**req)
+        """
+        i, session = self._get_session(**kwargs)
+        prepared = [
+            await self.__prepare_request(session, r["url"], r.get("headers"), r.get("params"))
+            for r in requests
+        ]
+        if self.replaying:
+            # replayed requests are matched without their signature, there is no page to sign in
+            signed = [encoded for encoded, _ in prepared]
+        else:
+            signed = await self.signer.sign_urls([encoded for encoded, _ in prepared], session)
+        return [
+            {**r, "headers": headers, "signed_url": signed_url, "session_index": i}
+            for r, (_, headers), signed_url in zip(requests, prepared, signed)
+        ]
+
     async def make_request(
         self,
         url: str,
         headers: dict = None,
         params: dict = None,
-        retries: int = 3,
-        exponential_backoff: bool = True,
+        retries: int = None,
+        exponential_backoff: bool = None,
+        signed_url: str = None,
         **kwargs,
     ):
         """
         Makes a request to TikTok through a session.
 
+        Failed attempts are retried following the retry policy of the api. Every
+        retry is signed again and, unless session_index is given, goes to another
+        healthy session than the ones that already failed.
+
         Args:
             url (str): The url to make the request to.
             headers (dict): The headers to use for the request.
             params (dict): The params to use for the request.
-            retries (int): The amount of times to retry the request if it fails.
-            exponential_backoff (bool): Whether or not to use exponential backoff when retrying the request.
-            session_index (int): The index of the session you want to use, if not provided a random session will be used.
+            retries (int): The maximum amount of attempts, overrides the retry policy.
+            exponential_backoff (bool): Whether or not to use exponential backoff when retrying, overrides the retry policy.
+            signed_url (str): An url already signed by presign_requests, skips building and signing the url of the first attempt.
+            session_index (int): The index of the session you want to use, if not provided the scheduler picks one.
+            use_cache (bool): Whether to read and store the response in the cache, if the api has one.
+            fields (list[str]): Dotted paths to keep in ``response[items_key]``, the rest is dropped inside
+                the page before the response is sent to Python. Everything is kept if None.
+            items_key (str): The key of the response the fields are relative to, e.g. ``itemList``.
 
         Returns:
             dict: The json response from TikTok.
@@ -298,39 +586,96 @@ class ApiTiktok:
         Raises:
             Exception: If the request fails.
         """
-        i, session = self._get_session(**kwargs)
-        if session.params is not None:
-            params = {**session.params, **params}
+        with self.metrics.span("total", endpoint=urlparse(url).path):
+            projection, key_params = self.__projection(params, kwargs.pop("fields", None), kwargs.pop("items_key", None))
 
-        if headers is not None:
-            headers = {**session.headers, **headers}
-        else:
-            headers = session.headers
+            use_cache = kwargs.pop("use_cache", True) and self.cache is not None
+            if use_cache:
+                with self.metrics.span("cache"):
+                    cached = await self.cache.get(url, key_params)
+                if cached is not None:
+                    return cached
 
-        # get msToken
-        if params.get("msToken") is None:
-            # try to get msToken from session
-            if session.ms_token is not None:
-                params["msToken"] = session.ms_token
-            else:
-                # we'll try to read it from cookies
-                cookies = await self.get_session_cookies(session)
-                ms_token = cookies.get("msToken")
-                if ms_token is None:
-                    self.logger.warn(
-                        "Failed to get msToken from cookies, trying to make the request anyway (probably will fail)"
-                    )
-                params["msToken"] = ms_token
+            policy = self.__retry_policy(retries, exponential_backoff)
 
-        encoded_params = f"{url}?{urlencode(params, safe='=', quote_via=quote)}"
-        signed_url = await self.sign_url(encoded_params, session_index=i)
+            async def fetch():
+                if self.replaying:
+                    data = await self.__replay_request("GET", url, params, policy, projection, key_params, **kwargs)
+                else:
+                    data = await self.__make_request(url, headers, params, policy, signed_url, projection, **kwargs)
+                if self.cassette is not None:
+                    self.cassette.record("GET", url, key_params, json.dumps(data, ensure_ascii=False))
+                if use_cache:
+                    await self.cache.set(url, key_params, data)
+                return data
 
-        retry_count = 0
-        while retry_count < retries:
-            retry_count += 1
-            result = await self.run_fetch_script(
-                signed_url, headers=headers, session_index=i
-            )
+            if self.singleflight is None:
+                return await fetch()
+            flight_key = self.__flight_key(url, key_params, headers, signed_url, kwargs.get("session_index"))
+            return await self.singleflight.do(flight_key, fetch)
+
+    @staticmethod
+    def __flight_key(url: str, key_params: dict, headers: dict, signed_url: str, session_index: int) -> str:
+        """Requests only share a flight if they would be sent the same way, not just have the same params."""
+        sent_as = json.dumps([headers, signed_url, session_index], sort_keys=True, default=str)
+        return f"{request_cache_key(url, key_params)}:{sent_as}"
+
+    @staticmethod
+    def __projection(params: dict, fields, items_key: str) -> tuple[Optional[dict], dict]:
+        """The in-page projection of ``fields`` and the params keying its response in caches and cassettes."""
+        if fields is None or items_key is None:
+            return None, params
+        projection = {"key": items_key, "spec": build_projection(fields)}
+        # projected responses must not be served to requests wanting other fields
+        return projection, {**(params or {}), "_fields": f"{items_key}:{projection_key(fields)}"}
+
+    def __retry_policy(self, retries: int = None, exponential_backoff: bool = None) -> RetryPolicy:
+        overrides = {}
+        if retries is not None:
+            overrides["max_attempts"] = retries
+        if exponential_backoff is not None:
+            overrides["exponential"] = exponential_backoff
+        return dataclasses.replace(self.retry_policy, **overrides) if overrides else self.retry_policy
+
+    async def __with_retries(self, policy: RetryPolicy, attempt_fn, **kwargs):
+        """
+        Run ``attempt_fn(attempt, session_index, session)`` under the retry policy, leasing a
+        session per attempt and steering retries away from the sessions that failed.
+        """
+        failed_sessions = set()
+
+        async def attempt(n: int):
+            async with self._lease_session(exclude=failed_sessions, **kwargs) as (i, session):
+                try:
+                    with self.metrics.span("attempt", session_index=i, attempt=n):
+                        return await attempt_fn(n, i, session)
+                except Exception:
+                    failed_sessions.add(i)
+                    raise
+
+        def on_retry(n: int, error: Exception, delay: float):
+            self.metrics.observe("retry_sleep", delay)
+            self.logger.info(f"Failed a request ({error}), retrying ({n}/{policy.max_attempts}) in {delay:.1f}s")
+
+        return await policy.run(attempt, on_retry=on_retry)
+
+    async def __make_request(self, url: str, headers: dict, params: dict, policy: RetryPolicy,
+                             signed_url: str, projection: dict = None, **kwargs):
+        async def attempt(n: int, i: int, session: TikTokPlaywrightSession):
+            request_url = signed_url if n == 1 else None
+            request_headers = headers
+            if request_url is None:
+                with self.metrics.span("prepare"):
+                    encoded_params, request_headers = await self.__prepare_request(session, url, headers, params)
+                with self.metrics.span("sign"):
+                    request_url = await self.sign_url(encoded_params, session_index=i)
+            elif request_headers is None:
+                request_headers = session.headers
+
+            with self.metrics.span("fetch"):
+                result = await self.run_fetch_script(
+                    request_url, headers=request_headers, projection=projection, session_index=i
+                )
 
             if result is None:
                 raise Exception("ApiTiktok.run_fetch_script returned None")
@@ -339,22 +684,183 @@ class ApiTiktok:
                 raise EmptyResponseException(result, "TikTok returned an empty response. They are detecting you're a bot, try some of these: headless=False, browser='webkit', consider using a proxy")
 
             try:
-                data = json.loads(result)
-                if data.get("status_code") != 0:
-                    self.logger.error(f"Got an unexpected status code: {data}")
-                return data
+                with self.metrics.span("parse"):
+                    data = json.loads(result)
             except json.decoder.JSONDecodeError:
-                if retry_count == retries:
-                    self.logger.error(f"Failed to decode json response: {result}")
-                    raise InvalidJSONException()
+                self.logger.error(f"Failed to decode json response: {result}")
+                raise InvalidJSONException(result, "TikTok returned invalid JSON.")
+            if data.get("status_code") != 0:
+                self.logger.error(f"Got an unexpected status code: {data}")
+            return data
+
+        return await self.__with_retries(policy, attempt, **kwargs)
+
+    async def make_requests_batch(self, requests: list[dict], concurrency: int = 8, **kwargs) -> list:
+        """
+        Makes many GET requests to TikTok through one session, signing and fetching the whole batch
+        in one round trip each.
+
+        Failures are reported per item, like ``asyncio.gather(..., return_exceptions=True)``,
+        so one bad request doesn't fail the batch.
 
-                self.logger.info(
-                    f"Failed a request, retrying ({retry_count}/{retries})"
+        Args:
+            requests (list[dict]): Dicts with the ``url``, ``params`` and optional ``headers`` of each request.
+            concurrency (int): The maximum amount of fetches in flight inside the page.
+            session_index (int): The index of the session you want to use, if not provided a random session will be used.
+            fields (list[str]): Dotted paths to keep in ``response[items_key]`` of every response, see make_request.
+            items_key (str): The key of the responses the fields are relative to.
+
+        Returns:
+            list: The json response of each request, or the TikTokException it failed with, in the same order.
+
+        Example Usage:
+            .. code-block:: python
+
+                results = await api.make_requests_batch([
+                    {"url": "https://www.tiktok.com/api/user/detail/", "params": {"uniqueId": name}}
+                    for name in usernames
+                ], concurrency=4)
+        """
+        if not requests:
+            return []
+        fields, items_key = kwargs.pop("fields", None), kwargs.pop("items_key", None)
+        projection, _ = self.__projection(None, fields, items_key)
+
+        if self.replaying:
+            return await self.__replay_batch(requests, concurrency, fields, items_key, **kwargs)
+
+        async with self._lease_session(**kwargs) as (i, _):
+            signed = await self.presign_requests(requests, session_index=i)
+            raw_results = await self.run_fetch_batch_script(
+                [{"url": r["signed_url"], "headers": r["headers"]} for r in signed],
+                concurrency=concurrency, projection=projection, session_index=i,
+            )
+
+        results = []
+        for request, raw in zip(requests, raw_results):
+            if raw.get("error") is not None:
+                results.append(InvalidResponseException(raw, f"In-page fetch failed: {raw['error']}"))
+            elif not raw.get("text"):
+                results.append(EmptyResponseException(raw.get("text"), "TikTok returned an empty response."))
+            else:
+                try:
+                    data = json.loads(raw["text"])
+                except json.decoder.JSONDecodeError:
+                    results.append(InvalidJSONException(raw["text"], "TikTok returned invalid JSON.", error_code=raw.get("status")))
+                    continue
+                if data.get("status_code") != 0:
+                    self.logger.error(f"Got an unexpected status code: {data}")
+                if self.cassette is not None:
+                    _, key_params = self.__projection(request.get("params"), fields, items_key)
+                    self.cassette.record("GET", request["url"], key_params, raw["text"])
+                results.append(data)
+        return results
+
+    async def __replay_batch(self, requests: list[dict], concurrency: int, fields=None, items_key: str = None,
+                             **kwargs) -> list:
+        """make_requests_batch from the cassette: every request is replayed, at most ``concurrency`` at a time."""
+        policy = self.__retry_policy(retries=1)
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def replay(request: dict):
+            projection, key_params = self.__projection(request.get("params"), fields, items_key)
+            async with semaphore:
+                return await self.__replay_request(
+                    "GET", request["url"], request.get("params"), policy, projection, key_params, **kwargs
                 )
-                if exponential_backoff:
-                    await asyncio.sleep(2**retry_count)
-                else:
-                    await asyncio.sleep(1)
+
+        return list(await asyncio.gather(*(replay(r) for r in requests), return_exceptions=True))
+
+    def __bulk_concurrency(self, concurrency: int = None) -> int:
+        if concurrency is not None:
+            return concurrency
+        return max(1, len(self.sessions)) * self.BULK_CONCURRENCY_PER_SESSION
+
+    async def videos_info(self, ids: Iterable[str], concurrency: int = None,
+                          ordered: bool = False, **kwargs) -> AsyncIterator[BulkResult]:
+        """
+        Fetches the info of many videos at once, spread over every session.
+
+        Each lookup leases its session through the scheduler, so the work goes to
+        the least busy healthy sessions. A failing video doesn't stop the others,
+        its exception is kept in the error of its result.
+
+        Args:
+            ids (Iterable[str]): Video ids or video urls.
+            concurrency (int): The maximum amount of lookups in flight, defaults to
+                BULK_CONCURRENCY_PER_SESSION per session.
+            ordered (bool): Yield results in the order of ids instead of as they complete.
+            fields (list[str]): Dotted paths of the video fields to keep, e.g. ``["desc", "stats.playCount"]``.
+
+        Returns:
+            async iterator/generator: Yields a BulkResult per video, holding the dict returned by Video.info.
+
+        Example Usage:
+            .. code-block:: python
+
+                async for result in api.videos_info(video_ids, concurrency=10):
+                    if result.ok:
+                        print(result.key, result.value["stats"])
+        """
+
+        async def lookup(key: str) -> dict:
+            if "://" in key:
+                video = self.video(url=key)
+            else:
+                video = self.video(id=key, url=f"https://www.tiktok.com/@/video/{key}")
+            return await video.info(**kwargs)
+
+        async with aclosing(fan_out(ids, lookup, self.__bulk_concurrency(concurrency), ordered)) as results:
+            async for result in results:
+                yield result
+
+    async def users_info(self, usernames: Iterable[str], concurrency: int = None,
+                         ordered: bool = False, **kwargs) -> AsyncIterator[BulkResult]:
+        """
+        Fetches the info of many users at once, spread over every session.
+
+        The requests are signed BULK_CONCURRENCY_PER_SESSION at a time with
+        presign_requests, each batch on the session the scheduler picks, so
+        signing costs one round trip per batch instead of one per user.
+
+        Args:
+            usernames (Iterable[str]): The usernames of the users.
+            concurrency (int): The maximum amount of lookups in flight, defaults to
+                BULK_CONCURRENCY_PER_SESSION per session.
+            ordered (bool): Yield results in the order of usernames instead of as they complete.
+            fields (list[str]): Dotted paths of the ``userInfo`` fields to keep, trimmed inside the page.
+
+        Returns:
+            async iterator/generator: Yields a BulkResult per user, holding the dict returned by User.info.
+
+        Example Usage:
+            .. code-block:: python
+
+                async for result in api.users_info(["therock", "tiktok"], ordered=True):
+                    print(result.key, result.value if result.ok else result.error)
+        """
+
+        async def presign(batch: list[str]) -> list[dict]:
+            return await self.presign_requests(
+                [{**self.user(username=username).info_request(**kwargs), "headers": kwargs.get("headers")}
+                 for username in batch],
+                session_index=kwargs.get("session_index"),
+            )
+
+        async def lookup(username: str, request: dict) -> dict:
+            return await self.user(username=username).info(**{
+                **kwargs,
+                "signed_url": request["signed_url"],
+                "headers": request["headers"],
+                "session_index": request["session_index"],
+            })
+
+        async with aclosing(fan_out(
+            usernames, lookup, self.__bulk_concurrency(concurrency), ordered,
+            prepare=presign, batch_size=self.BULK_CONCURRENCY_PER_SESSION,
+        )) as results:
+            async for result in results:
+                yield result
 
     async def run_post_script(self, url: str, headers: dict, body: dict,
                           referrer: str = "https://www.tiktok.com/", **kwargs):
@@ -422,77 +928,163 @@ class ApiTiktok:
         data: dict = None,
         params: dict = None,
         headers: dict = None,
-        retries: int = 3,
+        retries: int = None,
         referrer: str | None = None,
         use_inpage_sign=True,
         **kwargs,
     ):
-        i, session = self._get_session(**kwargs)
-        if session.params is not None:
-            params = {**session.params, **params}
+        """
+        Gửi POST tới TikTok qua một session, retry theo retry policy giống make_request
+        (mỗi lần retry ký lại URL và ưu tiên session khác session đã lỗi).
 
-        if headers is not None:
-            # có thể ép một vài header tối thiểu bên ngoài nếu thật sự cần
-            pass
+        Returns:
+            dict: JSON response, hoặc {"ok": False, "raw": ..., "message": ...} khi hết lượt retry.
+        """
+        policy = self.__retry_policy(retries)
+        policy = dataclasses.replace(policy, retry_on=policy.retry_on + (InvalidResponseException,))
+        last_result = None
 
-        # 3) msToken: chỉ tự thêm khi không dùng inpage_fetch
-        if not use_inpage_sign:
-            ms_token = params.get("msToken")
-            if not ms_token:
-                cookies = await self.get_session_cookies(session)
+        async def attempt(n: int, i: int, session: TikTokPlaywrightSession):
+            nonlocal last_result
+            request_params = dict(params or {})
+            if session.params is not None:
+                request_params = {**session.params, **request_params}
+
+            # msToken: chỉ tự thêm khi không dùng inpage_fetch
+            if not use_inpage_sign and not request_params.get("msToken"):
+                with self.metrics.span("prepare"):
+                    cookies = await self.get_session_cookies(session)
                 ms_token = cookies.get("msToken")
                 if not ms_token:
                     self.logger.warning(
                         "Failed to get msToken from cookies; trying POST anyway (may fail)"
                     )
-                params["msToken"] = ms_token
+                request_params["msToken"] = ms_token
 
-        # 4) Ký URL (X-Bogus)
-        if use_inpage_sign:
-            params.pop("msToken", None)
-            target_url = f"{url}?{urlencode(params, safe='=', quote_via=quote)}"
-        else:
-            if not params.get("msToken"):
-                cookies = await self.get_session_cookies(session)
-                if cookies.get("msToken"):
-                    params["msToken"] = cookies["msToken"]
-            base = f"{url}?{urlencode(params, safe='=', quote_via=quote)}"
-            target_url = await self.sign_url(base, session_index=i)
-
-        # 5) Gọi POST trong main world
-        max_attempts = max(1, retries)
-        last_result = None
-        for attempt in range(max_attempts):
-            inpage_result = await self.run_post_script(
-                target_url,
-                headers=headers,
-                body=data,
-                referrer=referrer,
-                session_index=i,
-            )
+            # Ký URL (X-Bogus)
+            if use_inpage_sign:
+                request_params.pop("msToken", None)
+                target_url = f"{url}?{urlencode(request_params, safe='=', quote_via=quote)}"
+            else:
+                base = f"{url}?{urlencode(request_params, safe='=', quote_via=quote)}"
+                with self.metrics.span("sign"):
+                    target_url = await self.sign_url(base, session_index=i)
+
+            # Gọi POST trong main world
+            with self.metrics.span("post"):
+                inpage_result = await self.run_post_script(
+                    target_url,
+                    headers=headers,
+                    body=data,
+                    referrer=referrer,
+                    session_index=i,
+                )
             last_result = inpage_result
 
+            if not inpage_result or not inpage_result.get("ok"):
+                status = inpage_result.get("status") if inpage_result else None
+                raise InvalidResponseException(inpage_result, "In-page POST failed or was blocked.", error_code=status)
+
+            self.logger.debug(f"In-page POST: {inpage_result.get('status')} {inpage_result.get('statusText')}")
+            body_text = (inpage_result.get("text") or "").strip()
+            if not body_text:
+                # OK nhưng body rỗng (ví dụ 204)
+                return {"ok": True, "raw": inpage_result, "message": "Empty response body."}
             try:
-                print("🪶 INPAGE POST:", inpage_result.get("status"), inpage_result.get("statusText"))
-            except Exception:
-                pass
+                with self.metrics.span("parse"):
+                    return json.loads(body_text)
+            except json.decoder.JSONDecodeError:
+                return {"ok": True, "raw": inpage_result, "message": "Non-JSON response body."}
 
-            if inpage_result and inpage_result.get("ok"):
-                body_text = (inpage_result.get("text") or "").strip()
-                if body_text:
-                    try:
-                        return json.loads(body_text)
-                    except json.decoder.JSONDecodeError:
-                        return {"ok": True, "raw": inpage_result, "message": "Non-JSON response body."}
-                else:
-                    # OK nhưng body rỗng (ví dụ 204)
-                    return {"ok": True, "raw": inpage_result, "message": "Empty response body."}
+        with self.metrics.span("total", endpoint=urlparse(url).path):
+            if self.replaying:
+                return await self.__replay_request("POST", url, params, policy, **kwargs)
+            try:
+                result = await self.__with_retries(policy, attempt, **kwargs)
+            except InvalidResponseException:
+                # Hết retries, vẫn fail
+                return {"ok": False, "raw": last_result, "message": "Request failed or blocked."}
+            if self.cassette is not None:
+                self.cassette.record("POST", url, params, json.dumps(result, ensure_ascii=False))
+            return result
+
+    async def __replay_request(self, method: str, url: str, params: dict, policy: RetryPolicy,
+                               projection: dict = None, key_params: dict = None, **kwargs):
+        """
+        Send a request to the replay transport, failures are retried like live requests.
 
-            # Retry: backoff nhẹ
-            await asyncio.sleep(1 + attempt)
+        With a ``projection`` the full recorded response is projected in Python, like the page would,
+        falling back to a response recorded with that same projection.
+        """
+        candidates = [params] if projection is None else [params, key_params]
+
+        async def attempt(n: int, i: int, session: TikTokPlaywrightSession):
+            for candidate in candidates:
+                with self.metrics.span("fetch"):
+                    r = await self.http.get().request(method, url, params={
+                        k: str(v) for k, v in (candidate or {}).items() if v is not None
+                    })
+                if r.status_code != 404:
+                    break
+            if r.status_code == 404:
+                raise InvalidResponseException(r.text, f"No recorded response for {method} {url}", error_code=404)
+            if r.status_code >= 500 or not r.text:
+                raise EmptyResponseException(r.text, f"The replayed response failed with status {r.status_code}")
+            try:
+                with self.metrics.span("parse"):
+                    data = json.loads(r.text)
+            except json.decoder.JSONDecodeError:
+                raise InvalidJSONException(r.text, "TikTok returned invalid JSON.")
+            if projection is not None and isinstance(data.get(projection["key"]), (dict, list)):
+                data[projection["key"]] = project(data[projection["key"]], projection["spec"])
+            return data
 
-        # Hết retries, vẫn fail
-        return {"ok": False, "raw": last_result, "message": "Request failed or blocked."}
+        return await self.__with_retries(policy, attempt, **kwargs)
+
+    def record_to(self, cassette: Cassette):
+        """
+        Record the responses of make_request, make_request_post and Video.info into a cassette.
+
+        Args:
+            cassette (Cassette): Where the responses go, call its save() once done.
+
+        Example Usage:
+            .. code-block:: python
+
+                cassette = Cassette("cassettes/therock.json")
+                api.record_to(cassette)
+                await api.user(username="therock").info()
+                cassette.save()
+        """
+        self.cassette = cassette
+
+    async def replay_from(self, cassette: Cassette = None, base_url: str = None, num_sessions: int = 1):
+        """
+        Answer every request from recorded responses, without browser or network.
+
+        Offline sessions replace the Playwright ones, so create_sessions must not be called.
+
+        Args:
+            cassette (Cassette): Replay in-process from this cassette.
+            base_url (str): Or send the requests to this server, e.g. ``StandInServer.url``.
+            num_sessions (int): The amount of offline sessions, requests are spread over them as usual.
+
+        Example Usage:
+            .. code-block:: python
+
+                api = ApiTiktok()
+                await api.replay_from(Cassette.load("cassettes/therock.json"))
+                user = await api.user(username="therock").info()
+        """
+        await self.http.aclose()
+        self.http = HttpClientPool(transport=ReplayTransport(cassette, base_url))
+        self.replaying = True
+        self.sessions[:] = [
+            TikTokPlaywrightSession(
+                ReplayContext(), ReplayPage(), headers={"user-agent": REPLAY_USER_AGENT}, params={}, ms_token="replay"
+            )
+            for _ in range(num_sessions)
+        ]
 
     async def get_session_content(self, url: str, **kwargs):
         """Get the content of a url"""
@@ -506,6 +1098,9 @@ class ApiTiktok:
         self.sessions.clear()
 
     async def stop_playwright(self):
+        if getattr(self, "browser", None) is None:
+            # replaying, there is no browser
+            return
         await self.browser.close()
         await self.playwright.stop()
 
@@ -513,5 +1108,9 @@ class ApiTiktok:
         return self
 
     async def __aexit__(self, exc_type, exc, tb):
-        await self.close_sessions()
-        await self.stop_playwright()
\ No newline at end of file
+        # the pooled httpx clients are closed even if the browser already died
+        try:
+            await self.close_sessions()
+            await self.stop_playwright()
+        finally:
+            await self.http.aclose()
\ No newline at end of file
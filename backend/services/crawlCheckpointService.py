@@ -0,0 +1,77 @@
+import asyncio
+from typing import Optional
+
+from flask import Flask
+
+from domain.db import db
+from domain.models.CrawlCheckpoint import CrawlCheckpoint
+from services.ApiTiktok.checkpoint import Checkpoint, CheckpointStore
+
+
+class DatabaseCheckpointStore(CheckpointStore):
+    """
+    Lưu checkpoint của các paginator vào bảng AppCrawlCheckpoint.
+
+    Các truy vấn chạy trong thread riêng (asyncio.to_thread) với app context
+    của Flask, để không chặn event loop của crawl.
+
+    Ví dụ:
+        store = DatabaseCheckpointStore(app)
+        async for comment in api.video(id=video_id).comments(
+            count=50000, checkpoint=store, job="viral-comments"
+        ):
+            ...
+    """
+
+    def __init__(self, app: Flask):
+        self.app = app
+
+    def _find(self, job: str, endpoint: str, object_id: str) -> Optional[CrawlCheckpoint]:
+        return CrawlCheckpoint.query.filter_by(job=job, endpoint=endpoint, object_id=str(object_id)).first()
+
+    def _load(self, job: str, endpoint: str, object_id: str) -> Optional[Checkpoint]:
+        with self.app.app_context():
+            row = self._find(job, endpoint, object_id)
+            if row is None:
+                return None
+            return Checkpoint(
+                job=row.job,
+                endpoint=row.endpoint,
+                object_id=row.object_id,
+                cursor=row.cursor_value,
+                items_seen=row.items_seen,
+                page_offset=row.page_offset,
+                finished=row.finished,
+            )
+
+    def _save(self, checkpoint: Checkpoint) -> None:
+        with self.app.app_context():
+            row = self._find(checkpoint.job, checkpoint.endpoint, checkpoint.object_id)
+            if row is None:
+                row = CrawlCheckpoint(
+                    job=checkpoint.job,
+                    endpoint=checkpoint.endpoint,
+                    object_id=str(checkpoint.object_id),
+                )
+                db.session.add(row)
+            row.cursor_value = checkpoint.cursor
+            row.items_seen = checkpoint.items_seen
+            row.page_offset = checkpoint.page_offset
+            row.finished = checkpoint.finished
+            db.session.commit()
+
+    def _delete(self, job: str, endpoint: str, object_id: str) -> None:
+        with self.app.app_context():
+            row = self._find(job, endpoint, object_id)
+            if row is not None:
+                db.session.delete(row)
+                db.session.commit()
+
+    async def load(self, job: str, endpoint: str, object_id: str) -> Optional[Checkpoint]:
+        return await asyncio.to_thread(self._load, job, endpoint, object_id)
+
+    async def save(self, checkpoint: Checkpoint):
+        await asyncio.to_thread(self._save, checkpoint)
+
+    async def delete(self, job: str, endpoint: str, object_id: str):
+        await asyncio.to_thread(self._delete, job, endpoint, object_id)
@@ -0,0 +1,233 @@
+# exporter.py
+"""
+Streaming export of crawled entities to Parquet.
+
+Rows are buffered up to ``batch_size`` and written as one row group at a
+time, so memory stays flat whatever the size of the crawl, and pandas reads
+the typed columns back without any JSON parsing.
+
+Example:
+    async with ParquetExporter.for_comments("comments.parquet") as exporter:
+        await exporter.export(video.comments(count=50000))
+
+    df = pd.read_parquet("comments.parquet")
+"""
+import json
+import logging
+import typing
+from typing import Any, AsyncIterator, Callable, Optional
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pydantic import BaseModel, ValidationError
+
+from contracts.TikTokVideoDto import TikTokVideoDto
+from .mapper import map_tiktok_response_to_dto
+
+logger = logging.getLogger(__name__)
+
+_SCALAR_TYPES = {
+    str: pa.string(),
+    int: pa.int64(),
+    float: pa.float64(),
+    bool: pa.bool_(),
+    dict: pa.string(),  # lưu JSON string
+}
+
+
+def _arrow_type(annotation: Any) -> tuple[pa.DataType, bool]:
+    """Chuyển annotation của pydantic sang kiểu Arrow, trả về (type, nullable)."""
+    nullable = False
+    origin = typing.get_origin(annotation)
+    if origin is typing.Union:
+        args = [a for a in typing.get_args(annotation) if a is not type(None)]
+        nullable = len(args) != len(typing.get_args(annotation))
+        annotation = args[0] if len(args) == 1 else str
+        origin = typing.get_origin(annotation)
+
+    if origin in (list, typing.List):
+        item_type, _ = _arrow_type(typing.get_args(annotation)[0])
+        return pa.list_(item_type), nullable
+    if origin is dict:
+        return pa.string(), nullable
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return pa.struct(list(arrow_schema_from_model(annotation))), nullable
+    return _SCALAR_TYPES.get(annotation, pa.string()), nullable
+
+
+def arrow_schema_from_model(model: type[BaseModel]) -> pa.Schema:
+    """Build an Arrow schema from a pydantic model, nested models become structs."""
+    fields = []
+    for name, info in model.model_fields.items():
+        arrow_type, nullable = _arrow_type(info.annotation)
+        fields.append(pa.field(name, arrow_type, nullable=nullable or not info.is_required()))
+    return pa.schema(fields)
+
+
+def _coerce(value: Any, arrow_type: pa.DataType) -> Any:
+    """Đưa giá trị Python về dạng khớp với kiểu Arrow (struct lồng nhau, dict -> JSON string)."""
+    if value is None:
+        return None
+    if pa.types.is_struct(arrow_type):
+        return {f.name: _coerce(value.get(f.name), f.type) for f in arrow_type}
+    if pa.types.is_list(arrow_type):
+        return [_coerce(v, arrow_type.value_type) for v in value]
+    if pa.types.is_string(arrow_type) and not isinstance(value, str):
+        return json.dumps(value, ensure_ascii=False) if isinstance(value, (dict, list)) else str(value)
+    if pa.types.is_integer(arrow_type) and isinstance(value, str):
+        return int(value)
+    return value
+
+
+VIDEO_SCHEMA = arrow_schema_from_model(TikTokVideoDto)
+"""Schema of exported videos, taken from contracts/TikTokVideoDto.py."""
+
+COMMENT_SCHEMA = pa.schema([
+    pa.field("cid", pa.string(), nullable=False),
+    pa.field("aweme_id", pa.string()),
+    pa.field("text", pa.string()),
+    pa.field("digg_count", pa.int64()),
+    pa.field("reply_comment_total", pa.int64()),
+    pa.field("create_time", pa.int64()),
+    pa.field("user_id", pa.string()),
+    pa.field("username", pa.string()),
+    pa.field("sec_uid", pa.string()),
+])
+
+USER_SCHEMA = pa.schema([
+    pa.field("user_id", pa.string(), nullable=False),
+    pa.field("sec_uid", pa.string()),
+    pa.field("username", pa.string()),
+    pa.field("nickname", pa.string()),
+    pa.field("signature", pa.string()),
+    pa.field("verified", pa.bool_()),
+    pa.field("follower_count", pa.int64()),
+    pa.field("following_count", pa.int64()),
+    pa.field("heart_count", pa.int64()),
+    pa.field("video_count", pa.int64()),
+])
+
+
+def _raw(item: Any) -> dict:
+    return item if isinstance(item, dict) else getattr(item, "as_dict", None) or {}
+
+
+def video_to_row(item: Any) -> dict:
+    """Map a Video (or its raw dict) through TikTokVideoDto."""
+    return map_tiktok_response_to_dto(_raw(item)).model_dump()
+
+
+def comment_to_row(item: Any) -> dict:
+    raw = _raw(item)
+    user = raw.get("user") or {}
+    return {
+        "cid": raw.get("cid"),
+        "aweme_id": raw.get("aweme_id"),
+        "text": raw.get("text"),
+        "digg_count": raw.get("digg_count"),
+        "reply_comment_total": raw.get("reply_comment_total"),
+        "create_time": raw.get("create_time"),
+        "user_id": user.get("uid"),
+        "username": user.get("unique_id"),
+        "sec_uid": user.get("sec_uid"),
+    }
+
+
+def user_to_row(item: Any) -> dict:
+    raw = _raw(item)
+    raw = raw.get("userInfo", raw)
+    user = raw.get("user", raw)
+    stats = raw.get("stats") or {}
+    return {
+        "user_id": user.get("id") or getattr(item, "user_id", None),
+        "sec_uid": user.get("secUid") or getattr(item, "sec_uid", None),
+        "username": user.get("uniqueId") or getattr(item, "username", None),
+        "nickname": user.get("nickname"),
+        "signature": user.get("signature"),
+        "verified": user.get("verified"),
+        "follower_count": stats.get("followerCount"),
+        "following_count": stats.get("followingCount"),
+        "heart_count": stats.get("heartCount") or stats.get("heart"),
+        "video_count": stats.get("videoCount"),
+    }
+
+
+class ParquetExporter:
+    """
+    Ghi entity (video, comment, user) ra file Parquet theo từng row group.
+
+    Mỗi khi buffer đủ ``batch_size`` dòng thì ghi thành một row group và xoá buffer.
+    Dòng nào không map được (thiếu field bắt buộc...) sẽ bị bỏ qua và đếm vào ``skipped``.
+    """
+
+    def __init__(self, path: str, schema: pa.Schema, to_row: Callable[[Any], dict],
+                 batch_size: int = 5000, compression: str = "zstd"):
+        self.path = path
+        self.schema = schema
+        self.to_row = to_row
+        self.batch_size = batch_size
+        self.compression = compression
+        self.rows_written = 0
+        self.skipped = 0
+        self._rows: list[dict] = []
+        self._writer: Optional[pq.ParquetWriter] = None
+
+    @classmethod
+    def for_videos(cls, path: str, **kwargs) -> "ParquetExporter":
+        return cls(path, VIDEO_SCHEMA, video_to_row, **kwargs)
+
+    @classmethod
+    def for_comments(cls, path: str, **kwargs) -> "ParquetExporter":
+        return cls(path, COMMENT_SCHEMA, comment_to_row, **kwargs)
+
+    @classmethod
+    def for_users(cls, path: str, **kwargs) -> "ParquetExporter":
+        return cls(path, USER_SCHEMA, user_to_row, **kwargs)
+
+    def write(self, item: Any) -> None:
+        try:
+            row = self.to_row(item)
+            row = {f.name: _coerce(row.get(f.name), f.type) for f in self.schema}
+        except (ValidationError, KeyError, TypeError, ValueError) as e:
+            self.skipped += 1
+            logger.warning(f"Skipped a row that doesn't fit the schema: {e}")
+            return
+        self._rows.append(row)
+        if len(self._rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Ghi các dòng đang buffer thành một row group."""
+        if not self._rows:
+            return
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.path, self.schema, compression=self.compression)
+        self._writer.write_table(pa.Table.from_pylist(self._rows, schema=self.schema))
+        self.rows_written += len(self._rows)
+        self._rows = []
+
+    async def export(self, items: AsyncIterator[Any]) -> int:
+        """Đọc hết async iterator và ghi ra file, trả về số dòng đã ghi từ iterator này."""
+        before = self.rows_written + len(self._rows)
+        async for item in items:
+            self.write(item)
+        return self.rows_written + len(self._rows) - before
+
+    def close(self) -> None:
+        self.flush()
+        if self._writer is None:
+            # không có dòng nào, vẫn tạo file rỗng có schema
+            self._writer = pq.ParquetWriter(self.path, self.schema, compression=self.compression)
+        self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
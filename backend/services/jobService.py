@@ -0,0 +1,299 @@
+import asyncio
+import logging
+import os
+import socket
+import threading
+import uuid
+from concurrent.futures import Future
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from flask import Flask, current_app
+
+from domain.db import db
+from domain.models.BackgroundJob import BackgroundJob
+from utils.loop import LoopBridge, get_loop_bridge
+from utils.metrics import background_jobs_total, track_background
+
+logger = logging.getLogger(__name__)
+
+
+class JobCancelled(Exception):
+    """Job bị huỷ từ một process khác (cancel_requested trong database)."""
+
+
+@dataclass
+class JobHandler:
+    fn: Callable[..., Awaitable[Any]]
+    concurrency: int
+
+
+# kind -> handler, đăng ký bằng @job_handler khi import module chứa handler
+JOB_HANDLERS: Dict[str, JobHandler] = {}
+
+
+def job_handler(kind: str, concurrency: int = 1):
+    """
+    Đăng ký một coroutine làm handler cho các job ``kind``.
+
+    Handler nhận JobContext và các params lúc submit, giá trị trả về (JSON được)
+    là kết quả của job. ``concurrency`` giới hạn số job ``kind`` chạy cùng lúc
+    trong một process.
+
+    Ví dụ:
+        @job_handler("tiktok_sign_in", concurrency=2)
+        async def sign_in_job(job: JobContext, tiktok_name: str = ""):
+            payload = await build_tiktok_session_payload(tiktok_name)
+            return await job.run_db(save_session, payload)
+    """
+
+    def decorator(fn):
+        JOB_HANDLERS[kind] = JobHandler(fn=fn, concurrency=concurrency)
+        return fn
+
+    return decorator
+
+
+class JobContext:
+    """Những gì handler cần: id, params, truy cập database và báo tiến độ."""
+
+    def __init__(self, manager: "JobManager", job_id: str, params: dict):
+        self.manager = manager
+        self.job_id = job_id
+        # params đã lưu, không có secrets
+        self.params = params
+
+    async def run_db(self, fn: Callable, *args, **kwargs):
+        """Chạy ``fn`` trong thread riêng với app context, để truy vấn không chặn event loop."""
+        return await asyncio.to_thread(self.manager._with_app_context, fn, *args, **kwargs)
+
+    async def progress(self, done: int, total: Optional[int] = None):
+        """
+        Lưu tiến độ. Nếu job đã bị yêu cầu huỷ (kể cả từ process khác) thì raise JobCancelled.
+        """
+        cancel_requested = await self.run_db(self.manager._save_progress, self.job_id, done, total)
+        if cancel_requested:
+            raise JobCancelled()
+
+
+class JobManager:
+    """
+    Chạy các job dài (đăng nhập bằng browser, import...) ngoài request thread.
+
+    submit() lưu job vào bảng AppBackgroundJob rồi trả về ngay; job chạy như
+    một coroutine trên event loop dùng chung của process (utils.loop.LoopBridge,
+    cùng loop với các handler gọi run_async, nên dùng chung browser và pool),
+    tối đa ``max_workers`` job cùng lúc và ``concurrency`` job cho mỗi kind.
+    Trạng thái, tiến độ và kết quả được lưu vào database nên mọi worker đều đọc
+    được; huỷ job của process khác thông qua cột cancel_requested.
+
+    Job đang chạy khi process chết sẽ được đánh dấu failed ở lần khởi động sau
+    trên cùng host.
+
+    Ví dụ:
+        manager = get_job_manager()
+        job = manager.submit("tiktok_sign_in", {"tiktok_name": "mideframe"})
+        # client poll GET /api/v1/jobs/<job.id>
+    """
+
+    def __init__(self, app: Flask, max_workers: int = 4, bridge: Optional[LoopBridge] = None):
+        self.app = app
+        self.max_workers = max_workers
+        self.bridge = bridge or get_loop_bridge()
+        self._started_pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._futures: Dict[str, Future] = {}
+        # Tạo trên loop khi job đầu tiên chạy
+        self._workers: Optional[asyncio.Semaphore] = None
+        self._limits: Dict[str, asyncio.Semaphore] = {}
+
+    # ----------------------------------------------------
+    # Vòng đời
+    # ----------------------------------------------------
+
+    @property
+    def owner(self) -> str:
+        """Chuỗi "host:pid" của process hiện tại (pid đổi sau khi fork)."""
+        return f"{socket.gethostname()}:{os.getpid()}"
+
+    def start(self):
+        """Đánh dấu các job bị bỏ dở, một lần cho mỗi process; submit() tự gọi."""
+        with self._lock:
+            if self._started_pid == os.getpid():
+                return
+            self._started_pid = os.getpid()
+            # Process con sau fork có loop mới, semaphore của loop cũ không dùng được
+            self._workers = None
+            self._limits = {}
+        self._with_app_context(self._recover)
+
+    def stop(self):
+        """Huỷ các job đang chờ hoặc đang chạy trong process này."""
+        with self._lock:
+            futures = list(self._futures.values())
+        for future in futures:
+            future.cancel()
+
+    def _with_app_context(self, fn: Callable, *args, **kwargs):
+        with self.app.app_context():
+            return fn(*args, **kwargs)
+
+    def _recover(self):
+        host = self.owner.rsplit(":", 1)[0]
+        stale = BackgroundJob.query.filter(
+            BackgroundJob.status.in_([BackgroundJob.QUEUED, BackgroundJob.RUNNING]),
+            BackgroundJob.owner.like(f"{host}:%"),
+            BackgroundJob.owner != self.owner,
+        ).all()
+        for job in stale:
+            if _process_alive(int(job.owner.rsplit(":", 1)[1])):
+                continue
+            job.status = BackgroundJob.FAILED
+            job.error = "Interrupted: the process running this job stopped"
+            job.finished_at = datetime.now()
+            background_jobs_total.inc(kind=job.kind, status=job.status)
+        db.session.commit()
+
+    # ----------------------------------------------------
+    # API cho request thread (cần app context)
+    # ----------------------------------------------------
+
+    def submit(self, kind: str, params: Optional[dict] = None, secrets: Optional[dict] = None) -> BackgroundJob:
+        """
+        Lưu job ở trạng thái queued và đưa vào loop; client dùng job.id để poll.
+
+        ``secrets`` (mật khẩu...) được truyền cho handler như params nhưng chỉ
+        giữ trong bộ nhớ, không bao giờ ghi vào database. Job bị bỏ dở không
+        chạy lại nên không cần đọc lại chúng.
+        """
+        if kind not in JOB_HANDLERS:
+            raise ValueError(f"Unknown job kind: {kind}")
+        self.start()
+
+        params = params or {}
+        job_id = uuid.uuid4().hex
+        job = BackgroundJob(id=job_id, kind=kind, status=BackgroundJob.QUEUED, owner=self.owner)
+        job.params_value = params
+        db.session.add(job)
+        db.session.commit()
+
+        with self._lock:
+            future = self.bridge.submit(self._run(job_id, kind, params, secrets or {}))
+            self._futures[job_id] = future
+        future.add_done_callback(lambda _: self._forget(job_id))
+        return job
+
+    def get(self, job_id: str) -> Optional[BackgroundJob]:
+        return db.session.get(BackgroundJob, job_id)
+
+    def cancel(self, job_id: str) -> Optional[BackgroundJob]:
+        """
+        Yêu cầu huỷ job. Job của process này bị huỷ ngay (CancelledError tại await
+        đang chờ), job của process khác dừng ở lần báo tiến độ kế tiếp.
+        """
+        job = self.get(job_id)
+        if job is None or job.finished:
+            return job
+        # job còn queued thì huỷ luôn: coroutine có thể chưa chạy bước nào, khi đó
+        # future.cancel() không vào tới _run để ghi trạng thái
+        if self._update_if(job_id, (BackgroundJob.QUEUED,), status=BackgroundJob.CANCELLED,
+                           cancel_requested=True, finished_at=datetime.now()):
+            background_jobs_total.inc(kind=job.kind, status=BackgroundJob.CANCELLED)
+        else:
+            self._update_if(job_id, (BackgroundJob.RUNNING,), cancel_requested=True)
+        db.session.commit()
+        db.session.refresh(job)
+        with self._lock:
+            future = self._futures.get(job_id)
+        if future is not None:
+            future.cancel()
+        return job
+
+    @staticmethod
+    def _update_if(job_id: str, statuses: tuple, *criteria, **values) -> bool:
+        """
+        UPDATE có điều kiện theo status, để cancel (thread request) và _run (event loop)
+        không ghi đè trạng thái của nhau. Trả về True nếu dòng được cập nhật.
+        """
+        updated = BackgroundJob.query.filter(
+            BackgroundJob.id == job_id, BackgroundJob.status.in_(statuses), *criteria,
+        ).update(values, synchronize_session=False)
+        return updated > 0
+
+    def _forget(self, job_id: str):
+        with self._lock:
+            self._futures.pop(job_id, None)
+
+    # ----------------------------------------------------
+    # Trên event loop
+    # ----------------------------------------------------
+
+    def _limit(self, kind: str) -> asyncio.Semaphore:
+        if kind not in self._limits:
+            self._limits[kind] = asyncio.Semaphore(JOB_HANDLERS[kind].concurrency)
+        return self._limits[kind]
+
+    async def _run(self, job_id: str, kind: str, params: dict, secrets: dict):
+        if self._workers is None:
+            self._workers = asyncio.Semaphore(self.max_workers)
+        context = JobContext(self, job_id, params)
+        try:
+            async with self._workers, self._limit(kind):
+                if not await context.run_db(self._mark_running, job_id):
+                    raise JobCancelled()
+                with track_background(kind):
+                    result = await JOB_HANDLERS[kind].fn(context, **params, **secrets)
+        except (asyncio.CancelledError, JobCancelled):
+            await context.run_db(self._finish, job_id, BackgroundJob.CANCELLED)
+            raise asyncio.CancelledError()
+        except Exception as ex:
+            logger.exception(f"Job {job_id} ({kind}) failed")
+            await context.run_db(self._finish, job_id, BackgroundJob.FAILED, error=str(ex) or type(ex).__name__)
+        else:
+            await context.run_db(self._finish, job_id, BackgroundJob.SUCCEEDED, result=result)
+
+    def _mark_running(self, job_id: str) -> bool:
+        running = self._update_if(job_id, (BackgroundJob.QUEUED,), BackgroundJob.cancel_requested.is_(False),
+                                  status=BackgroundJob.RUNNING, started_at=datetime.now())
+        db.session.commit()
+        return running
+
+    def _save_progress(self, job_id: str, done: int, total: Optional[int]) -> bool:
+        job = self.get(job_id)
+        job.progress_done = done
+        if total is not None:
+            job.progress_total = total
+        db.session.commit()
+        return job.cancel_requested
+
+    def _finish(self, job_id: str, status: str, result: Any = None, error: Optional[str] = None):
+        # job đã bị huỷ khi còn queued thì giữ nguyên trạng thái cancelled
+        pending = (BackgroundJob.QUEUED, BackgroundJob.RUNNING)
+        if not self._update_if(job_id, pending, status=status, error=error, finished_at=datetime.now()):
+            db.session.rollback()
+            return
+        job = self.get(job_id)
+        job.result_value = result
+        db.session.commit()
+        background_jobs_total.inc(kind=job.kind, status=status)
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        # PermissionError: process tồn tại nhưng của user khác
+        return True
+    return True
+
+
+def init_jobs(app: Flask):
+    """Gắn JobManager vào app (app.extensions["jobs"]); loop chỉ khởi động khi có job đầu tiên."""
+    app.extensions["jobs"] = JobManager(app, max_workers=app.config.get("JOBS_MAX_WORKERS", 4))
+
+
+def get_job_manager() -> JobManager:
+    return current_app.extensions["jobs"]
@@ -0,0 +1,53 @@
+import os
+
+import pytest
+import pytest_asyncio
+
+from ApiTiktok import ApiTiktok
+from ApiTiktok.replay import Cassette
+
+# TIKTOK_LIVE=1 runs the api tests against TikTok and records their cassettes again
+LIVE = os.environ.get("TIKTOK_LIVE", "").lower() in ("1", "true")
+CASSETTES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cassettes")
+
+ms_token = os.environ.get("ms_token", None)
+headless = os.environ.get("headless", "True").lower() == "true"
+
+
+def cassette_path(request) -> str:
+    module = request.module.__name__.rsplit(".", 1)[-1]
+    return os.path.join(CASSETTES, module, f"{request.node.name}.json")
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    report = outcome.get_result()
+    if report.when == "call":
+        item.passed = report.passed
+
+
+@pytest_asyncio.fixture
+async def api(request):
+    """
+    An ApiTiktok answering from the cassette of the test, without browser or network.
+
+    With TIKTOK_LIVE=1 it gets Playwright sessions instead, and the cassette is
+    recorded again if the test passes.
+    """
+    path = cassette_path(request)
+    async with ApiTiktok() as api:
+        if not LIVE:
+            await api.replay_from(Cassette.load(path))
+            yield api
+            return
+
+        await api.create_sessions(
+            ms_tokens=[ms_token], num_sessions=1, sleep_after=3,
+            browser=os.getenv("TIKTOK_BROWSER", "chromium"), headless=headless,
+        )
+        cassette = Cassette(path)
+        api.record_to(cassette)
+        yield api
+        if getattr(request.node, "passed", False):
+            cassette.save()
@@ -0,0 +1,89 @@
+from ApiTiktok.blocking import ResourceBlocker, AVERAGE_BYTES
+from types import SimpleNamespace
+import pytest
+
+
+class FakeCDPSession:
+    def __init__(self):
+        self.sent = []
+        self.handlers = {}
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+    async def send(self, method, params=None):
+        self.sent.append((method, params))
+
+
+class FakeContext:
+    def __init__(self):
+        self.cdp = FakeCDPSession()
+        self.routes = []
+
+    async def new_cdp_session(self, page):
+        return self.cdp
+
+    async def route(self, url, handler):
+        self.routes.append((url, handler))
+
+
+@pytest.mark.asyncio
+async def test_chromium_blocks_by_resource_type_in_the_browser():
+    context = FakeContext()
+    blocker = ResourceBlocker(["image", "font"])
+    await blocker.install(context, page=None, browser_name="chromium")
+
+    assert blocker.mode == "cdp"
+    assert context.routes == []
+    method, params = context.cdp.sent[0]
+    assert method == "Fetch.enable"
+    assert [(p["urlPattern"], p["resourceType"]) for p in params["patterns"]] == [("*", "Font"), ("*", "Image")]
+
+    # only requests of a blocked type pause, extensionless images included
+    await context.cdp.handlers["Fetch.requestPaused"](
+        {"requestId": "1", "resourceType": "Image", "request": {"url": "https://p16-sign.tiktokcdn.com/obj/avatar"}}
+    )
+    assert context.cdp.sent[-1] == ("Fetch.failRequest", {"requestId": "1", "errorReason": "BlockedByClient"})
+    assert blocker.stats()["blocked_by_type"] == {"image": 1}
+    assert blocker.stats()["estimated_bytes_saved"] == AVERAGE_BYTES["image"]
+
+
+@pytest.mark.asyncio
+async def test_other_browsers_route_only_blocked_extensions():
+    context = FakeContext()
+    blocker = ResourceBlocker(["font", "stylesheet"])
+    await blocker.install(context, page=None, browser_name="firefox")
+
+    (pattern, _), = context.routes
+    assert blocker.mode == "route"
+    assert pattern.search("https://sf16-website.tiktokcdn.com/main.css")
+    assert pattern.search("https://sf16-website.tiktokcdn.com/fonts/tiktok.woff2?v=3")
+    assert not pattern.search("https://www.tiktok.com/api/post/item_list/?count=30&theme=dark.css")
+    assert not pattern.search("https://sf16-website.tiktokcdn.com/main.css.map")
+    assert not pattern.search("https://sf16-website.tiktokcdn.com/main.js")
+
+
+@pytest.mark.asyncio
+async def test_types_without_url_patterns_route_every_request():
+    context = FakeContext()
+    blocker = ResourceBlocker(["image", "stylesheet"])
+    await blocker.install(context, page=None, browser_name="webkit")
+
+    (pattern, route_handler), = context.routes
+    assert blocker.mode == "route"
+    assert pattern == "**/*"
+
+    class FakeRoute:
+        action = None
+
+        async def abort(self):
+            self.action = "abort"
+
+        async def continue_(self):
+            self.action = "continue"
+
+    for resource_type, action in (("image", "abort"), ("xhr", "continue")):
+        route = FakeRoute()
+        await route_handler(route, SimpleNamespace(resource_type=resource_type))
+        assert route.action == action
+    assert blocker.stats()["blocked_by_type"] == {"image": 1}
@@ -0,0 +1,70 @@
+from ApiTiktok.bulk import fan_out
+import asyncio
+import pytest
+
+
+async def lookup(key):
+    await asyncio.sleep(0.001 * (5 - int(key)))
+    if key == "3":
+        raise ValueError(key)
+    return int(key) * 10
+
+
+@pytest.mark.asyncio
+async def test_errors_are_collected_per_item():
+    results = [r async for r in fan_out(["0", "1", "2", "3", "4"], lookup, concurrency=5)]
+
+    assert len(results) == 5
+    failed = [r for r in results if not r.ok]
+    assert [r.key for r in failed] == ["3"]
+    assert isinstance(failed[0].error, ValueError)
+    assert sorted(r.value for r in results if r.ok) == [0, 10, 20, 40]
+
+
+@pytest.mark.asyncio
+async def test_ordered_results_follow_input():
+    results = [r async for r in fan_out(["0", "1", "2", "3", "4"], lookup, concurrency=5, ordered=True)]
+
+    assert [r.index for r in results] == [0, 1, 2, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded():
+    in_flight = 0
+    peak = 0
+
+    async def tracked(key):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.001)
+        in_flight -= 1
+        return key
+
+    results = [r async for r in fan_out([str(i) for i in range(20)], tracked, concurrency=3)]
+
+    assert len(results) == 20
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_keys_are_prepared_in_batches():
+    batches = []
+
+    async def prepare(batch):
+        batches.append(batch)
+        if "5" in batch:
+            raise ValueError("signing failed")
+        return [f"signed-{key}" for key in batch]
+
+    async def prepared_lookup(key, prepared):
+        await asyncio.sleep(0.001)
+        return prepared
+
+    results = [r async for r in fan_out([str(i) for i in range(7)], prepared_lookup, concurrency=2,
+                                        ordered=True, prepare=prepare, batch_size=3)]
+
+    assert batches == [["0", "1", "2"], ["3", "4", "5"], ["6"]]
+    assert [r.value for r in results[:3]] == ["signed-0", "signed-1", "signed-2"]
+    assert all(isinstance(r.error, ValueError) for r in results[3:6])
+    assert results[6].value == "signed-6"
@@ -0,0 +1,77 @@
+from ApiTiktok.cache import ResponseCache, MemoryCache
+import time
+import pytest
+
+url = "https://www.tiktok.com/api/user/detail/"
+response = {"status_code": 0, "userInfo": {"user": {"uniqueId": "therock"}}}
+
+
+@pytest.mark.asyncio
+async def test_volatile_params_are_ignored():
+    cache = ResponseCache()
+    await cache.set(url, {"uniqueId": "therock", "msToken": "a", "WebIdLastTime": 1}, response)
+
+    assert await cache.get(url, {"uniqueId": "therock", "msToken": "b"}) == response
+    assert await cache.get(url, {"uniqueId": "someone_else"}) is None
+    assert cache.stats()["memory_hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_errors_are_not_cached():
+    cache = ResponseCache()
+    await cache.set(url, {"uniqueId": "therock"}, {"status_code": 10202})
+
+    assert await cache.get(url, {"uniqueId": "therock"}) is None
+
+
+@pytest.mark.asyncio
+async def test_disk_tier_is_shared(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    writer = ResponseCache(path=path)
+    await writer.set(url, {"uniqueId": "therock"}, response)
+
+    reader = ResponseCache(path=path)
+    assert await reader.get(url, {"uniqueId": "therock"}) == response
+    assert reader.stats()["disk_hits"] == 1
+
+
+def test_memory_lru_eviction():
+    memory = MemoryCache(max_entries=2)
+    expires_at = time.time() + 60
+    memory.set("a", {}, expires_at)
+    memory.set("b", {}, expires_at)
+    memory.get("a")
+    memory.set("c", {}, expires_at)
+
+    assert memory.get("b") is None
+    assert memory.get("a") == {}
+
+
+@pytest.mark.asyncio
+async def test_feeds_and_unknown_endpoints_are_not_cached():
+    cache = ResponseCache()
+    page = {"status_code": 0, "itemList": [{"id": "1"}]}
+    for feed in ("https://www.tiktok.com/api/related/item_list/",
+                 "https://www.tiktok.com/api/search/general/full/",
+                 "https://www.tiktok.com/api/some/new/endpoint/"):
+        await cache.set(feed, {"itemID": "1", "count": 16}, page)
+        assert await cache.get(feed, {"itemID": "1", "count": 16}) is None
+    assert cache.stats()["stores"] == 0
+
+    cache = ResponseCache(default_ttl=60)
+    await cache.set("https://www.tiktok.com/api/some/new/endpoint/", {}, page)
+    assert await cache.get("https://www.tiktok.com/api/some/new/endpoint/", {}) == page
+
+
+@pytest.mark.asyncio
+async def test_memory_tier_returns_copies():
+    cache = ResponseCache()
+    data = {"status_code": 0, "userInfo": {"user": {"uniqueId": "therock"}}}
+    await cache.set(url, {"uniqueId": "therock"}, data)
+    data["userInfo"]["user"]["uniqueId"] = "changed after set"
+
+    first = await cache.get(url, {"uniqueId": "therock"})
+    first["userInfo"]["user"]["uniqueId"] = "changed by a caller"
+
+    assert await cache.get(url, {"uniqueId": "therock"}) == response
@@ -0,0 +1,96 @@
+from ApiTiktok.download import Downloader
+import httpx
+import json
+import os
+import re
+import pytest
+
+CONTENT = bytes(range(256)) * 40  # 10240 bytes
+
+
+def ranged_transport(requests: list):
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.headers.get("range"))
+        match = re.match(r"bytes=(\d+)-(\d*)", request.headers.get("range", ""))
+        if match is None:
+            return httpx.Response(200, content=CONTENT)
+        start = int(match.group(1))
+        end = int(match.group(2)) if match.group(2) else len(CONTENT) - 1
+        return httpx.Response(
+            206,
+            content=CONTENT[start:end + 1],
+            headers={"content-range": f"bytes {start}-{end}/{len(CONTENT)}"},
+        )
+    return httpx.MockTransport(handler)
+
+
+@pytest.mark.asyncio
+async def test_download_in_parallel_chunks(tmp_path):
+    requests = []
+    path = str(tmp_path / "video.mp4")
+    async with httpx.AsyncClient(transport=ranged_transport(requests)) as client:
+        result = await Downloader(client, chunk_size=4096, max_parallel=2).download("https://v/1", path)
+
+    with open(path, "rb") as f:
+        assert f.read() == CONTENT
+    assert result.size == result.bytes_downloaded == len(CONTENT)
+    assert sorted(requests[1:]) == ["bytes=0-4095", "bytes=4096-8191", "bytes=8192-10239"]
+    assert not os.path.exists(path + ".part")
+    assert not os.path.exists(path + ".part.json")
+
+
+@pytest.mark.asyncio
+async def test_download_resumes_missing_chunks(tmp_path):
+    requests = []
+    path = str(tmp_path / "video.mp4")
+    # an earlier run finished the first chunk only
+    with open(path + ".part", "wb") as f:
+        f.write(CONTENT[:4096] + bytes(len(CONTENT) - 4096))
+    with open(path + ".part.json", "w") as f:
+        json.dump({"size": len(CONTENT), "done": [0]}, f)
+
+    async with httpx.AsyncClient(transport=ranged_transport(requests)) as client:
+        result = await Downloader(client, chunk_size=4096).download("https://v/1", path)
+
+    with open(path, "rb") as f:
+        assert f.read() == CONTENT
+    assert result.resumed
+    assert result.bytes_downloaded == len(CONTENT) - 4096
+    assert "bytes=0-4095" not in requests
+
+
+@pytest.mark.asyncio
+async def test_download_without_range_support(tmp_path):
+    path = str(tmp_path / "video.mp4")
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, content=CONTENT))
+    async with httpx.AsyncClient(transport=transport) as client:
+        result = await Downloader(client, chunk_size=4096).download("https://v/1", path)
+
+    with open(path, "rb") as f:
+        assert f.read() == CONTENT
+    assert result.size == len(CONTENT)
+
+
+@pytest.mark.asyncio
+async def test_chunk_ignores_bytes_past_its_range(tmp_path):
+    path = str(tmp_path / "video.mp4")
+    # chunks 1 and 2 are done, only chunk 0 is downloaded again
+    with open(path + ".part", "wb") as f:
+        f.write(bytes(4096) + CONTENT[4096:])
+    with open(path + ".part.json", "w") as f:
+        json.dump({"size": len(CONTENT), "done": [4096, 8192]}, f)
+
+    async def over_send(start, end):
+        yield CONTENT[start:end + 1] + b"\xff" * 10
+        yield b"\xff" * 2000
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        start, end = map(int, re.match(r"bytes=(\d+)-(\d+)", request.headers["range"]).groups())
+        return httpx.Response(206, content=over_send(start, end),
+                              headers={"content-range": f"bytes {start}-{end}/{len(CONTENT)}"})
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        await Downloader(client, chunk_size=4096).download("https://v/1", path)
+
+    with open(path, "rb") as f:
+        assert f.read() == CONTENT
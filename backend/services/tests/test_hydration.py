@@ -0,0 +1,57 @@
+from ApiTiktok.hydration import HydrationScanner, find_hydration_script, extract_video_item, SIGI_STATE, UNIVERSAL_DATA
+from ApiTiktok.exceptions import InvalidResponseException
+import json
+import pytest
+
+item = {"id": "7074717081563942186", "desc": "test </ video", "createTime": "1647000000"}
+universal_page = (
+    "<html><head>" + "<meta/>" * 500 + UNIVERSAL_DATA
+    + json.dumps({"__DEFAULT_SCOPE__": {
+        "webapp.app-context": {"language": "en"},
+        "webapp.video-detail": {"itemInfo": {"itemStruct": item}, "statusCode": 0},
+    }})
+    + "</script></head><body>" + "<div></div>" * 500 + "</body></html>"
+)
+sigi_page = "<html>" + SIGI_STATE + json.dumps({"ItemModule": {item["id"]: item}}) + "</script></html>"
+
+
+def chunked(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+@pytest.mark.parametrize("size", [1, 7, 64, 100000])
+def test_scanner_finds_script_across_chunks(size):
+    marker, script = find_hydration_script(chunked(universal_page, size))
+
+    assert marker == UNIVERSAL_DATA
+    assert extract_video_item(marker, script) == item
+
+
+def test_scanner_stops_after_script_end():
+    scanner = HydrationScanner()
+    chunks = chunked(universal_page, 256)
+    consumed = 0
+    for chunk in chunks:
+        consumed += 1
+        if scanner.feed(chunk):
+            break
+
+    assert consumed < len(chunks)
+
+
+def test_sigi_state():
+    marker, script = find_hydration_script(sigi_page)
+
+    assert marker == SIGI_STATE
+    assert extract_video_item(marker, script, item["id"]) == item
+
+
+def test_error_status_code_raises():
+    script = json.dumps({"__DEFAULT_SCOPE__": {"webapp.video-detail": {"statusCode": 10204}}})
+
+    with pytest.raises(InvalidResponseException):
+        extract_video_item(UNIVERSAL_DATA, script)
+
+
+def test_page_without_script():
+    assert find_hydration_script("<html><body></body></html>") == (None, None)
@@ -0,0 +1,86 @@
+from ApiTiktok.api.video import Video
+from ApiTiktok.media_store import MediaStore
+from types import SimpleNamespace
+import asyncio
+import pytest
+
+
+def writer(content: bytes, calls: list):
+    async def download(path):
+        calls.append(path)
+        await asyncio.sleep(0)
+        with open(path, "wb") as f:
+            f.write(content)
+    return download
+
+
+@pytest.mark.asyncio
+async def test_stored_media_is_not_downloaded_again(tmp_path):
+    store = MediaStore(str(tmp_path))
+    calls = []
+    paths = await asyncio.gather(*(store.get("1", "cover", writer(b"cover", calls)) for _ in range(5)))
+    path = await store.get("1", "cover", writer(b"cover", calls))
+
+    assert len(calls) == 1
+    assert set(paths) == {path}
+    with open(path, "rb") as f:
+        assert f.read() == b"cover"
+
+    # the index survives a restart
+    calls.clear()
+    assert await MediaStore(str(tmp_path)).get("1", "cover", writer(b"cover", calls)) == path
+    assert calls == []
+
+
+@pytest.mark.asyncio
+async def test_identical_content_is_kept_once(tmp_path):
+    store = MediaStore(str(tmp_path))
+    first = await store.get("1", "cover", writer(b"same", []))
+    second = await store.get("2", "originCover", writer(b"same", []))
+
+    assert first == second
+    assert store.stats()["objects"] == 1
+    assert store.stats()["keys"] == 2
+    assert store.deduplicated == 1
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_media_is_evicted(tmp_path):
+    store = MediaStore(str(tmp_path), max_bytes=10)
+    await store.get("1", "downloadAddr", writer(b"aaaa", []))
+    await store.get("2", "downloadAddr", writer(b"bbbb", []))
+    await store.get("1", "downloadAddr", writer(b"aaaa", []))  # 1 is now the most recently used
+    await store.get("3", "downloadAddr", writer(b"cccc", []))
+
+    assert store.lookup("2", "downloadAddr") is None
+    assert store.lookup("1", "downloadAddr") is not None
+    assert store.size <= 10
+    assert store.evictions == 1
+
+
+@pytest.mark.asyncio
+async def test_video_fetch_looks_the_store_up_before_info(tmp_path):
+    store = MediaStore(str(tmp_path))
+    calls = []
+
+    class StoreVideo(Video):
+        parent = SimpleNamespace(media_store=store)
+
+        async def info(self, **kwargs):
+            calls.append("info")
+            self.as_dict = {"video": {}}
+
+        async def download(self, path, kind="downloadAddr", **kwargs):
+            calls.append("download")
+            await writer(b"video", [])(path)
+
+    stored = await store.get("7106686413101468970", "downloadAddr", writer(b"video", []))
+
+    # an id is enough when the media is stored, no info() nor url needed
+    assert await StoreVideo(id="7106686413101468970").fetch() == stored
+    assert calls == []
+
+    # on a miss the info is loaded first, then the media downloaded
+    path = await StoreVideo(id="1", url="https://www.tiktok.com/@/video/1").fetch("cover")
+    assert calls == ["info", "download"]
+    assert store.lookup("1", "cover") == path
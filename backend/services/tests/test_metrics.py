@@ -0,0 +1,58 @@
+from ApiTiktok.metrics import Histogram, Metrics
+import asyncio
+import pytest
+
+
+def test_histogram_percentiles():
+    histogram = Histogram()
+    for ms in range(1, 101):
+        histogram.observe(ms / 1000)
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == 100
+    assert snapshot["p50"] == pytest.approx(0.051)
+    assert snapshot["p95"] == pytest.approx(0.096)
+    assert snapshot["p99"] == pytest.approx(0.1)
+    assert snapshot["max"] == pytest.approx(0.1)
+
+
+@pytest.mark.asyncio
+async def test_spans_inherit_endpoint_and_session():
+    metrics = Metrics()
+    spans = []
+    metrics.on_span(spans.append)
+
+    async def attempt():
+        with metrics.span("attempt", session_index=2):
+            with metrics.span("sign"):
+                await asyncio.sleep(0)
+            metrics.observe("retry_sleep", 0.5)
+
+    with metrics.span("total", endpoint="/api/post/item_list/"):
+        await asyncio.create_task(attempt())
+    with metrics.span("outside"):
+        pass
+
+    assert [(s.phase, s.endpoint, s.session_index) for s in spans] == [
+        ("sign", "/api/post/item_list/", 2),
+        ("retry_sleep", "/api/post/item_list/", 2),
+        ("attempt", "/api/post/item_list/", 2),
+        ("total", "/api/post/item_list/", None),
+        ("outside", None, None),
+    ]
+    stats = metrics.snapshot()
+    assert set(stats["endpoints"]["/api/post/item_list/"]) == {"total", "attempt", "sign", "retry_sleep"}
+    assert set(stats["sessions"][2]) == {"attempt", "sign", "retry_sleep"}
+    assert stats["sessions"][2]["retry_sleep"]["p50"] == 0.5
+
+
+def test_failed_spans_are_counted_and_hooks_cannot_break_calls():
+    metrics = Metrics()
+    metrics.on_span(lambda span: 1 / 0)
+
+    with pytest.raises(KeyError):
+        with metrics.span("fetch", endpoint="video.info"):
+            raise KeyError("boom")
+
+    fetch = metrics.snapshot()["endpoints"]["video.info"]["fetch"]
+    assert fetch["count"] == 1
+    assert fetch["errors"] == 1
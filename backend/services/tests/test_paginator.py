@@ -0,0 +1,59 @@
+from ApiTiktok.paginator import Paginator
+from ApiTiktok.checkpoint import MemoryCheckpointStore
+import pytest
+
+URL = "https://www.tiktok.com/api/comment/list/"
+
+
+class FakeApi:
+    """Serves 5 pages of 10 items, optionally failing on one cursor."""
+
+    def __init__(self, fail_at=None):
+        self.fail_at = fail_at
+        self.cursors = []
+
+    async def make_request(self, url, params, **kwargs):
+        cursor = params["cursor"]
+        self.cursors.append(cursor)
+        if cursor == self.fail_at:
+            raise RuntimeError("connection lost")
+        return {"comments": list(range(cursor, cursor + 10)), "cursor": cursor + 10, "has_more": cursor < 40}
+
+
+def paginator(api, count, store=None):
+    return Paginator(api, URL, {"aweme_id": "1"}, "comments", count=count, object_id="1", checkpoint=store, job="test")
+
+
+@pytest.mark.asyncio
+async def test_yields_at_most_count_items():
+    api = FakeApi()
+    items = [item async for item in paginator(api, 25)]
+
+    assert items == list(range(25))
+    assert api.cursors[:3] == [0, 10, 20]
+
+
+@pytest.mark.asyncio
+async def test_resumes_from_checkpoint_after_failure():
+    store = MemoryCheckpointStore()
+    seen = []
+    with pytest.raises(RuntimeError):
+        async for item in paginator(FakeApi(fail_at=30), 1000, store):
+            seen.append(item)
+
+    api = FakeApi()
+    seen += [item async for item in paginator(api, 1000, store)]
+
+    assert seen == list(range(50))
+    assert api.cursors == [30, 40]
+    checkpoint = await store.load("test", "/api/comment/list/", "1")
+    assert checkpoint.finished and checkpoint.items_seen == 50
+
+
+@pytest.mark.asyncio
+async def test_resume_skips_items_of_a_partly_read_page():
+    store = MemoryCheckpointStore()
+    first = [item async for item in paginator(FakeApi(), 15, store)]
+    second = [item async for item in paginator(FakeApi(), 25, store)]
+
+    assert first + second == list(range(25))
@@ -0,0 +1,142 @@
+from ApiTiktok import pool as pool_module
+from ApiTiktok import ApiTiktok
+from ApiTiktok.api.video import Video
+from ApiTiktok.pool import SessionPool, get_session_pool, close_session_pool
+from types import SimpleNamespace
+import asyncio
+import logging
+import threading
+import pytest
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.connected = True
+
+    def is_connected(self):
+        return self.connected
+
+
+class FakeApi:
+    def __init__(self):
+        self.logger = logging.getLogger("test_pool")
+        self.browser = FakeBrowser()
+        self.sessions = []
+        self.events = []
+
+    async def create_sessions(self, num_sessions=1, **kwargs):
+        self.sessions = [SimpleNamespace(page=SimpleNamespace(on=lambda *a: None, is_closed=lambda: False),
+                                      resource_blocker=None)
+                         for _ in range(num_sessions)]
+
+    async def restart_browser(self):
+        self.events.append("restart")
+        self.browser = FakeBrowser()
+
+    async def close_sessions(self):
+        self.events.append("close")
+
+    async def stop_playwright(self):
+        pass
+
+    http = SimpleNamespace(aclose=lambda: asyncio.sleep(0))
+
+
+def fake_pool(num_sessions=2) -> SessionPool:
+    pool = SessionPool(num_sessions=num_sessions)
+    pool.api = FakeApi()
+    return pool
+
+
+@pytest.mark.asyncio
+async def test_browser_restart_waits_for_leases():
+    pool = fake_pool()
+    leased, _ = await pool.acquire()
+    pool.api.browser.connected = False
+
+    waiter = asyncio.create_task(pool.acquire())
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+    assert pool.api.events == []
+
+    pool.api.events.append("released")
+    pool.release(leased)
+    i, _ = await asyncio.wait_for(waiter, 1)
+    assert pool.api.events == ["released", "restart"]
+    assert pool.stats()["restarts"] == 1
+    assert pool.stats()["in_use"] == 1
+
+
+@pytest.mark.asyncio
+async def test_pool_of_another_loop_is_closed_on_its_loop(monkeypatch):
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    async def create():
+        return fake_pool()
+
+    try:
+        old = asyncio.run_coroutine_threadsafe(create(), loop).result(5)
+        await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(old.start(), loop))
+        monkeypatch.setattr(pool_module, "_pool", old)
+        monkeypatch.setattr(pool_module, "ApiTiktok", lambda **kwargs: FakeApi())
+
+        new = await get_session_pool(num_sessions=1)
+        assert new is not old
+        assert old.api.events == ["close"]
+        assert not old.started
+        await close_session_pool()
+        assert new.api.events == ["close"]
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(5)
+
+    # a pool whose loop stopped can't be closed anymore, it isn't silently replaced
+    monkeypatch.setattr(pool_module, "_pool", old)
+    with pytest.raises(RuntimeError):
+        await get_session_pool()
+    await close_session_pool()
+    assert pool_module._pool is None
+    loop.close()
+
+
+@pytest.mark.asyncio
+async def test_other_api_instances_do_not_rebind_the_pool_endpoints():
+    pool = SessionPool(num_sessions=1)
+    pool_api = pool.api
+
+    other = ApiTiktok()
+    assert pool_api.video.parent is pool_api
+    assert other.video.parent is other
+    for name in ("user", "video", "sound", "hashtag", "comment", "trending", "search", "playlist"):
+        assert getattr(pool_api, name).parent is pool_api
+    assert pool_api.video(id="1").parent is pool_api
+    assert isinstance(other.video(id="1"), Video)
+    await pool_api.http.aclose()
+    await other.http.aclose()
+
+
+@pytest.mark.asyncio
+async def test_http_clients_are_closed_even_if_the_browser_is_gone():
+    api = ApiTiktok()
+    client = api.http.get()
+
+    async def crashed():
+        raise RuntimeError("Target page, context or browser has been closed")
+
+    api.close_sessions = crashed
+    with pytest.raises(RuntimeError):
+        async with api:
+            pass
+    assert client.is_closed
+
+    pool = fake_pool()
+    await pool.start()
+    pool.api.http = ApiTiktok().http
+    pooled = pool.api.http.get()
+    pool.api.close_sessions = crashed
+    with pytest.raises(RuntimeError):
+        await pool.close()
+    assert pooled.is_closed
+    assert not pool.started
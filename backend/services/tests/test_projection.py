@@ -0,0 +1,32 @@
+from ApiTiktok.projection import build_projection, project
+
+
+ITEM = {
+    "id": "1",
+    "desc": "hello",
+    "stats": {"playCount": 10, "diggCount": 2},
+    "author": {"id": "2", "uniqueId": "someone", "signature": "long text"},
+    "challenges": [{"id": "3", "title": "fyp", "desc": "x"}, {"id": "4", "title": "funny"}],
+}
+
+
+def test_build_projection_merges_paths():
+    spec = build_projection(["stats.playCount", "author.uniqueId", "stats"], required=("id",))
+
+    assert spec == {"id": True, "stats": True, "author": {"uniqueId": True}}
+
+
+def test_project_keeps_only_selected_paths():
+    spec = build_projection(["author.uniqueId", "challenges.title", "missing.path"], required=("id",))
+
+    assert project(ITEM, spec) == {
+        "id": "1",
+        "author": {"uniqueId": "someone"},
+        "challenges": [{"title": "fyp"}, {"title": "funny"}],
+    }
+
+
+def test_project_applies_to_every_item_of_a_list():
+    spec = build_projection(["stats.playCount"], required=("id",))
+
+    assert project([ITEM, ITEM], spec) == [{"id": "1", "stats": {"playCount": 10}}] * 2
@@ -0,0 +1,116 @@
+from ApiTiktok import ApiTiktok
+from ApiTiktok.exceptions import EmptyResponseException, InvalidResponseException
+from ApiTiktok.hydration import UNIVERSAL_DATA
+from ApiTiktok.replay import Cassette, StandInServer
+from ApiTiktok.retry import RetryPolicy
+import json
+import time
+import pytest
+
+USER_DETAIL = "https://www.tiktok.com/api/user/detail/"
+VIDEO_URL = "https://www.tiktok.com/@davidteathercodes/video/7074717081563942186"
+user_info = {"status_code": 0, "userInfo": {"user": {"id": "1", "uniqueId": "therock", "secUid": "MS4"}}}
+item = {"id": "7074717081563942186", "desc": "replayed", "createTime": "1647000000"}
+
+
+def make_cassette(path=None) -> Cassette:
+    cassette = Cassette(path)
+    cassette.record("GET", USER_DETAIL, {"uniqueId": "therock", "msToken": "recorded"}, json.dumps(user_info))
+    script = json.dumps({"__DEFAULT_SCOPE__": {"webapp.video-detail": {"itemInfo": {"itemStruct": item}}}})
+    cassette.record("GET", VIDEO_URL, None, f"<html><head>{UNIVERSAL_DATA}{script}</script></head></html>",
+                    content_type="text/html")
+    return cassette
+
+
+def test_cassette_round_trip_ignores_volatile_params(tmp_path):
+    path = str(tmp_path / "cassette.json")
+    make_cassette(path).save()
+    cassette = Cassette.load(path)
+
+    assert len(cassette) == 2
+    found = cassette.find("GET", f"{USER_DETAIL}?uniqueId=therock&msToken=other&X-Bogus=abc")
+    assert json.loads(found["body"]) == user_info
+    assert cassette.find("GET", USER_DETAIL, {"uniqueId": "someone"}) is None
+
+
+@pytest.mark.asyncio
+async def test_replay_without_browser():
+    api = ApiTiktok()
+    async with api:
+        await api.replay_from(make_cassette())
+
+        assert await api.make_request(url=USER_DETAIL, params={"uniqueId": "therock"}) == user_info
+        assert (await api.video(url=VIDEO_URL).info())["desc"] == "replayed"
+
+
+@pytest.mark.asyncio
+async def test_replay_batch_presign_and_projection():
+    cassette = make_cassette()
+    other = {"status_code": 0, "userInfo": {"user": {"id": "2", "uniqueId": "someone", "secUid": "MS5"}}}
+    cassette.record("GET", USER_DETAIL, {"uniqueId": "someone"}, json.dumps(other))
+    api = ApiTiktok()
+    async with api:
+        await api.replay_from(cassette)
+
+        requests = [{"url": USER_DETAIL, "params": {"uniqueId": name}} for name in ("therock", "someone", "nobody")]
+        presigned = await api.presign_requests(requests)
+        assert all(r["signed_url"].startswith(USER_DETAIL) for r in presigned)
+        assert await api.make_request(**presigned[1]) == other
+
+        results = await api.make_requests_batch(requests)
+        assert results[:2] == [user_info, other]
+        assert isinstance(results[2], InvalidResponseException)
+
+        projected = await api.make_requests_batch(requests[:2], fields=["user.uniqueId"], items_key="userInfo")
+        assert projected[0] == {"status_code": 0, "userInfo": {"user": {"uniqueId": "therock"}}}
+        assert await api.make_request(
+            url=USER_DETAIL, params={"uniqueId": "someone"}, fields=["user.id"], items_key="userInfo"
+        ) == {"status_code": 0, "userInfo": {"user": {"id": "2"}}}
+
+        # recorded while projecting: only the projected response is in the cassette
+        cassette.record("GET", USER_DETAIL, {"uniqueId": "projected", "_fields": "userInfo:user.id"},
+                        json.dumps({"status_code": 0, "userInfo": {"user": {"id": "3"}}}))
+        assert (await api.make_request(
+            url=USER_DETAIL, params={"uniqueId": "projected"}, fields=["user.id"], items_key="userInfo"
+        ))["userInfo"] == {"user": {"id": "3"}}
+
+
+@pytest.mark.asyncio
+async def test_users_info_presigns_in_batches():
+    cassette = make_cassette()
+    other = {"status_code": 0, "userInfo": {"user": {"id": "2", "uniqueId": "someone", "secUid": "MS5"}}}
+    cassette.record("GET", USER_DETAIL, {"uniqueId": "someone"}, json.dumps(other))
+    api = ApiTiktok()
+    async with api:
+        await api.replay_from(cassette)
+        presign, batches = api.presign_requests, []
+
+        async def counting_presign(requests, **kwargs):
+            batches.append([r["params"]["uniqueId"] for r in requests])
+            return await presign(requests, **kwargs)
+
+        api.presign_requests = counting_presign
+        api.BULK_CONCURRENCY_PER_SESSION = 2
+        results = [r async for r in api.users_info(["therock", "someone", "therock"], ordered=True)]
+
+        assert batches == [["therock", "someone"], ["therock"]]
+        assert [r.value["userInfo"]["user"]["uniqueId"] for r in results] == ["therock", "someone", "therock"]
+
+
+@pytest.mark.asyncio
+async def test_stand_in_server_latency_and_errors():
+    with StandInServer(make_cassette(), latency=0.05) as server:
+        api = ApiTiktok()
+        async with api:
+            await api.replay_from(base_url=server.url)
+            started = time.monotonic()
+            assert await api.make_request(url=USER_DETAIL, params={"uniqueId": "therock"}) == user_info
+            assert time.monotonic() - started >= 0.05
+
+    with StandInServer(make_cassette(), error_rate=1.0) as server:
+        api = ApiTiktok(retry_policy=RetryPolicy(max_attempts=2, base_delay=0))
+        async with api:
+            await api.replay_from(base_url=server.url)
+            with pytest.raises(EmptyResponseException):
+                await api.make_request(url=USER_DETAIL, params={"uniqueId": "therock"})
+        assert server.requests == server.errors == 2
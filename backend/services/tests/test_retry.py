@@ -0,0 +1,96 @@
+from ApiTiktok.retry import CircuitBreaker, RetryPolicy
+from ApiTiktok.scheduler import LeastInFlightScheduler
+from ApiTiktok.exceptions import EmptyResponseException
+import pytest
+
+
+def test_breaker_opens_then_probes():
+    breaker = CircuitBreaker(failure_threshold=2, cooldown=10, max_cooldown=15)
+    breaker.record_failure(now=0)
+    assert breaker.state(now=0) == CircuitBreaker.CLOSED
+
+    breaker.record_failure(now=0)
+    assert breaker.state(now=5) == CircuitBreaker.OPEN
+    assert breaker.state(now=10) == CircuitBreaker.HALF_OPEN
+
+    # a failed probe opens it again for longer, capped at max_cooldown
+    probe = breaker.admit(now=10)
+    assert breaker.admit(now=10) is None
+    breaker.record_failure(now=10, probe=probe)
+    assert breaker.state(now=24) == CircuitBreaker.OPEN
+    assert breaker.state(now=25) == CircuitBreaker.HALF_OPEN
+
+    breaker.record_success(breaker.admit(now=25))
+    assert breaker.state(now=25) == CircuitBreaker.CLOSED
+    assert breaker.trips == 2
+
+
+def test_only_the_probe_decides_a_half_open_breaker():
+    breaker = CircuitBreaker(failure_threshold=1, cooldown=10)
+    breaker.record_failure(now=0)
+
+    # requests that were in flight when the breaker opened
+    breaker.record_failure(now=5)
+    breaker.record_success()
+    assert breaker.state(now=10) == CircuitBreaker.HALF_OPEN
+    assert breaker.trips == 1
+
+    probe = breaker.admit(now=10)
+    breaker.record_failure(now=10)
+    breaker.record_success()
+    assert breaker.state(now=10) == CircuitBreaker.HALF_OPEN
+    assert breaker.probing
+
+    # a cancelled probe lets the next request probe
+    breaker.abandon(probe)
+    probe = breaker.admit(now=10)
+    assert probe is not None
+    breaker.record_success(probe)
+    assert breaker.state(now=10) == CircuitBreaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_policy_retries_until_success():
+    attempts = []
+
+    async def attempt(n):
+        attempts.append(n)
+        if n < 3:
+            raise EmptyResponseException("", "empty")
+        return "ok"
+
+    policy = RetryPolicy(max_attempts=3, base_delay=0)
+    assert await policy.run(attempt) == "ok"
+    assert attempts == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_policy_does_not_retry_other_errors():
+    attempts = []
+
+    async def attempt(n):
+        attempts.append(n)
+        raise KeyError("not retryable")
+
+    with pytest.raises(KeyError):
+        await RetryPolicy(max_attempts=3, base_delay=0).run(attempt)
+    assert attempts == [1]
+
+
+@pytest.mark.asyncio
+async def test_policy_gives_up_when_budget_is_spent():
+    async def attempt(n):
+        raise EmptyResponseException("", "empty")
+
+    policy = RetryPolicy(max_attempts=10, base_delay=5, jitter=False, budget=1)
+    with pytest.raises(EmptyResponseException):
+        await policy.run(attempt)
+
+
+@pytest.mark.asyncio
+async def test_retries_avoid_failed_sessions():
+    scheduler = LeastInFlightScheduler()
+    for _ in range(10):
+        chosen = await scheduler.acquire(3, exclude={0, 1})
+        await scheduler.release(chosen, latency=0.1)
+        assert chosen == 2
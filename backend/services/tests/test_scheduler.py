@@ -0,0 +1,95 @@
+from ApiTiktok.scheduler import LeastInFlightScheduler, LatencyWeightedScheduler
+from ApiTiktok.exceptions import EmptyResponseException
+import asyncio
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_least_in_flight_spreads_requests():
+    scheduler = LeastInFlightScheduler()
+    first = await scheduler.acquire(2)
+    second = await scheduler.acquire(2)
+
+    assert {first, second} == {0, 1}
+
+
+@pytest.mark.asyncio
+async def test_concurrency_cap_waits_for_release():
+    scheduler = LeastInFlightScheduler(max_in_flight=1)
+    first = await scheduler.acquire(1)
+
+    waiter = asyncio.create_task(scheduler.acquire(1))
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+
+    await scheduler.release(first, latency=0.1)
+    assert await asyncio.wait_for(waiter, 1) == 0
+
+
+@pytest.mark.asyncio
+async def test_session_is_ejected_after_empty_responses():
+    scheduler = LatencyWeightedScheduler(eject_after=2, cooldown=60)
+    for _ in range(2):
+        await scheduler.acquire(2, session_index=0)
+        await scheduler.release(0, latency=0.1, error=EmptyResponseException("", "empty"))
+
+    stats = scheduler.stats()
+    assert stats[0]["cooling_down"]
+    assert stats[0]["ejections"] == 1
+    assert all(scheduler.pick(2) == 1 for _ in range(20))
+
+
+@pytest.mark.asyncio
+async def test_cancelled_requests_are_not_recorded():
+    scheduler = LatencyWeightedScheduler(eject_after=1, cooldown=0.01)
+    await scheduler.acquire(1)
+    await scheduler.release(0, latency=0.1, error=EmptyResponseException("", "empty"))
+    await asyncio.sleep(0.02)
+    assert scheduler.stats()[0]["circuit"] == "half_open"
+
+    async def probe():
+        async with scheduler.lease(1):
+            await asyncio.sleep(1)
+
+    task = asyncio.create_task(probe())
+    await asyncio.sleep(0.01)
+    assert scheduler.sessions[0].probing()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    stats = scheduler.stats()[0]
+    assert stats["requests"] == 1
+    assert stats["errors"] == 1
+    assert stats["circuit"] == "half_open"
+    assert not scheduler.sessions[0].probing()
+
+    async with scheduler.lease(1):
+        pass
+    assert scheduler.stats()[0]["circuit"] == "closed"
+
+
+@pytest.mark.asyncio
+async def test_recreated_session_starts_with_fresh_stats(monkeypatch):
+    from types import SimpleNamespace
+    from ApiTiktok.tiktok import ApiTiktok
+
+    api = ApiTiktok(scheduler=LeastInFlightScheduler(max_in_flight=2, eject_after=1, cooldown=60))
+    context = SimpleNamespace(close=lambda: asyncio.sleep(0))
+    api.sessions = [SimpleNamespace(context=context), SimpleNamespace(context=context)]
+    monkeypatch.setattr(api, "_ApiTiktok__new_session_kwargs", lambda: {})
+    monkeypatch.setattr(api, "_ApiTiktok__create_session", lambda: asyncio.sleep(0, SimpleNamespace()))
+
+    held = await api.scheduler.acquire(2, session_index=0)
+    await api.scheduler.acquire(2, session_index=0)
+    await api.scheduler.release(0, latency=0.1, error=EmptyResponseException("", "empty"))
+    assert api.scheduler.stats()[0]["cooling_down"]
+
+    await api.recreate_session(0)
+    stats = api.scheduler.stats()[0]
+    assert (stats["requests"], stats["errors"], stats["circuit"]) == (0, 0, "closed")
+    # the lease still held on the old session keeps counting against the cap
+    assert stats["in_flight"] == 1
+    await api.scheduler.release(held, latency=0.1)
+    assert api.scheduler.stats()[0]["in_flight"] == 0
+    await api.http.aclose()
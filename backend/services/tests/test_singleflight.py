@@ -0,0 +1,87 @@
+from ApiTiktok import ApiTiktok
+from ApiTiktok.replay import Cassette
+from ApiTiktok.singleflight import SingleFlight
+import asyncio
+import json
+import pytest
+
+USER_DETAIL = "https://www.tiktok.com/api/user/detail/"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    runs = []
+
+    async def work():
+        runs.append(1)
+        await asyncio.sleep(0.01)
+        return {"value": len(runs)}
+
+    results = await asyncio.gather(*(flight.do("key", work) for _ in range(5)))
+
+    assert runs == [1]
+    assert all(r is results[0] for r in results)
+    assert flight.stats() == {"calls": 5, "executions": 1, "coalesced": 4, "abandoned": 0, "in_flight": 0}
+
+
+@pytest.mark.asyncio
+async def test_errors_are_shared():
+    flight = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.01)
+        raise ValueError("failed")
+
+    results = await asyncio.gather(flight.do("key", work), flight.do("key", work), return_exceptions=True)
+    assert [type(r) for r in results] == [ValueError, ValueError]
+
+
+@pytest.mark.asyncio
+async def test_work_is_cancelled_when_the_last_caller_leaves():
+    flight = SingleFlight()
+    started, cancelled = asyncio.Event(), asyncio.Event()
+
+    async def work():
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    first = asyncio.create_task(flight.do("key", work))
+    second = asyncio.create_task(flight.do("key", work))
+    await started.wait()
+
+    # one caller leaving keeps the work running for the other
+    first.cancel()
+    await asyncio.sleep(0.01)
+    assert not cancelled.is_set()
+
+    second.cancel()
+    await asyncio.wait_for(cancelled.wait(), 1)
+    await asyncio.sleep(0)
+    assert flight.stats()["abandoned"] == 1
+    assert flight.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_requests_sent_differently_are_not_coalesced():
+    cassette = Cassette()
+    cassette.record("GET", USER_DETAIL, {"uniqueId": "therock"}, json.dumps({"status_code": 0}))
+    api = ApiTiktok()
+    async with api:
+        await api.replay_from(cassette)
+        params = {"uniqueId": "therock"}
+
+        await asyncio.gather(
+            api.make_request(url=USER_DETAIL, params=params),
+            api.make_request(url=USER_DETAIL, params=params),
+            api.make_request(url=USER_DETAIL, params=params, headers={"referer": "https://www.tiktok.com/"}),
+            api.make_request(url=USER_DETAIL, params=params, signed_url=f"{USER_DETAIL}?uniqueId=therock"),
+        )
+
+        stats = api.stats()["singleflight"]
+        assert stats["executions"] == 3
+        assert stats["coalesced"] == 1
@@ -2,13 +2,19 @@ from datetime import datetime
 import os, json, asyncio
 import random
 from services.ApiTiktok.tiktok import ApiTiktok
+from services.ApiTiktok.pool import get_session_pool, close_session_pool
 import pandas as pd
 from contracts.TikTokVideoDto import TikTokVideoDto
 from .mapper import map_tiktok_response_to_dto
+from .exporter import ParquetExporter
+from utils.loop import get_loop_bridge
 
 SESSION_FILE = "tiktok_session.json"
 VIDEO_URL = "https://www.tiktok.com/@nminhdev/video/7520912125636791559"
 
+# Pool browser (get_session_pool) sống trên loop dùng chung của process, đóng khi process dừng
+get_loop_bridge().on_shutdown(close_session_pool)
+
 
 def load_session(filename=SESSION_FILE):
     """
@@ -36,16 +42,20 @@ def save_session(data, filename=SESSION_FILE):
 
 def save_to_file(data, filename):
     """
-    Hàm tạm dùng để test với file JSON (cũ).
+    Ghi kết quả ra file JSON Lines (mỗi phần tử một dòng), ghi dần từng dòng
+    thay vì dựng cả document JSON trong bộ nhớ.
+
+    ``data`` là list/generator các phần tử, hoặc một dict (ghi thành một dòng).
+    Kết quả crawl lớn (video, comment, user) nên dùng services.exporter.ParquetExporter.
     """
+    items = [data] if isinstance(data, dict) else data
+    count = 0
     with open(filename, "w", encoding="utf-8") as f:
-        json.dump(
-            {"saved_at": datetime.now().isoformat(), "data": data},
-            f,
-            ensure_ascii=False,
-            indent=4,
-        )
-    print(f"✅ Saved to: {filename}")
+        for item in items:
+            f.write(json.dumps(item, ensure_ascii=False))
+            f.write("\n")
+            count += 1
+    print(f"✅ Saved {count} rows to: {filename}")
 
 async def build_tiktok_session_payload(username):
     ms_token = os.getenv("ms_token")
@@ -388,32 +398,31 @@ async def analysis_video(video_url, top_comment_count=10):
     headless = os.getenv("headless", "True").lower() == "true"
     browser = os.getenv("TIKTOK_BROWSER", "chromium")
 
-    api = ApiTiktok()
-    async with api:
-        await api.create_sessions(
-            ms_tokens=[ms_token],
-            num_sessions=1,
-            sleep_after=3,
-            browser=browser,
-            headless=headless,
-            suppress_resource_load_types=["image","media","font","stylesheet"]
-        )
-        
-        video = api.video(id='7565937427274140946')
+    # Dùng pool browser dùng chung, không launch browser mới mỗi lần gọi
+    pool = await get_session_pool(
+        ms_tokens=[ms_token],
+        num_sessions=1,
+        sleep_after=3,
+        browser=browser,
+        headless=headless,
+        suppress_resource_load_types=["image","media","font","stylesheet"]
+    )
+    async with pool.session() as (i, _):
+        video = pool.api.video(id='7565937427274140946')
 
         # Thông tin tổng quan video
-        # data = await video.info()
-        # save_to_file(data=data, filename="video_data.json")
+        # data = await video.info(session_index=i)
+        # save_to_file(data=data, filename="video_data.jsonl")
         # result = map_tiktok_response_to_dto(data)
         # print(result)
 
-        # Top comment
+        # Top comment: ghi dần ra Parquet theo row group, không gom hết vào list
         # comment_count = result.stats.commentCount
-        comments = []
-        async for comment in video.comments():
-            # comments.append(comment)
-            print(comment.text - comment.likes_count)
-        save_to_file(data=comments, filename="total_comment.json")
+        async with ParquetExporter.for_comments("total_comment.parquet") as exporter:
+            async for comment in video.comments(session_index=i):
+                print(comment.text, "-", comment.likes_count)
+                exporter.write(comment)
+        print(f"✅ Saved {exporter.rows_written} comments to: {exporter.path}")
 
 
         # return result
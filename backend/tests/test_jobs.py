@@ -0,0 +1,180 @@
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from domain.db import db
+from domain.models.BackgroundJob import BackgroundJob
+from services.jobService import JobContext, JobManager, job_handler
+from utils.loop import LoopBridge
+
+# handler của test dùng event/bộ đếm chung, reset ở fixture manager
+state = {}
+
+
+@job_handler("test_echo")
+async def _echo_job(job: JobContext, text: str = "", password: str = None):
+    return {"text": text, "password_received": password is not None}
+
+
+@job_handler("test_limited", concurrency=1)
+async def _limited_job(job: JobContext):
+    state["running"] += 1
+    state["peak"] = max(state["peak"], state["running"])
+    await asyncio.sleep(0.05)
+    state["running"] -= 1
+
+
+@job_handler("test_blocking")
+async def _blocking_job(job: JobContext):
+    await job.progress(0, 1)
+    while not state["release"].is_set():
+        await asyncio.sleep(0.01)
+        await job.progress(0)
+    return "released"
+
+
+@pytest.fixture
+def manager(app):
+    state.clear()
+    state.update(running=0, peak=0, release=threading.Event())
+    bridge = LoopBridge(name="test-jobs")
+    manager = JobManager(app, max_workers=4, bridge=bridge)
+    yield manager
+    state["release"].set()
+    manager.stop()
+    bridge.stop()
+
+
+def wait_for(app, job_id, statuses=BackgroundJob.FINISHED, timeout=5.0) -> BackgroundJob:
+    deadline = time.monotonic() + timeout
+    while True:
+        with app.app_context():
+            job = db.session.get(BackgroundJob, job_id)
+            if job.status in statuses or time.monotonic() > deadline:
+                db.session.expunge(job)
+                return job
+        time.sleep(0.01)
+
+
+def test_submit_runs_the_job_without_persisting_secrets(app, manager):
+    with app.app_context():
+        job_id = manager.submit("test_echo", {"text": "hi"}, secrets={"password": "hunter2"}).id
+        with pytest.raises(ValueError):
+            manager.submit("unknown_kind")
+
+    job = wait_for(app, job_id)
+    assert job.status == BackgroundJob.SUCCEEDED
+    assert job.result_value == {"text": "hi", "password_received": True}
+    assert job.params_value == {"text": "hi"}
+    assert "hunter2" not in (job.params or "") + (job.result or "")
+
+
+def test_concurrency_limit_per_kind(app, manager):
+    with app.app_context():
+        ids = [manager.submit("test_limited").id for _ in range(3)]
+
+    assert all(wait_for(app, i).status == BackgroundJob.SUCCEEDED for i in ids)
+    assert state["peak"] == 1
+
+
+def test_cancel_a_job_of_this_process(app, manager):
+    with app.app_context():
+        job_id = manager.submit("test_blocking").id
+    wait_for(app, job_id, statuses=(BackgroundJob.RUNNING,))
+
+    with app.app_context():
+        assert manager.cancel(job_id).cancel_requested
+
+    job = wait_for(app, job_id)
+    assert job.status == BackgroundJob.CANCELLED
+    assert job.finished_at is not None
+
+
+def test_cancel_right_after_submit(app, client, manager, monkeypatch):
+    monkeypatch.setitem(app.extensions, "jobs", manager)
+
+    async def hog():
+        # chặn hẳn thread của event loop: coroutine của job chưa chạy bước nào khi bị huỷ
+        state["release"].wait(5)
+
+    blocker = manager.bridge.submit(hog())
+    with app.app_context():
+        job_id = manager.submit("test_echo", {"text": "never"}).id
+
+    response = client.post(f"/api/v1/jobs/{job_id}/cancel")
+    assert response.status_code == 202
+    assert response.get_json()["status"] == BackgroundJob.CANCELLED
+    assert client.post(f"/api/v1/jobs/{job_id}/cancel").status_code == 409
+
+    state["release"].set()
+    blocker.result(5)
+    manager.bridge.run(asyncio.sleep(0.05))
+    job = wait_for(app, job_id)
+    assert job.status == BackgroundJob.CANCELLED
+    assert job.finished_at is not None
+    assert job.result_value is None
+
+
+def test_cancel_requested_by_another_process(app, manager):
+    with app.app_context():
+        job_id = manager.submit("test_blocking").id
+    wait_for(app, job_id, statuses=(BackgroundJob.RUNNING,))
+
+    # process khác chỉ ghi cancel_requested, job dừng ở lần báo tiến độ kế tiếp
+    with app.app_context():
+        db.session.get(BackgroundJob, job_id).cancel_requested = True
+        db.session.commit()
+
+    assert wait_for(app, job_id).status == BackgroundJob.CANCELLED
+
+
+def test_recover_fails_jobs_of_dead_processes_on_this_host(app, manager):
+    dead = subprocess.Popen([sys.executable, "-c", "pass"])
+    dead.wait()
+    host = socket.gethostname()
+    with app.app_context():
+        db.session.add_all([
+            BackgroundJob(id="dead", kind="test_echo", status=BackgroundJob.RUNNING, owner=f"{host}:{dead.pid}"),
+            BackgroundJob(id="alive", kind="test_echo", status=BackgroundJob.RUNNING, owner=f"{host}:{os.getppid()}"),
+            BackgroundJob(id="remote", kind="test_echo", status=BackgroundJob.QUEUED, owner=f"other-host:{dead.pid}"),
+        ])
+        db.session.commit()
+
+        manager.start()
+
+        assert db.session.get(BackgroundJob, "dead").status == BackgroundJob.FAILED
+        assert db.session.get(BackgroundJob, "dead").error.startswith("Interrupted")
+        assert db.session.get(BackgroundJob, "alive").status == BackgroundJob.RUNNING
+        assert db.session.get(BackgroundJob, "remote").status == BackgroundJob.QUEUED
+
+
+def test_import_keeps_passwords_out_of_the_job(app, client, manager, monkeypatch):
+    import blueprints.tiktok_session as tiktok_session
+
+    logins = []
+
+    async def build_session_from_account(account, password, username):
+        logins.append((account, password))
+        return None
+
+    monkeypatch.setattr(tiktok_session, "build_session_from_account", build_session_from_account)
+    monkeypatch.setitem(app.extensions, "jobs", manager)
+
+    response = client.post("/api/v1/tiktok/session/import", json={"accounts": [
+        {"account": "a@example.com", "password": "secret-a", "tiktok_name": "a"},
+        {"account": "b@example.com"},
+    ]})
+    assert response.status_code == 202
+
+    job = wait_for(app, response.get_json()["id"])
+    assert logins == [("a@example.com", "secret-a")]
+    assert [r["status"] for r in job.result_value["results"]] == ["failed", "skipped"]
+    assert job.params_value == {"accounts": [
+        {"account": "a@example.com", "tiktok_name": "a"}, {"account": "b@example.com"},
+    ]}
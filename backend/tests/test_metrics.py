@@ -0,0 +1,32 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from domain.db import db
+
+
+def test_metrics_endpoint_reports_requests_and_queries(client):
+    assert client.get("/api/v1/tiktok/sessions").status_code == 200
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.content_type.startswith("text/plain")
+    body = response.get_data(as_text=True)
+
+    route = 'route="/api/v1/tiktok/sessions"'
+    assert f'http_requests_total{{method="GET",{route},status="200"}}' in body
+    assert f'http_request_duration_seconds_count{{method="GET",{route}}}' in body
+    assert f'db_queries_per_request_count{{{route}}}' in body
+    assert f'db_query_duration_seconds_count{{{route}}}' in body
+    assert f'http_requests_in_flight{{method="GET",{route}}} 0' in body
+
+
+def test_failed_queries_do_not_leak_start_times(app):
+    with app.app_context():
+        connection = db.session.connection()
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                connection.execute(text("SELECT * FROM missing_table"))
+            db.session.rollback()
+            connection = db.session.connection()
+        assert connection.info.get("query_started") == []
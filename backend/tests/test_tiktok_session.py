@@ -0,0 +1,91 @@
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only
+import pytest
+
+from domain.db import db
+from domain.models.TikTokSession import TikTokSession
+
+cookies = [{"name": "sessionid", "value": "abc", "domain": ".tiktok.com"}]
+storage_state = {"cookies": cookies, "origins": []}
+
+
+def add_sessions(app, count=3):
+    with app.app_context():
+        for i in range(count):
+            db.session.add(TikTokSession.from_session_payload({
+                "tiktok_name": f"user_{i}", "account": f"user_{i}@example.com",
+                "cookies": cookies, "storage_state": storage_state, "browser": "chromium",
+            }))
+        db.session.commit()
+
+
+def test_field_lists():
+    assert set(TikTokSession.LIST_FIELDS) | set(TikTokSession.BLOB_FIELDS) == set(TikTokSession.FIELDS)
+    assert not set(TikTokSession.LIST_FIELDS) & set(TikTokSession.BLOB_FIELDS)
+
+
+def test_parse_fields():
+    default = TikTokSession.LIST_FIELDS
+    assert TikTokSession.parse_fields(None, default) == default
+    assert TikTokSession.parse_fields(" ", default) == default
+    assert TikTokSession.parse_fields("all", default) == TikTokSession.FIELDS
+    assert TikTokSession.parse_fields("tiktok_name, cookies,tiktok_name", default) == ("id", "tiktok_name", "cookies")
+    assert TikTokSession.parse_fields("cookies,id", default) == ("cookies", "id")
+    with pytest.raises(ValueError, match="nope"):
+        TikTokSession.parse_fields("tiktok_name,nope", default)
+
+
+def test_to_dict_fields():
+    session = TikTokSession.from_session_payload({"tiktok_name": "therock", "cookies": cookies})
+
+    assert set(session.to_dict()) == set(TikTokSession.FIELDS)
+    assert session.to_dict()["cookies"] == cookies
+    assert session.to_dict(("id", "tiktok_name")) == {"id": None, "tiktok_name": "therock"}
+
+
+def test_list_projection_leaves_blobs_unloaded(app):
+    add_sessions(app, 1)
+    with app.app_context():
+        fields = TikTokSession.LIST_FIELDS
+        row = TikTokSession.query.options(load_only(*[getattr(TikTokSession, f) for f in fields])).first()
+        assert {"cookies", "storage_state"} <= inspect(row).unloaded
+        assert set(row.to_dict(fields)) == set(fields)
+        assert {"cookies", "storage_state"} <= inspect(row).unloaded
+
+
+def test_list_is_lightweight_by_default(client, app):
+    add_sessions(app)
+
+    response = client.get("/api/v1/tiktok/sessions")
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["total"] == 3
+    assert [x["tiktok_name"] for x in body["items"]] == ["user_2", "user_1", "user_0"]
+    assert all(set(x) == set(TikTokSession.LIST_FIELDS) for x in body["items"])
+
+
+def test_list_fields(client, app):
+    add_sessions(app)
+
+    items = client.get("/api/v1/tiktok/sessions?fields=tiktok_name,cookies").get_json()["items"]
+    assert items[0] == {"id": 3, "tiktok_name": "user_2", "cookies": cookies}
+
+    items = client.get("/api/v1/tiktok/sessions?fields=all").get_json()["items"]
+    assert items[0]["storage_state"] == storage_state
+
+
+def test_list_unknown_field_is_bad_request(client, app):
+    response = client.get("/api/v1/tiktok/sessions?fields=tiktok_name,secret")
+
+    assert response.status_code == 400
+    assert "secret" in response.get_data(as_text=True)
+
+
+def test_detail_includes_blobs(client, app):
+    add_sessions(app, 1)
+
+    body = client.get("/api/v1/tiktok/session/1").get_json()
+
+    assert body["cookies"] == cookies
+    assert body["storage_state"] == storage_state
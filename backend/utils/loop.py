@@ -0,0 +1,122 @@
+import asyncio
+import atexit
+import os
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Awaitable, Callable, List, Optional
+
+
+class LoopBridge:
+    """
+    Một event loop sống lâu chạy trong thread riêng, dùng chung cho mọi thread của Flask.
+
+    Thay cho ``asyncio.run`` trong handler: asyncio.run tạo rồi đóng loop mỗi
+    request nên browser, httpx pool, cache... không sống qua được request sau.
+    Qua bridge, mọi coroutine chạy trên cùng một loop nên các đối tượng gắn với
+    loop (SessionPool, HttpClientPool...) được dùng lại.
+
+    Mỗi process có loop riêng: nếu process bị fork (gunicorn --preload) sau khi
+    loop đã chạy thì process con tự tạo loop mới.
+
+    Ví dụ:
+        bridge = get_loop_bridge()
+        result = bridge.run(post_comment_with_ui(session_data, text, video_url), timeout=600)
+    """
+
+    def __init__(self, name: str = "async-bridge"):
+        self.name = name
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._shutdown_hooks: List[Callable[[], Awaitable[Any]]] = []
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """Loop của process hiện tại, khởi động ở lần gọi đầu tiên."""
+        if self._loop is None or self._pid != os.getpid():
+            self.start()
+        return self._loop
+
+    def start(self):
+        with self._lock:
+            if self._loop is not None and self._pid == os.getpid():
+                return
+            self._loop = asyncio.new_event_loop()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._loop.run_forever, name=self.name, daemon=True)
+            self._thread.start()
+
+    def on_shutdown(self, hook: Callable[[], Awaitable[Any]]):
+        """Đăng ký coroutine function chạy trên loop trước khi dừng (đóng browser, pool...)."""
+        self._shutdown_hooks.append(hook)
+
+    def in_loop_thread(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self, coro: Awaitable) -> Future:
+        """Đưa coroutine vào loop và trả về ngay một concurrent.futures.Future."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Awaitable, timeout: Optional[float] = None) -> Any:
+        """
+        Chạy coroutine trên loop dùng chung và chờ kết quả từ thread đang gọi.
+
+        Hết ``timeout`` thì coroutine bị huỷ và raise TimeoutError. Không được gọi
+        từ chính thread của loop (sẽ tự chờ chính mình), khi đó raise RuntimeError.
+        """
+        if self.in_loop_thread():
+            coro.close()
+            raise RuntimeError("LoopBridge.run() called from the loop thread, await the coroutine instead")
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise TimeoutError(f"Coroutine did not finish within {timeout}s")
+
+    def stop(self, timeout: float = 10.0):
+        """Chạy các shutdown hook, huỷ các task còn lại rồi dừng loop."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            if loop is None or self._pid != os.getpid() or not loop.is_running():
+                return
+            self._loop = self._thread = None
+
+        async def shutdown():
+            for hook in reversed(self._shutdown_hooks):
+                try:
+                    await hook()
+                except Exception:
+                    pass
+            tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        try:
+            asyncio.run_coroutine_threadsafe(shutdown(), loop).result(timeout)
+        except Exception:
+            pass
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+
+
+_bridge = LoopBridge()
+atexit.register(_bridge.stop)
+
+
+def get_loop_bridge() -> LoopBridge:
+    """Bridge dùng chung của process."""
+    return _bridge
+
+
+def run_async(coro: Awaitable, timeout: Optional[float] = None) -> Any:
+    """
+    Thay cho ``asyncio.run(coro)`` trong Flask handler: chạy trên loop dùng chung của process.
+
+    Ví dụ:
+        with track_background("tiktok_comment"):
+            result = run_async(post_comment_with_ui(session_data, text, video_url))
+    """
+    return _bridge.run(coro, timeout)
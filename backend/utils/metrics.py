@@ -0,0 +1,253 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterable, Optional
+
+from flask import Flask, Response, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+BACKGROUND_BUCKETS = (1, 5, 10, 30, 60, 120, 300, 600, 1800, 3600)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: dict[tuple, object] = {}
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_value(key, value))
+        return lines
+
+    def _render_value(self, key: tuple, value) -> list[str]:
+        return [f"{self.name}{_labels(self.labelnames, key)} {_number(value)}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 buckets: Iterable[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[0][i] += 1
+                    break
+            entry[1] += value
+            entry[2] += 1
+
+    def _render_value(self, key: tuple, value) -> list[str]:
+        counts, total, count = value
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            cumulative += bucket_count
+            le = _labels(self.labelnames, key, f'le="{_number(float(bound))}"')
+            lines.append(f"{self.name}_bucket{le} {cumulative}")
+        inf = _labels(self.labelnames, key, 'le="+Inf"')
+        lines.append(f"{self.name}_bucket{inf} {count}")
+        lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_number(total)}")
+        lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: list[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(line for metric in self._metrics for line in metric.render()) + "\n"
+
+
+REGISTRY = Registry()
+
+http_requests_total = REGISTRY.register(Counter(
+    "http_requests_total", "HTTP requests by route, method and status.", ("method", "route", "status")))
+http_request_duration_seconds = REGISTRY.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route.", ("method", "route")))
+http_requests_in_flight = REGISTRY.register(Gauge(
+    "http_requests_in_flight", "HTTP requests being served, by route.", ("method", "route")))
+http_request_exceptions_total = REGISTRY.register(Counter(
+    "http_request_exceptions_total", "Unhandled exceptions by route and type.", ("route", "exception")))
+db_queries_per_request = REGISTRY.register(Histogram(
+    "db_queries_per_request", "SQL queries run while serving one request.", ("route",), QUERY_COUNT_BUCKETS))
+db_query_duration_seconds = REGISTRY.register(Histogram(
+    "db_query_duration_seconds", "SQL query latency, by the route that ran it (background outside requests).",
+    ("route",)))
+background_tasks_in_progress = REGISTRY.register(Gauge(
+    "background_tasks_in_progress", "Long running work (browser sign-in, imports...) in progress.", ("task",)))
+background_task_duration_seconds = REGISTRY.register(Histogram(
+    "background_task_duration_seconds", "Duration of long running work by task and outcome.",
+    ("task", "outcome"), BACKGROUND_BUCKETS))
+background_jobs_total = REGISTRY.register(Counter(
+    "background_jobs_total", "Background jobs finished, by kind and final status.", ("kind", "status")))
+
+
+def _route() -> str:
+    rule = request.url_rule
+    return rule.rule if rule is not None else "unmatched"
+
+
+@contextmanager
+def track_background(task: str):
+    """
+    Đo thời gian và đếm số công việc nền đang chạy (đăng nhập bằng browser, import...).
+
+    Example:
+        with track_background("tiktok_comment"):
+            result = run_async(post_comment_with_ui(session_data, text, video_url))
+    """
+    background_tasks_in_progress.inc(task=task)
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        background_tasks_in_progress.dec(task=task)
+        background_task_duration_seconds.observe(time.perf_counter() - started, task=task, outcome=outcome)
+
+
+def record_exception(exc: BaseException):
+    """Đếm exception đã được errorhandler của app bắt (teardown_request không thấy chúng)."""
+    if has_request_context():
+        http_request_exceptions_total.inc(route=_route(), exception=type(exc).__name__)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    _record_query(conn)
+
+
+def _handle_error(exception_context):
+    # after_cursor_execute không chạy khi câu lệnh lỗi, thời điểm bắt đầu phải được lấy ra ở đây
+    if exception_context.connection is not None:
+        _record_query(exception_context.connection)
+
+
+def _record_query(conn):
+    started = conn.info.get("query_started")
+    if not started:
+        return
+    duration = time.perf_counter() - started.pop()
+    if has_request_context() and hasattr(g, "metrics_started"):
+        g.metrics_queries += 1
+        db_query_duration_seconds.observe(duration, route=_route())
+    else:
+        db_query_duration_seconds.observe(duration, route="background")
+
+
+def init_metrics(app: Flask, path: str = "/metrics"):
+    """
+    Gắn các hook đo request/SQL vào app và mở endpoint ``path`` theo định dạng text của Prometheus.
+
+    Số liệu nằm trong bộ nhớ của từng process, chạy nhiều worker thì mỗi worker có số liệu riêng.
+    """
+
+    @app.before_request
+    def _start_request_metrics():
+        g.metrics_started = time.perf_counter()
+        g.metrics_queries = 0
+        g.metrics_route = _route()
+        http_requests_in_flight.inc(method=request.method, route=g.metrics_route)
+
+    @app.after_request
+    def _record_status(response):
+        g.metrics_status = response.status_code
+        return response
+
+    @app.teardown_request
+    def _finish_request_metrics(exc: Optional[BaseException]):
+        started = g.pop("metrics_started", None)
+        if started is None:
+            return
+        route, method = g.metrics_route, request.method
+        http_requests_in_flight.dec(method=method, route=route)
+        http_request_duration_seconds.observe(time.perf_counter() - started, method=method, route=route)
+        http_requests_total.inc(method=method, route=route, status=g.get("metrics_status", 500))
+        db_queries_per_request.observe(g.metrics_queries, route=route)
+        if exc is not None:
+            http_request_exceptions_total.inc(route=route, exception=type(exc).__name__)
+
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
+
+    def metrics():
+        return Response(REGISTRY.render(), mimetype=None, content_type=CONTENT_TYPE)
+
+    app.add_url_rule(path, "metrics", metrics, methods=["GET"])
@@ -0,0 +1,59 @@
+import axios from 'axios';
+
+const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://127.0.0.1:5000/api/v1';
+
+export type JobStatus = 'queued' | 'running' | 'succeeded' | 'failed' | 'cancelled';
+
+export interface BackgroundJob<T = any> {
+  id: string;
+  kind: string;
+  status: JobStatus;
+  error?: string | null;
+  progress: { done: number; total?: number | null };
+  cancel_requested: boolean;
+  started_at?: string | null;
+  finished_at?: string | null;
+  created?: string;
+  updated?: string;
+  result?: T;
+}
+
+export interface WaitForJobOptions {
+  intervalMs?: number;
+  onProgress?: (job: BackgroundJob) => void;
+}
+
+class JobService {
+  private baseUrl = `${API_BASE_URL}/jobs`;
+
+  async getJob(id: string): Promise<BackgroundJob> {
+    const response = await axios.get(`${this.baseUrl}/${id}`);
+    return response.data;
+  }
+
+  async cancelJob(id: string): Promise<BackgroundJob> {
+    const response = await axios.post(`${this.baseUrl}/${id}/cancel`);
+    return response.data;
+  }
+
+  /**
+   * Poll /jobs/{id}/result until the job is finished.
+   * Resolves with the result, rejects with the job error if it failed or was cancelled.
+   */
+  async waitForJob<T = any>(id: string, { intervalMs = 1500, onProgress }: WaitForJobOptions = {}): Promise<T> {
+    for (;;) {
+      const response = await axios.get<BackgroundJob<T>>(`${this.baseUrl}/${id}/result`);
+      const job = response.data;
+      if (response.status === 200) {
+        if (job.status === 'succeeded') {
+          return job.result as T;
+        }
+        throw new Error(job.error || `Job ${job.status}`);
+      }
+      onProgress?.(job);
+      await new Promise((resolve) => setTimeout(resolve, intervalMs));
+    }
+  }
+}
+
+export const jobService = new JobService();
@@ -1,4 +1,5 @@
 import axios from 'axios';
+import { BackgroundJob, jobService, WaitForJobOptions } from './jobService';
 
 const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://127.0.0.1:5000/api/v1';
 
@@ -39,9 +40,13 @@ export interface TikTokSessionsResponse {
 class TikTokSessionService {
   private baseUrl = `${API_BASE_URL}/tiktok`;
 
-  async getSessions(page: number = 1, size: number = 50): Promise<TikTokSessionsResponse> {
+  /**
+   * List sessions. cookies/storage_state are left out unless asked for in `fields`
+   * (comma separated, or "all"); use getSessionById for a full session.
+   */
+  async getSessions(page: number = 1, size: number = 50, fields?: string): Promise<TikTokSessionsResponse> {
     const response = await axios.get(`${this.baseUrl}/sessions`, {
-      params: { page, size },
+      params: { page, size, fields },
     });
     return response.data;
   }
@@ -61,11 +66,11 @@ class TikTokSessionService {
     return response.data;
   }
 
-  async signIn(tiktokName?: string): Promise<TikTokSession> {
-    const response = await axios.post(`${this.baseUrl}/session/sign-in`, {
+  async signIn(tiktokName?: string, options?: WaitForJobOptions): Promise<TikTokSession> {
+    const response = await axios.post<BackgroundJob>(`${this.baseUrl}/session/sign-in`, {
       tiktok_name: tiktokName || '',
     });
-    return response.data;
+    return jobService.waitForJob<TikTokSession>(response.data.id, options);
   }
 
   async updateSession(id: number, data: Partial<TikTokSessionCreate>): Promise<TikTokSession> {
@@ -84,9 +89,9 @@ class TikTokSessionService {
     return response.data;
   }
 
-  async importSessions(accounts: TikTokSessionCreate[]): Promise<any> {
-    const response = await axios.post(`${this.baseUrl}/session/import`, { accounts });
-    return response.data;
+  async importSessions(accounts: TikTokSessionCreate[], options?: WaitForJobOptions): Promise<any> {
+    const response = await axios.post<BackgroundJob>(`${this.baseUrl}/session/import`, { accounts });
+    return jobService.waitForJob(response.data.id, options);
   }
 }
 